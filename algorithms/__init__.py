@@ -4,12 +4,28 @@
 
 from .maze_generator import (
     generate_kruskal_maze,
+    generate_eller_rows,
+    generate_eller_maze,
+    generate_binary_tree_maze,
+    generate_binary_tree_array,
+    generate_sidewinder_maze,
+    generate_sidewinder_array,
     generate_recursive_division_maze,
+    generate_recursive_division_array,
+    grid_to_symbols,
     DSU
 )
 
 __all__ = [
     'generate_kruskal_maze',
+    'generate_eller_rows',
+    'generate_eller_maze',
+    'generate_binary_tree_maze',
+    'generate_binary_tree_array',
+    'generate_sidewinder_maze',
+    'generate_sidewinder_array',
     'generate_recursive_division_maze',
+    'generate_recursive_division_array',
+    'grid_to_symbols',
     'DSU'
 ] 
\ No newline at end of file
@@ -0,0 +1,128 @@
+"""
+位并行 BFS - 用整数的二进制位表示整张网格，一次移位和按位与扩展整层波前
+
+网格按行打包进一个 Python 整数: 第 r 行第 c 列对应第 r * (cols + 1) + c 位，
+每行末尾留一个恒为 0 的保护位，左右移位时不会从一行的边缘绕到另一行。
+四连通扩展只需:
+    (F << 1 | F >> 1 | F << stride | F >> stride) & passable
+每层的代价与迷宫面积的机器字数成正比，而不是与格子数成正比。
+"""
+
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+WALL = '#'
+
+
+class BitGrid:
+    """
+    以位掩码表示的可通行格子集合。
+
+    Args:
+        grid (list): 迷宫网格 (二维字符列表)。
+        blocked (str): 不可通行的格子符号。
+    """
+
+    def __init__(self, grid, blocked=WALL):
+        self.rows = len(grid)
+        self.cols = len(grid[0]) if grid else 0
+        self.stride = self.cols + 1
+        passable = 0
+        for r, row in enumerate(grid):
+            row_bits = 0
+            for c, tile in enumerate(row):
+                if tile != blocked:
+                    row_bits |= 1 << c
+            passable |= row_bits << (r * self.stride)
+        self.passable = passable
+
+    def bit(self, cell: Tuple[int, int]) -> int:
+        return 1 << (cell[0] * self.stride + cell[1])
+
+    def mask_of(self, cells: Iterable[Tuple[int, int]]) -> int:
+        mask = 0
+        for r, c in cells:
+            mask |= 1 << (r * self.stride + c)
+        return mask
+
+    def cells(self, mask: int) -> List[Tuple[int, int]]:
+        """掩码中所有格子的坐标 (按下标从小到大)"""
+        stride = self.stride
+        found = []
+        while mask:
+            low = mask & -mask
+            index = low.bit_length() - 1
+            found.append(divmod(index, stride))
+            mask ^= low
+        return found
+
+    def expand(self, frontier: int) -> int:
+        """frontier 中所有格子的可通行四邻居"""
+        stride = self.stride
+        return (frontier << 1 | frontier >> 1 | frontier << stride | frontier >> stride) & self.passable
+
+    def layers(self, sources: Iterable[Tuple[int, int]], expandable: Optional[int] = None,
+               goal: Optional[int] = None) -> Iterator[int]:
+        """
+        多源 BFS，依次产生距离为 0, 1, 2, ... 的格子掩码。
+
+        Args:
+            sources: 起点格子 (距离为 0 的一层)。
+            expandable (int | None): 可以继续向外扩展的格子掩码；其它被到达的格子
+                   只出现在所在层中，不再向外扩展。None 表示所有可通行格子。
+            goal (int | None): 目标掩码，某一层与其相交时产生该层后停止。
+        """
+        expandable = self.passable if expandable is None else expandable
+        frontier = self.mask_of(sources) & self.passable
+        visited = frontier
+        while frontier:
+            yield frontier
+            if goal is not None and frontier & goal:
+                return
+            frontier = self.expand(frontier & expandable) & ~visited
+            visited |= frontier
+
+    def distances(self, sources: Iterable[Tuple[int, int]]) -> List[List[int]]:
+        """多源最短距离表 (行, 列)，不可达为 -1"""
+        dist = [[-1] * self.cols for _ in range(self.rows)]
+        for distance, layer in enumerate(self.layers(sources)):
+            for r, c in self.cells(layer):
+                dist[r][c] = distance
+        return dist
+
+    def backtrack(self, layers: List[int], target: Tuple[int, int], expandable: Optional[int] = None,
+                  distance: Optional[int] = None) -> List[Tuple[int, int]]:
+        """
+        从 target 沿距离逐层递减的邻居回溯到起点，返回从起点到 target 的路径。
+
+        Args:
+            layers (list): layers() 产生的各层掩码。
+            expandable (int | None): 与 layers() 使用的相同，回溯只经过可扩展的格子。
+            distance (int | None): target 所在的层，None 时自动查找。
+        """
+        expandable = self.passable if expandable is None else expandable
+        if distance is None:
+            target_bit = self.bit(target)
+            distance = next((d for d, layer in enumerate(layers) if layer & target_bit), None)
+            if distance is None:
+                return []
+        path = [target]
+        r, c = target
+        for d in range(distance - 1, -1, -1):
+            allowed = layers[d] & expandable
+            for nr, nc in ((r, c + 1), (r, c - 1), (r + 1, c), (r - 1, c)):
+                if 0 <= nr < self.rows and 0 <= nc < self.cols and allowed >> (nr * self.stride + nc) & 1:
+                    r, c = nr, nc
+                    break
+            path.append((r, c))
+        path.reverse()
+        return path
+
+    def shortest_path(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """start 到 goal 的一条最短路径 (含两端)，不可达时返回空列表"""
+        goal_bit = self.bit(goal)
+        if not (self.passable & goal_bit) or not (self.passable & self.bit(start)):
+            return []
+        layers = list(self.layers([start], goal=goal_bit))
+        if not layers or not (layers[-1] & goal_bit):
+            return []
+        return self.backtrack(layers, goal, distance=len(layers) - 1)
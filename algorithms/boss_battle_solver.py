@@ -1,7 +1,8 @@
 import math
 import copy
 import itertools
-from heapq import heappush, heappop
+
+from algorithms.priority_queue import create_priority_queue
 
 # -------------------------------
 # 技能释放与估值逻辑 (核心算法)
@@ -41,7 +42,13 @@ def compute_avg_damage(state, skills):
 
     return total_weighted_dmg / total_weight if total_weight > 0 else 1.0
 
-def optimize_boss_fight(input_data):
+def optimize_boss_fight(input_data, queue='heap'):
+    """
+    A*搜索击败全部BOSS的最少回合技能序列。
+
+    queue 选择开放列表: 'heap' (heapq) 或 'bucket' (按 f值、回合数 分桶)，
+    两者的弹出顺序完全一致。
+    """
     boss_hps = input_data["B"]
     player_skills = [
         {"id": i, "damage": s[0], "cooldown": s[1]}
@@ -57,7 +64,8 @@ def optimize_boss_fight(input_data):
     }
 
     counter = itertools.count()
-    pq = [(compute_avg_damage(initial_state, player_skills), 0, next(counter), initial_state, [])]
+    pq = create_priority_queue(queue, min_key=(0, 0))
+    pq.push((math.ceil(compute_avg_damage(initial_state, player_skills)), 0), (next(counter), initial_state, []))
     best_solution_turns = float('inf')
     best_skill_sequence = None
     visited = {}
@@ -68,7 +76,7 @@ def optimize_boss_fight(input_data):
 
     while pq and iterations < max_iterations:
         iterations += 1
-        f_n, turns_elapsed, _, state, skill_sequence = heappop(pq)
+        (f_n, turns_elapsed), (_, state, skill_sequence) = pq.pop()
 
         key = (
             tuple(state["boss_hps"]),
@@ -106,7 +114,7 @@ def optimize_boss_fight(input_data):
                  h_n = math.ceil(remaining_hp / avg_dmg) if avg_dmg > 0 else float('inf')
                  new_f_n = new_turns + h_n
                  if new_f_n < best_solution_turns:
-                    heappush(pq, (new_f_n, new_turns, next(counter), new_state, new_sequence))
+                    pq.push((new_f_n, new_turns), (next(counter), new_state, new_sequence))
         else:
             for skill in available_skills:
                 new_state = apply_skill(current_state, skill, player_skills)
@@ -120,13 +128,13 @@ def optimize_boss_fight(input_data):
                     h_n = math.ceil(remaining_hp / avg_dmg) if avg_dmg > 0 else float('inf')
                     new_f_n = new_turns + h_n
                     if new_f_n < best_solution_turns:
-                        heappush(pq, (new_f_n, new_turns, next(counter), new_state, new_sequence))
+                        pq.push((new_f_n, new_turns), (next(counter), new_state, new_sequence))
                 else: # Boss已被击败
                     if new_turns < best_solution_turns:
                          best_solution_turns = new_turns
                          best_skill_sequence = new_sequence
                     # 提前结束循环的一个分支
-                    heappush(pq, (new_turns, new_turns, next(counter), new_state, new_sequence))
+                    pq.push((new_turns, new_turns), (next(counter), new_state, new_sequence))
 
 
     if best_skill_sequence is None:
@@ -0,0 +1,270 @@
+"""
+分层寻路 (HPA*) - 为超大迷宫 (例如 1000x1000) 提供毫秒级的点到点最短路
+
+把网格切成 cluster_size x cluster_size 的簇:
+- 入口: 相邻两簇边界上两侧都可通行的格子对，跨边界一步
+- 簇内边: 同一簇各入口之间只在簇内行走的最短距离，首次用到该簇时计算并缓存
+查询时先把起点、终点接入所在簇的入口，在入口图上做 A*，再逐段细化回逐格路径。
+保留了边界上的每一个入口 (而不是每段只取一个代表)，因此结果是精确最短路。
+
+只有墙壁变化会影响可通行性: set_tile_type 改动墙壁时只把所在的簇 (格子在簇边界上时
+连同相邻的簇) 标记为过期，下一次查询时才重算这些簇的边界入口和簇内距离。
+"""
+
+import heapq
+from collections import deque
+
+WALL = '#'
+INF = float('inf')
+
+
+class HierarchicalPathfinder:
+    """
+    网格上的分层最短路。坐标统一使用 (行, 列)。
+
+    Args:
+        grid (list): 迷宫网格，与 Maze.grid 共享 (墙壁变化需通过 on_tile_changed 通知)。
+        cluster_size (int): 簇的边长 (格子数)。
+    """
+
+    def __init__(self, grid, cluster_size=32):
+        self.grid = grid
+        self.rows = len(grid)
+        self.cols = len(grid[0]) if grid else 0
+        self.cluster_size = max(2, cluster_size)
+        self.cluster_rows = -(-self.rows // self.cluster_size)
+        self.cluster_cols = -(-self.cols // self.cluster_size)
+        self.stats = {'cluster_builds': 0, 'border_builds': 0, 'queries': 0}
+        # 边界 (簇, 右侧或下方的相邻簇) -> [(本簇一侧的格子, 相邻簇一侧的格子)]
+        self._borders = {}
+        # 簇 -> {入口格子: [(相邻入口, 距离)]}，包括同簇入口 (簇内距离) 和跨边界的入口 (距离 1)
+        self._intra = {}
+        # 所有已计算簇的入口邻接表合并在一起，搜索时按格子直接查找
+        self._edges = {}
+        # 簇 -> {入口格子: [跨边界相邻的入口]}
+        self._crossings = {}
+        self._dirty = set()
+
+    # ------------------------------------------------------------------
+    # 簇与入口
+    # ------------------------------------------------------------------
+
+    def cluster_of(self, cell):
+        return (cell[0] // self.cluster_size, cell[1] // self.cluster_size)
+
+    def _bounds(self, cluster):
+        size = self.cluster_size
+        top, left = cluster[0] * size, cluster[1] * size
+        return top, left, min(top + size, self.rows), min(left + size, self.cols)
+
+    def _border(self, cluster, other):
+        """cluster 与其右侧或下方相邻簇 other 之间的所有入口"""
+        key = (cluster, other)
+        entrances = self._borders.get(key)
+        if entrances is None:
+            self.stats['border_builds'] += 1
+            grid = self.grid
+            top, left, bottom, right = self._bounds(cluster)
+            entrances = []
+            if other[0] == cluster[0]:
+                c = right - 1
+                for r in range(top, bottom):
+                    if grid[r][c] != WALL and grid[r][c + 1] != WALL:
+                        entrances.append(((r, c), (r, c + 1)))
+            else:
+                r = bottom - 1
+                for c in range(left, right):
+                    if grid[r][c] != WALL and grid[r + 1][c] != WALL:
+                        entrances.append(((r, c), (r + 1, c)))
+            self._borders[key] = entrances
+        return entrances
+
+    def _cluster_crossings(self, cluster):
+        """簇内每个入口格子跨边界可以走到的相邻簇格子"""
+        crossings = self._crossings.get(cluster)
+        if crossings is None:
+            crossings = {}
+            cr, cc = cluster
+            if cc + 1 < self.cluster_cols:
+                for mine, theirs in self._border(cluster, (cr, cc + 1)):
+                    crossings.setdefault(mine, []).append(theirs)
+            if cr + 1 < self.cluster_rows:
+                for mine, theirs in self._border(cluster, (cr + 1, cc)):
+                    crossings.setdefault(mine, []).append(theirs)
+            if cc > 0:
+                for theirs, mine in self._border((cr, cc - 1), cluster):
+                    crossings.setdefault(mine, []).append(theirs)
+            if cr > 0:
+                for theirs, mine in self._border((cr - 1, cc), cluster):
+                    crossings.setdefault(mine, []).append(theirs)
+            self._crossings[cluster] = crossings
+        return crossings
+
+    def _local_bfs(self, cluster, source, goal=None):
+        """只在簇内行走的 BFS，返回 (前驱, 距离)；给出 goal 时到达后立即停止"""
+        grid = self.grid
+        top, left, bottom, right = self._bounds(cluster)
+        parents = {source: None}
+        dist = {source: 0}
+        frontier = deque([source])
+        while frontier:
+            cell = frontier.popleft()
+            if cell == goal:
+                break
+            r, c = cell
+            next_dist = dist[cell] + 1
+            for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+                if top <= nr < bottom and left <= nc < right and (nr, nc) not in parents \
+                        and grid[nr][nc] != WALL:
+                    parents[(nr, nc)] = cell
+                    dist[(nr, nc)] = next_dist
+                    frontier.append((nr, nc))
+        return parents, dist
+
+    def _cluster_edges(self, cluster):
+        """簇内各入口的邻接表 (首次用到时计算并缓存)"""
+        edges = self._intra.get(cluster)
+        if edges is None:
+            self.stats['cluster_builds'] += 1
+            crossings = self._cluster_crossings(cluster)
+            edges = {}
+            for entrance, across in crossings.items():
+                _, dist = self._local_bfs(cluster, entrance)
+                edges[entrance] = [(other, 1) for other in across] + \
+                    [(other, dist[other]) for other in crossings if other != entrance and other in dist]
+            self._intra[cluster] = edges
+            self._edges.update(edges)
+        return edges
+
+    def _refresh(self):
+        """重算过期簇的边界入口和簇内距离 (惰性，只在查询时执行)"""
+        if not self._dirty:
+            return
+        for cluster in self._dirty:
+            cr, cc = cluster
+            for key in (((cr, cc), (cr, cc + 1)), ((cr, cc), (cr + 1, cc)),
+                        ((cr, cc - 1), (cr, cc)), ((cr - 1, cc), (cr, cc))):
+                self._borders.pop(key, None)
+            # 共享边界变化时相邻的簇也在 _dirty 中，其余相邻簇的入口不受影响
+            self._crossings.pop(cluster, None)
+            for entrance in self._intra.pop(cluster, {}):
+                self._edges.pop(entrance, None)
+        self._dirty.clear()
+
+    def on_tile_changed(self, r, c, old_type, new_type):
+        """由 Maze.set_tile_type 调用；只有墙壁变化会使簇过期"""
+        if (old_type == WALL) == (new_type == WALL):
+            return
+        cluster = self.cluster_of((r, c))
+        self._dirty.add(cluster)
+        top, left, bottom, right = self._bounds(cluster)
+        # 边界上的格子同时影响相邻簇的入口
+        if r == top and cluster[0] > 0:
+            self._dirty.add((cluster[0] - 1, cluster[1]))
+        if r == bottom - 1 and cluster[0] + 1 < self.cluster_rows:
+            self._dirty.add((cluster[0] + 1, cluster[1]))
+        if c == left and cluster[1] > 0:
+            self._dirty.add((cluster[0], cluster[1] - 1))
+        if c == right - 1 and cluster[1] + 1 < self.cluster_cols:
+            self._dirty.add((cluster[0], cluster[1] + 1))
+
+    def precompute(self):
+        """预先计算所有簇 (加载关卡时调用，之后的查询只做入口图上的搜索)"""
+        self._refresh()
+        for cr in range(self.cluster_rows):
+            for cc in range(self.cluster_cols):
+                self._cluster_edges((cr, cc))
+
+    # ------------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------------
+
+    def _walkable(self, cell):
+        r, c = cell
+        return 0 <= r < self.rows and 0 <= c < self.cols and self.grid[r][c] != WALL
+
+    @staticmethod
+    def _trace(parents, cell):
+        path = []
+        while cell is not None:
+            path.append(cell)
+            cell = parents[cell]
+        path.reverse()
+        return path
+
+    def shortest_path(self, start, goal):
+        """start 到 goal 的最短逐格路径 (含两端)，不可达时返回空列表"""
+        if not self._walkable(start) or not self._walkable(goal):
+            return []
+        if start == goal:
+            return [start]
+        self._refresh()
+        self.stats['queries'] += 1
+
+        start_cluster, goal_cluster = self.cluster_of(start), self.cluster_of(goal)
+        start_parents, start_dist = self._local_bfs(start_cluster, start)
+        goal_parents, goal_dist = self._local_bfs(goal_cluster, goal)
+        goal_entries = {entrance: goal_dist[entrance]
+                        for entrance in self._cluster_crossings(goal_cluster) if entrance in goal_dist}
+
+        # 同簇时的簇内直达路径作为初始上界
+        best = start_dist.get(goal, INF) if start_cluster == goal_cluster else INF
+        best_entry = None
+
+        goal_r, goal_c = goal
+        edges = self._edges
+        dist = {}
+        came_from = {}
+        heap = []
+        for entrance in self._cluster_crossings(start_cluster):
+            d = start_dist.get(entrance)
+            if d is not None:
+                dist[entrance] = d
+                came_from[entrance] = None
+                heapq.heappush(heap, (d + abs(entrance[0] - goal_r) + abs(entrance[1] - goal_c), -d, entrance))
+
+        # f 相同时优先扩展 g 较大 (离终点较近) 的入口
+        while heap:
+            f, d, node = heapq.heappop(heap)
+            d = -d
+            if f >= best:
+                break
+            if d > dist[node]:
+                continue
+            extra = goal_entries.get(node)
+            if extra is not None and d + extra < best:
+                best = d + extra
+                best_entry = node
+            neighbours = edges.get(node)
+            if neighbours is None:
+                neighbours = self._cluster_edges(self.cluster_of(node))[node]
+            for other, weight in neighbours:
+                nd = d + weight
+                if nd < dist.get(other, INF):
+                    dist[other] = nd
+                    came_from[other] = node
+                    heapq.heappush(heap, (nd + abs(other[0] - goal_r) + abs(other[1] - goal_c), -nd, other))
+
+        if best == INF:
+            return []
+        if best_entry is None:
+            return self._trace(start_parents, goal)
+
+        # 细化: 入口序列 -> 逐格路径
+        entrances = []
+        node = best_entry
+        while node is not None:
+            entrances.append(node)
+            node = came_from[node]
+        entrances.reverse()
+
+        path = self._trace(start_parents, entrances[0])
+        for previous, current in zip(entrances, entrances[1:]):
+            cluster = self.cluster_of(previous)
+            if cluster != self.cluster_of(current):
+                path.append(current)
+            else:
+                parents, _ = self._local_bfs(cluster, previous, goal=current)
+                path.extend(self._trace(parents, current)[1:])
+        path.extend(reversed(self._trace(goal_parents, best_entry)[:-1]))
+        return path
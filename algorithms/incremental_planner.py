@@ -0,0 +1,174 @@
+"""
+增量路径规划器 - 在多次按 P 之间复用物品距离图，只修补发生变化的部分
+"""
+
+from algorithms.pathfinding import ItemGraphPathfinder, WALL
+from algorithms.result_cache import make_cache_key
+
+ITEM_TILES = ('G', 'T')
+
+
+class IncrementalPathPlanner:
+    """
+    增量版最优路径规划 (分数优先，步数次之)
+
+    内部持有一个 ItemGraphPathfinder，规划之间保留其距离图、桥树和各类缓存。
+    迷宫的变化通过 set_tile_type / clear_tile (或 sync 对比整张网格) 以增量形式记录，
+    下一次 plan 时再统一修补:
+    - 物品被清除: 以该物品为中转做一轮距离松弛 (D* Lite 式的局部修补)
+    - 宝箱、BOSS等非物品格的变化: 不影响距离图
+    - 墙壁变化或新增物品: 退回完整重建
+
+    若玩家沿上一次的最优路径前进、途中只清除了该路径上的物品，
+    由最优子结构可知剩余路径仍然最优，直接返回其后缀。
+
+    传入 result_cache (ResultCache) 时，未收集任何物品的规划结果按 (网格, 起点) 缓存，
+    重开同一关卡时无需建图即可直接返回。
+    """
+
+    def __init__(self, grid, result_cache=None):
+        self.grid = [row[:] for row in grid]
+        self.result_cache = result_cache
+        self.stats = {'full_builds': 0, 'repairs': 0, 'reused': 0, 'searches': 0, 'cache_hits': 0}
+        self._pathfinder = None
+        self._pending = []
+        self._last_plan = None
+
+    def set_tile_type(self, x, y, tile_type):
+        """记录一次格子变化 (坐标约定与 Maze.set_tile_type 相同，x 为列、y 为行)"""
+        if not (0 <= y < len(self.grid) and 0 <= x < len(self.grid[0])):
+            return False
+        old_type = self.grid[y][x]
+        if old_type != tile_type:
+            self.grid[y][x] = tile_type
+            self._pending.append((y, x, old_type, tile_type))
+        return True
+
+    def clear_tile(self, x, y):
+        """记录一次格子被清空为通路"""
+        return self.set_tile_type(x, y, ' ')
+
+    def sync(self, grid):
+        """与外部网格逐格对比，把差异登记为增量"""
+        for r, row in enumerate(grid):
+            own_row = self.grid[r]
+            for c, tile_type in enumerate(row):
+                if own_row[c] != tile_type:
+                    self.set_tile_type(c, r, tile_type)
+
+    def _apply_pending(self):
+        """把登记的增量应用到距离图上；遇到无法局部修补的变化时返回 False"""
+        pathfinder = self._pathfinder
+        for r, c, old_type, new_type in self._pending:
+            if WALL in (old_type, new_type) or 'E' in (old_type, new_type) or new_type in ITEM_TILES:
+                return False
+            if old_type in ITEM_TILES:
+                pathfinder.remove_item(self._item_index_at[(r, c)])
+        return True
+
+    def _rebuild(self):
+        self._pathfinder = ItemGraphPathfinder(self.grid)
+        self._item_index_at = {location: i for i, location in enumerate(self._pathfinder.item_locations)}
+        self._pending = []
+        self._last_plan = None
+        self.stats['full_builds'] += 1
+
+    def _reuse_last_plan(self, start, start_mask):
+        """
+        若当前状态 (格子, 已收集掩码) 恰好出现在上一条最优路径上，返回剩余路径；否则返回 None。
+        """
+        if self._last_plan is None:
+            return None
+        plan_mask, path = self._last_plan
+        item_values = self._pathfinder.item_values
+        walked_mask = plan_mask
+        for position, cell in enumerate(path):
+            item_index = self._item_index_at.get(cell)
+            if item_index is not None:
+                walked_mask |= 1 << item_index
+            if cell != start or walked_mask != start_mask:
+                continue
+
+            score = 0
+            mask = walked_mask
+            for later in path[position + 1:]:
+                item_index = self._item_index_at.get(later)
+                if item_index is not None and not (mask & (1 << item_index)):
+                    mask |= 1 << item_index
+                    score += item_values[item_index]
+            return score, path[position:], len(path) - 1 - position
+        return None
+
+    def plan(self, start=None, collected_mask=0, time_budget=None, on_improvement=None):
+        """
+        从 start (行, 列) 出发规划到终点的最优路径；start 为 None 时从 'S' 出发。
+
+        Args:
+            start (tuple | None): 玩家当前所在格子 (r, c)。
+            collected_mask (int): 已收集物品的位掩码 (位序与 item_locations 一致)。
+                   已从网格上清除的物品无需再标记。
+            time_budget (float | None): 时间预算 (秒)，用尽时返回当前最好解。
+            on_improvement (callable | None): 每找到一个更好的中间解时以
+                   (score, path, steps, upper_bound) 调用，用于边算边显示。
+
+        Returns:
+            tuple: (score, path, steps)，score 只统计本次路径上新收集的物品；
+                   找不到路径时返回 (-1, [], -1)。
+        """
+        if start is None:
+            start = next(((r, c) for r, row in enumerate(self.grid) for c, tile in enumerate(row) if tile == 'S'),
+                         None)
+            if start is None:
+                return -1, [], -1
+
+        cache_key = None
+        if self.result_cache is not None and not collected_mask:
+            cache_key = make_cache_key('plan', self.grid, start)
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                self.stats['cache_hits'] += 1
+                return cached
+
+        if self._pathfinder is None:
+            self._rebuild()
+        elif self._pending:
+            if self._apply_pending():
+                self.stats['repairs'] += 1
+                self._pending = []
+            else:
+                self._rebuild()
+
+        pathfinder = self._pathfinder
+        start_mask = collected_mask | pathfinder.removed_mask
+        reused = self._reuse_last_plan(start, start_mask)
+        if reused is not None:
+            self.stats['reused'] += 1
+            return reused
+
+        if start != pathfinder.start_pos:
+            pathfinder.set_start(start)
+        self.stats['searches'] += 1
+        if time_budget is None and on_improvement is None:
+            score, path, steps = pathfinder.calculate_optimal_path(initial_mask=start_mask)
+        else:
+            score, path, steps, is_optimal = -1, [], -1, False
+            for score, path, steps, upper_bound, is_optimal in pathfinder.iter_improving_paths(start_mask,
+                                                                                             time_budget):
+                if not is_optimal and on_improvement is not None:
+                    on_improvement((score, path, steps, upper_bound))
+            if not is_optimal:
+                # 预算内未证明最优: 返回当前最好解，但不缓存，也不作为后缀复用的依据
+                self._last_plan = None
+                return score, path, steps
+
+        self._last_plan = (start_mask, path) if path else None
+        if cache_key is not None:
+            self.result_cache.put(cache_key, (score, path, steps))
+        return score, path, steps
+
+    @property
+    def item_locations(self):
+        """物品坐标列表，collected_mask 的位序与之对应"""
+        if self._pathfinder is None:
+            self._rebuild()
+        return self._pathfinder.item_locations
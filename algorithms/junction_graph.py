@@ -0,0 +1,325 @@
+"""
+通道收缩图 - 把迷宫中只有两个可通行邻居的通道格压缩进边里
+
+节点: 路口 (三个及以上邻居)、死路 (至多一个邻居) 和所有特殊格子 (S/E/G/T/L/B)；
+      没有任何节点的环形通道另取其中一格作为节点。
+边:   两个节点之间的一段通道，权重为步数，并按顺序保存途经的通道格，
+      搜索结果可以逐格展开回原网格路径。
+在递归分割法生成的迷宫中，节点数约为可通行格子数的 1/4；放置物品后会略多一些。
+
+格子变化时:
+- 通路与特殊格子之间的变化只影响这一格是否为节点，就地拆分或合并所在的边
+- 墙壁变化改变了邻居关系，整张图重建
+"""
+
+import heapq
+import itertools
+
+WALL = '#'
+PATH = ' '
+INF = float('inf')
+
+
+class JunctionGraph:
+    """
+    迷宫的通道收缩图。坐标统一使用 (行, 列)。
+
+    Attributes:
+        nodes (set): 节点格子。
+        edges (dict): 边编号 -> (u, v, cells)，cells 为从 u 走到 v 途经的通道格 (不含两端)。
+        adjacency (dict): 节点 -> 关联的边编号列表。
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.rows = len(grid)
+        self.cols = len(grid[0]) if grid else 0
+        self.stats = {'builds': 0, 'splits': 0, 'merges': 0}
+        self._build()
+
+    # ------------------------------------------------------------------
+    # 建图与维护
+    # ------------------------------------------------------------------
+
+    def _neighbours(self, r, c):
+        grid = self.grid
+        found = []
+        for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+            if 0 <= nr < self.rows and 0 <= nc < self.cols and grid[nr][nc] != WALL:
+                found.append((nr, nc))
+        return found
+
+    def _is_node(self, cell):
+        """按规则判断一个可通行格是否应为节点 (不含环形通道的代表格)"""
+        return self.grid[cell[0]][cell[1]] != PATH or len(self._neighbours(*cell)) != 2
+
+    def _build(self):
+        self.stats['builds'] += 1
+        self.nodes = set()
+        self.edges = {}
+        self.adjacency = {}
+        self._edge_ids = itertools.count()
+        # 通道格 -> (边编号, 在 cells 中的下标)
+        self._corridor = {}
+
+        passable = [(r, c) for r in range(self.rows) for c in range(self.cols) if self.grid[r][c] != WALL]
+        for cell in passable:
+            if self._is_node(cell):
+                self._add_node(cell)
+        for node in list(self.nodes):
+            self._trace_from(node)
+        # 剩下未被覆盖的通道格都在不含节点的环上，每个环取一格作为节点
+        for cell in passable:
+            if cell not in self.nodes and cell not in self._corridor:
+                self._add_node(cell)
+                self._trace_from(cell)
+
+    def _add_node(self, cell):
+        self.nodes.add(cell)
+        self.adjacency.setdefault(cell, [])
+
+    def _add_edge(self, u, v, cells):
+        edge_id = next(self._edge_ids)
+        self.edges[edge_id] = (u, v, cells)
+        self.adjacency[u].append(edge_id)
+        if v != u:
+            self.adjacency[v].append(edge_id)
+        for index, cell in enumerate(cells):
+            self._corridor[cell] = (edge_id, index)
+        return edge_id
+
+    def _remove_edge(self, edge_id):
+        u, v, cells = self.edges.pop(edge_id)
+        self.adjacency[u].remove(edge_id)
+        if v != u:
+            self.adjacency[v].remove(edge_id)
+        for cell in cells:
+            del self._corridor[cell]
+        return u, v, cells
+
+    def _trace_from(self, node):
+        """沿 node 的每个尚未被覆盖的方向走到下一个节点，记录为边"""
+        for first in self._neighbours(*node):
+            if first in self._corridor:
+                continue
+            if first in self.nodes:
+                # 相邻的两个节点之间只记录一次
+                if node < first:
+                    self._add_edge(node, first, ())
+                continue
+            cells = []
+            previous, current = node, first
+            while current not in self.nodes:
+                cells.append(current)
+                a, b = self._neighbours(*current)
+                previous, current = current, (b if a == previous else a)
+            self._add_edge(node, current, tuple(cells))
+
+    def on_tile_changed(self, r, c, old_type, new_type):
+        """由 Maze.set_tile_type 调用，保持收缩图与网格一致"""
+        if old_type == new_type:
+            return
+        if WALL in (old_type, new_type):
+            self._build()
+            return
+        cell = (r, c)
+        if cell not in self.nodes and self._is_node(cell):
+            self._split(cell)
+        elif cell in self.nodes and not self._is_node(cell):
+            self._merge(cell)
+
+    def _split(self, cell):
+        """通道格变为节点: 把所在的边在这一格断开"""
+        edge_id, index = self._corridor[cell]
+        u, v, cells = self._remove_edge(edge_id)
+        self._add_node(cell)
+        self._add_edge(u, cell, cells[:index])
+        self._add_edge(cell, v, cells[index + 1:])
+        self.stats['splits'] += 1
+
+    def _merge(self, cell):
+        """节点变为普通通道格: 把两侧的边连成一条 (环上唯一的节点保持不变)"""
+        incident = self.adjacency[cell]
+        if len(incident) != 2:
+            return
+        first, second = (self.edges[edge_id] for edge_id in incident)
+        for edge_id in list(incident):
+            self._remove_edge(edge_id)
+        # 把两条边都定向为 "... -> cell" 和 "cell -> ..."
+        a, _, cells_a = first if first[1] == cell else (first[1], first[0], first[2][::-1])
+        _, b, cells_b = second if second[0] == cell else (second[1], second[0], second[2][::-1])
+        self.nodes.discard(cell)
+        del self.adjacency[cell]
+        self._add_edge(a, b, cells_a + (cell,) + cells_b)
+        self.stats['merges'] += 1
+
+    # ------------------------------------------------------------------
+    # 搜索
+    # ------------------------------------------------------------------
+
+    def _entry_points(self, cell):
+        """从任意可通行格进入图: [(节点, 距离, 途经格子 (不含 cell，含节点))]"""
+        if cell in self.nodes:
+            return [(cell, 0, [])]
+        edge_id, index = self._corridor[cell]
+        u, v, cells = self.edges[edge_id]
+        return [(u, index + 1, list(cells[index - 1::-1]) + [u] if index else [u]),
+                (v, len(cells) - index, list(cells[index + 1:]) + [v])]
+
+    def _edge_cells(self, edge_id, from_node):
+        """沿边从 from_node 走到另一端途经的格子 (不含 from_node，含另一端)"""
+        u, v, cells = self.edges[edge_id]
+        if from_node == u:
+            return list(cells) + [v]
+        return list(cells[::-1]) + [u]
+
+    def _dijkstra(self, start, terminals=None, goal=None):
+        """
+        从 start (任意可通行格) 出发的最短路。
+
+        terminals 中的节点 (start 本身除外) 只可到达、不可穿过；
+        给出 goal 时以曼哈顿距离为启发式 (A*)，确定 goal 所需的节点距离后提前结束。
+        返回 (节点距离, 前驱)，前驱为 (上一节点, 边编号)，起始的入口节点为 (None, 途经格子)。
+        """
+        terminals = terminals or ()
+        goal_entries = {}
+        if goal is not None:
+            for node, extra, _ in self._entry_points(goal):
+                goal_entries[node] = min(extra, goal_entries.get(node, INF))
+
+        def heuristic(node):
+            return abs(node[0] - goal[0]) + abs(node[1] - goal[1]) if goal is not None else 0
+
+        dist = {}
+        parents = {}
+        heap = []
+        for node, d, walked in self._entry_points(start):
+            if d < dist.get(node, INF):
+                dist[node] = d
+                parents[node] = (None, walked)
+                heapq.heappush(heap, (d + heuristic(node), d, node))
+
+        best_goal = INF
+        settled = set()
+        while heap:
+            f, d, node = heapq.heappop(heap)
+            if node in settled or d > dist[node]:
+                continue
+            if f >= best_goal:
+                break
+            settled.add(node)
+            if node in goal_entries:
+                best_goal = min(best_goal, d + goal_entries[node])
+            if node in terminals and node != start:
+                continue
+            for edge_id in self.adjacency[node]:
+                u, v, cells = self.edges[edge_id]
+                if u == v:
+                    continue
+                other = v if u == node else u
+                nd = d + len(cells) + 1
+                if nd < dist.get(other, INF):
+                    dist[other] = nd
+                    parents[other] = (node, edge_id)
+                    heapq.heappush(heap, (nd + heuristic(other), nd, other))
+        return dist, parents
+
+    def _path_to_node(self, start, parents, node):
+        """按前驱展开到 node 的逐格路径 (含 start 和 node)"""
+        segments = []
+        while True:
+            previous, via = parents[node]
+            if previous is None:
+                segments.append(via)
+                break
+            segments.append(self._edge_cells(via, previous))
+            node = previous
+        path = [start]
+        for segment in reversed(segments):
+            path.extend(segment)
+        return path
+
+    def _best_exit(self, start, dist, cell, terminals=()):
+        """
+        在节点距离已知时求 start 到任意格子 cell 的距离及最后一段走法。
+        返回 (距离, 经由的节点或 None, 从该节点到 cell 的格子)；None 节点表示 start 与 cell 在同一段通道上直走。
+        """
+        if cell in self.nodes:
+            return dist.get(cell, INF), cell, []
+        edge_id, index = self._corridor[cell]
+        u, v, cells = self.edges[edge_id]
+        options = []
+        if u not in terminals or u == start:
+            options.append((dist.get(u, INF) + index + 1, u, list(cells[:index + 1])))
+        if v not in terminals or v == start:
+            options.append((dist.get(v, INF) + len(cells) - index, v, list(cells[index:][::-1])))
+        start_position = self._corridor.get(start)
+        if start_position is not None and start_position[0] == edge_id:
+            start_index = start_position[1]
+            step = 1 if index > start_index else -1
+            direct = [cells[i] for i in range(start_index + step, index + step, step)]
+            options.append((abs(index - start_index), None, direct))
+        return min(options, key=lambda option: option[0], default=(INF, None, []))
+
+    def shortest_path(self, start, goal):
+        """start 到 goal 的最短逐格路径 (含两端)，不可达时返回空列表。在收缩图上做 A*。"""
+        for r, c in (start, goal):
+            if not (0 <= r < self.rows and 0 <= c < self.cols) or self.grid[r][c] == WALL:
+                return []
+        if start == goal:
+            return [start]
+        dist, parents = self._dijkstra(start, goal=goal)
+        distance, node, tail = self._best_exit(start, dist, goal)
+        if distance == INF:
+            return []
+        if node is None:
+            return [start] + tail
+        return self._path_to_node(start, parents, node) + tail
+
+    def distances_from(self, start, targets, terminals=()):
+        """
+        start 到各 targets 格子的距离 (不可达为 INF)，以及展开路径的函数。
+
+        terminals 中的格子 (必须是节点，start 除外) 只可到达、不可穿过，
+        供物品图引擎计算"途中不触碰其它物品"的直达距离。
+        """
+        dist, parents = self._dijkstra(start, terminals=terminals)
+        exits = [self._best_exit(start, dist, target, terminals) for target in targets]
+
+        def expand(target_index):
+            distance, node, tail = exits[target_index]
+            if distance == INF:
+                return []
+            if node is None:
+                return [start] + tail
+            return self._path_to_node(start, parents, node) + tail
+
+        return [distance for distance, _, _ in exits], expand
+
+    def distance_field(self, target):
+        """所有格子到 target 的步数 (扁平列表，下标 r * cols + c，不可达为 -1)"""
+        cols = self.cols
+        field = [-1] * (self.rows * cols)
+        r, c = target
+        if not (0 <= r < self.rows and 0 <= c < cols) or self.grid[r][c] == WALL:
+            return field
+        dist, _ = self._dijkstra(target)
+        for node, d in dist.items():
+            field[node[0] * cols + node[1]] = d
+        for u, v, cells in self.edges.values():
+            du, dv = dist.get(u, INF), dist.get(v, INF)
+            length = len(cells)
+            for index, (cr, cc) in enumerate(cells):
+                d = min(du + index + 1, dv + length - index)
+                if d != INF:
+                    field[cr * cols + cc] = d
+        # target 所在通道上的格子可以不经过端点直达
+        position = self._corridor.get(target)
+        if position is not None:
+            edge_id, target_index = position
+            for index, (cr, cc) in enumerate(self.edges[edge_id][2]):
+                current = field[cr * cols + cc]
+                direct = abs(index - target_index)
+                if current == -1 or direct < current:
+                    field[cr * cols + cc] = direct
+        return field
@@ -3,140 +3,300 @@
 """
 
 import random
-from typing import List
+from array import array
+from typing import Iterator, List, Optional
+import numpy as np
 import config as cfg
 
+# uint8 网格中的编码
+PATH_CODE = 0
+WALL_CODE = 1
+
 
 class DSU:
-    """并查集数据结构，用于Kruskal算法"""
+    """并查集数据结构，用于Kruskal算法 (路径减半 + 按大小合并，父节点和集合大小存放在 array('i') 中)"""
     
     def __init__(self, n: int):
         """初始化并查集"""
-        self.parent: List[int] = list(range(n))
+        self.parent = array('i', range(n))
+        self.size = array('i', [1]) * n
         self.num_sets: int = n
     
     def find(self, i: int) -> int:
-        """查找根节点"""
-        if self.parent[i] == i:
-            return i
-        self.parent[i] = self.find(self.parent[i])
-        return self.parent[i]
+        """查找根节点 (迭代，沿途把节点指向祖父节点)"""
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
     
     def union(self, i: int, j: int) -> bool:
-        """合并两个集合"""
+        """合并两个集合，较小的集合挂到较大的集合下"""
         root_i = self.find(i)
         root_j = self.find(j)
-        if root_i != root_j:
-            self.parent[root_i] = root_j
-            self.num_sets -= 1
-            return True
-        return False
+        if root_i == root_j:
+            return False
+        if self.size[root_i] > self.size[root_j]:
+            root_i, root_j = root_j, root_i
+        self.parent[root_i] = root_j
+        self.size[root_j] += self.size[root_i]
+        self.num_sets -= 1
+        return True
 
 
 def generate_kruskal_maze(width: int, height: int) -> List[List[str]]:
-    """使用Kruskal算法生成迷宫"""
-    # 初始化网格
-    grid_width = width 
-    grid_height = height 
-    grid = [[cfg.WALL for _ in range(grid_width)] for _ in range(grid_height)]
-    
-    # 创建所有墙的列表
-    walls = []
-    for y in range(height):
-        for x in range(width):
-            if x < width - 1:
-                walls.append(((x, y), (x + 1, y)))
-            if y < height - 1:
-                walls.append(((x, y), (x, y + 1)))
-    
-    random.shuffle(walls)
-    
-    # 初始化并查集
-    num_cells = width * height
-    dsu = DSU(num_cells)
-    
+    """
+    使用Kruskal算法生成迷宫。
+
+    width、height 为房间 (格子) 的列数和行数，返回 (2*height+1) 行 x (2*width+1) 列的网格:
+    房间位于奇数行奇数列，相邻房间之间的墙在两者中间。
+    所有墙以 NumPy 下标数组生成并打乱 (随机数种子取自 random 模块，random.seed 仍然有效)。
+    """
+    grid_width = 2 * width + 1
+    grid_height = 2 * height + 1
+    if width <= 0 or height <= 0:
+        return [[cfg.WALL] * max(grid_width, 1) for _ in range(max(grid_height, 1))]
+
+    # 每面墙用其两侧房间的编号 (y * width + x) 表示: 先所有横向相邻，再所有纵向相邻
+    cells = np.arange(width * height, dtype=np.int64).reshape(height, width)
+    first = np.concatenate((cells[:, :-1].ravel(), cells[:-1, :].ravel()))
+    second = np.concatenate((cells[:, 1:].ravel(), cells[1:, :].ravel()))
+    order = np.random.default_rng(random.getrandbits(64)).permutation(len(first))
+    first, second = first[order], second[order]
+
     # 遍历墙列表，连接集合
-    for wall in walls:
-        cell1, cell2 = wall
-        x1, y1 = cell1
-        x2, y2 = cell2
-        
-        cell1_idx = y1 * width + x1
-        cell2_idx = y2 * width + x2
-        
+    dsu = DSU(width * height)
+    opened = np.zeros(len(first), dtype=bool)
+    for k, (cell1_idx, cell2_idx) in enumerate(zip(first.tolist(), second.tolist())):
         # 如果不连通，则打通墙
         if dsu.union(cell1_idx, cell2_idx):
-            grid[y1 * 2 + 1][x1 * 2 + 1] = cfg.PATH
-            grid[y2 * 2 + 1][x2 * 2 + 1] = cfg.PATH
-            grid[y1 + y2 + 1][x1 + x2 + 1] = cfg.PATH
-            
-        if dsu.num_sets == 1:
+            opened[k] = True
+            if dsu.num_sets == 1:
+                break
+
+    open_grid = np.zeros((grid_height, grid_width), dtype=bool)
+    open_grid[1::2, 1::2] = True
+    y1, x1 = np.divmod(first[opened], width)
+    y2, x2 = np.divmod(second[opened], width)
+    open_grid[y1 + y2 + 1, x1 + x2 + 1] = True
+    return np.where(open_grid, cfg.PATH, cfg.WALL).tolist()
+
+
+def generate_eller_rows(width: int, height: Optional[int] = None) -> Iterator[List[str]]:
+    """
+    使用 Eller 算法逐行生成迷宫，每次产生网格的一行 (list of str)。
+
+    width、height 为房间的列数和行数，与 generate_kruskal_maze 相同，完整网格为
+    (2*height+1) 行 x (2*width+1) 列；height 为 None 时无限生成 (不产生底部外墙)。
+    任意时刻只保存当前房间行所属的集合，内存只与 width 有关，与 height 无关。
+    """
+    grid_width = 2 * width + 1
+    yield [cfg.WALL] * grid_width
+    if width <= 0:
+        return
+
+    # 当前房间行每列所属的集合编号，以及每个集合包含的列
+    next_id = width
+    row_sets = list(range(width))
+    members = {set_id: [col] for col, set_id in enumerate(row_sets)}
+    row = 0
+    while height is None or row < height:
+        last_row = height is not None and row == height - 1
+
+        # 横向: 随机打通相邻且不在同一集合的房间 (最后一行必须全部打通)
+        joined = [False] * width
+        for col in range(width - 1):
+            a, b = row_sets[col], row_sets[col + 1]
+            if a != b and (last_row or random.random() < 0.5):
+                joined[col] = True
+                if len(members[a]) < len(members[b]):
+                    a, b = b, a
+                for member in members[b]:
+                    row_sets[member] = a
+                members[a].extend(members.pop(b))
+
+        room_row = [cfg.WALL]
+        for col in range(width):
+            room_row.append(cfg.PATH)
+            room_row.append(cfg.PATH if joined[col] else cfg.WALL)
+        yield room_row
+        if last_row:
             break
-    
+
+        # 纵向: 每个集合至少向下打通一格，其余随机
+        next_sets = [-1] * width
+        for set_id, cols in members.items():
+            downs = [col for col in cols if random.random() < 0.5]
+            if not downs:
+                downs = [random.choice(cols)]
+            for col in downs:
+                next_sets[col] = set_id
+
+        wall_row = [cfg.WALL]
+        for col in range(width):
+            wall_row.append(cfg.WALL if next_sets[col] == -1 else cfg.PATH)
+            wall_row.append(cfg.WALL)
+        yield wall_row
+
+        # 未被向下打通的房间各自成为新集合
+        members = {}
+        for col in range(width):
+            if next_sets[col] == -1:
+                next_sets[col] = next_id
+                next_id += 1
+            members.setdefault(next_sets[col], []).append(col)
+        row_sets = next_sets
+        row += 1
+
+    yield [cfg.WALL] * grid_width
+
+
+def generate_eller_maze(width: int, height: int) -> List[List[str]]:
+    """使用 Eller 算法生成完整的迷宫网格 (收集 generate_eller_rows 的所有行)"""
+    return list(generate_eller_rows(width, height))
+
+
+def _room_grid(width: int, height: int) -> np.ndarray:
+    """(2*height+1) x (2*width+1) 的 uint8 网格，房间 (奇数行奇数列) 为通路，其余为墙"""
+    grid = np.full((2 * height + 1, 2 * width + 1), WALL_CODE, dtype=np.uint8)
+    grid[1::2, 1::2] = PATH_CODE
     return grid
 
 
-def generate_recursive_division_maze(width: int, height: int) -> List[List[str]]:
-    """使用递归分割法生成迷宫"""
-    grid_width = width
-    grid_height = height 
-    grid = [[cfg.PATH for _ in range(grid_width)] for _ in range(grid_height)]
-    
-    # 构建外墙
-    for i in range(grid_width):
-        grid[0][i] = cfg.WALL
-        grid[grid_height - 1][i] = cfg.WALL
-    for i in range(grid_height):
-        grid[i][0] = cfg.WALL
-        grid[i][grid_width - 1] = cfg.WALL
-    
-    # 递归分割
-    _recursive_divide(grid, 1, 1, grid_width - 2, grid_height - 2)
-    
+def generate_binary_tree_array(width: int, height: int) -> np.ndarray:
+    """
+    使用二叉树算法生成迷宫，返回 uint8 网格 (尺寸规则同 generate_kruskal_maze)。
+
+    每个房间独立地随机向北或向东打通一面墙 (第一行只能向东，最右一列只能向北)，
+    整个打通过程是一次随机位数组上的向量化运算。
+    """
+    grid = _room_grid(width, height)
+    if width <= 0 or height <= 0:
+        return grid
+    rng = np.random.default_rng(random.getrandbits(64))
+    north = rng.random((height, width)) < 0.5
+    north[0, :] = False
+    north[1:, -1] = True
+    east = ~north
+    east[:, -1] = False
+
+    grid[0:-1:2, 1::2][north] = PATH_CODE
+    grid[1::2, 2:-1:2][east[:, :-1]] = PATH_CODE
     return grid
 
 
-def _recursive_divide(grid: List[List[str]], x: int, y: int, w: int, h: int) -> None:
-    """递归分割辅助函数"""
-    if w < 3 or h < 3:
-        return
+def generate_sidewinder_array(width: int, height: int) -> np.ndarray:
+    """
+    使用 Sidewinder 算法生成迷宫，返回 uint8 网格 (尺寸规则同 generate_kruskal_maze)。
+
+    第一行整行向东打通；其余每行被随机切成若干段 (行末必定结束一段)，
+    段内向东打通，每段再随机选一个房间向北打通。
+    段的划分和段内的选取都用行程 (run-length) 下标一次算出，没有逐格循环。
+    """
+    grid = _room_grid(width, height)
+    if width <= 0 or height <= 0:
+        return grid
+    rng = np.random.default_rng(random.getrandbits(64))
+    grid[1, 2:-1:2] = PATH_CODE
+    if height == 1:
+        return grid
+
+    # 除第一行外，close[r, c] 表示第 r 行的一段在第 c 列结束；行末必定结束，因此展平后各段不跨行
+    close = rng.random((height - 1, width)) < 0.5
+    close[:, -1] = True
+    grid[3::2, 2:-1:2][~close[:, :-1]] = PATH_CODE
+
+    ends = np.flatnonzero(close)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    chosen = starts + (rng.random(len(ends)) * (ends - starts + 1)).astype(np.int64)
+    rows, cols = np.divmod(chosen, width)
+    grid[2 * rows + 2, 2 * cols + 1] = PATH_CODE
+    return grid
+
+
+def generate_binary_tree_maze(width: int, height: int) -> List[List[str]]:
+    """使用二叉树算法生成迷宫 (返回字符网格)"""
+    return grid_to_symbols(generate_binary_tree_array(width, height))
+
+
+def generate_sidewinder_maze(width: int, height: int) -> List[List[str]]:
+    """使用 Sidewinder 算法生成迷宫 (返回字符网格)"""
+    return grid_to_symbols(generate_sidewinder_array(width, height))
+
+
+def generate_recursive_division_maze(width: int, height: int) -> List[List[str]]:
+    """使用递归分割法生成迷宫 (返回字符网格，由 generate_recursive_division_array 转换)"""
+    return grid_to_symbols(generate_recursive_division_array(width, height))
+
+
+def grid_to_symbols(grid: np.ndarray) -> List[List[str]]:
+    """把 uint8 编码的网格转换为字符网格 (list of list of str)"""
+    return np.where(grid == WALL_CODE, cfg.WALL, cfg.PATH).tolist()
+
+
+def generate_recursive_division_array(width: int, height: int) -> np.ndarray:
+    """
+    使用递归分割法生成迷宫，返回 height x width 的 uint8 数组 (WALL_CODE / PATH_CODE)。
+
+    不使用递归: 待分割的区域放在一组数组里，同一代的所有区域用一次向量化运算
+    选方向、墙和通道的位置，再得到下一代区域，代数约为 O(log(width * height))。
+    每个区域的抽取方式与逐个递归时相同 (均匀分布)，只是换成了 NumPy 随机数，
+    种子取自 random 模块，random.seed 仍然有效。
+    子区域的墙总在父墙之间，不会压到之前开的通道，因此所有墙段最后用差分数组的
+    累加和一次画出，再开通道。
+    """
+    grid = np.full((height, width), PATH_CODE, dtype=np.uint8)
+    
+    # 构建外墙
+    grid[[0, -1], :] = WALL_CODE
+    grid[:, [0, -1]] = WALL_CODE
+    if width < 5 or height < 5:
+        return grid
     
-    # 决定砌墙方向
-    if w < h:
-        orientation = 'HORIZONTAL'
-    elif h < w:
-        orientation = 'VERTICAL'
-    else:
-        orientation = random.choice(['HORIZONTAL', 'VERTICAL'])
+    rng = np.random.default_rng(random.getrandbits(64))
+    column_diff = np.zeros((height + 1, width), dtype=np.int8)
+    row_diff = np.zeros((height, width + 1), dtype=np.int8)
+    passage_rows, passage_cols = [], []
     
-    if orientation == 'VERTICAL':
-        # 垂直砌墙
-        wall_x = x + 1 + 2 * random.randrange((w - 1) // 2)
-        passage_y = y + 2 * random.randrange((h + 1) // 2)
+    # 当前这一代待分割的区域 (x, y, w, h)
+    x, y, w, h = (np.array([value]) for value in (1, 1, width - 2, height - 2))
+    while len(x):
+        draws = rng.random((3, len(x)))
         
-        # 砌墙
-        for i in range(y, y + h):
-            grid[i][wall_x] = cfg.WALL
-        # 开通道
-        grid[passage_y][wall_x] = cfg.PATH
+        # 决定砌墙方向: 窄的一边砌墙，正方形随机
+        vertical = np.where(w == h, draws[0] < 0.5, h < w)
+        horizontal = ~vertical
         
-        # 递归处理左右区域
-        _recursive_divide(grid, x, y, wall_x - x, h)
-        _recursive_divide(grid, wall_x + 1, y, x + w - (wall_x + 1), h)
-    
-    else:  # HORIZONTAL
-        # 水平砌墙
-        wall_y = y + 1 + 2 * random.randrange((h - 1) // 2)
-        passage_x = x + 2 * random.randrange((w + 1) // 2)
+        # 垂直砌墙: 墙在奇数偏移的列，通道在偶数偏移的行
+        vx, vy, vw, vh = x[vertical], y[vertical], w[vertical], h[vertical]
+        wall_x = vx + 1 + 2 * (draws[1][vertical] * ((vw - 1) // 2)).astype(np.int64)
+        passage_y = vy + 2 * (draws[2][vertical] * ((vh + 1) // 2)).astype(np.int64)
+        column_diff[vy, wall_x] += 1
+        column_diff[vy + vh, wall_x] -= 1
+        passage_rows.append(passage_y)
+        passage_cols.append(wall_x)
         
-        # 砌墙
-        for i in range(x, x + w):
-            grid[wall_y][i] = cfg.WALL
-        # 开通道
-        grid[wall_y][passage_x] = cfg.PATH
+        # 水平砌墙
+        hx, hy, hw, hh = x[horizontal], y[horizontal], w[horizontal], h[horizontal]
+        wall_y = hy + 1 + 2 * (draws[1][horizontal] * ((hh - 1) // 2)).astype(np.int64)
+        passage_x = hx + 2 * (draws[2][horizontal] * ((hw + 1) // 2)).astype(np.int64)
+        row_diff[wall_y, hx] += 1
+        row_diff[wall_y, hx + hw] -= 1
+        passage_rows.append(wall_y)
+        passage_cols.append(passage_x)
         
-        # 递归处理上下区域
-        _recursive_divide(grid, x, y, w, wall_y - y)
-        _recursive_divide(grid, x, wall_y + 1, w, y + h - (wall_y + 1))
-
-
+        # 下一代: 墙两侧的子区域，只保留还能继续分割的
+        x = np.concatenate((vx, wall_x + 1, hx, hx))
+        y = np.concatenate((vy, vy, hy, wall_y + 1))
+        w = np.concatenate((wall_x - vx, vx + vw - (wall_x + 1), hw, hw))
+        h = np.concatenate((vh, vh, wall_y - hy, hy + hh - (wall_y + 1)))
+        keep = (w >= 3) & (h >= 3)
+        x, y, w, h = x[keep], y[keep], w[keep], h[keep]
+    
+    # 差分数组沿墙段方向累加后大于 0 的格子是墙
+    inner_walls = (np.cumsum(column_diff, axis=0, dtype=np.int8)[:-1] > 0) | \
+        (np.cumsum(row_diff, axis=1, dtype=np.int8)[:, :-1] > 0)
+    grid[inner_walls] = WALL_CODE
+    grid[np.concatenate(passage_rows), np.concatenate(passage_cols)] = PATH_CODE
+    
+    return grid
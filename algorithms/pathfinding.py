@@ -1,5 +1,11 @@
 import heapq
 import json
+import mmap
+import time
+
+from algorithms.bitset_bfs import BitGrid
+from algorithms.junction_graph import JunctionGraph
+from algorithms.priority_queue import create_priority_queue
 
 # --- 算法核心部分 (V3 - 分数优先，步数次之) ---
 
@@ -9,6 +15,8 @@ CELL_VALUES = {
     'G': 5, 'T': -3
 }
 WALL = '#'
+INF = float('inf')
+DIRECTIONS = [(0, 1), (0, -1), (1, 0), (-1, 0)]
 
 
 class OptimalPathfinderWithRepeats:
@@ -17,12 +25,30 @@ class OptimalPathfinderWithRepeats:
 
     使用Dijkstra算法的变体，在允许重复路径的规则下，
     计算最优路径。当存在多条路径得分相同时，选择步数最短的一条。
+
+    storage='dict' 使用以 (r, c, mask) 元组为键的字典记录状态 (参考实现)；
+    storage='array' 使用按 cell_index * 2**num_items + mask 索引的扁平数组，
+    可通过 backing_file 把数组映射到磁盘文件上，用于内存放不下的搜索。
+
+    prune_dominated=True 时为每个格子维护一个帕累托标签集：若同一格子上已有标签
+    收集的金币是超集、踩过的陷阱是子集且步数不多，新标签就被支配，不会入队。
+    每次搜索的扩展/入队/剪枝次数记录在 self.stats 中。
+
+    queue 选择字典存储下的优先队列: 'heap' (heapq) 或 'bucket' (按分数、步数分桶)；
+    数组存储始终使用压缩成单个整数键的 heapq。
     """
 
-    def __init__(self, grid):
+    def __init__(self, grid, storage='dict', backing_file=None, prune_dominated=True, queue='heap'):
         if not grid or not grid[0]:
             raise ValueError("迷宫网格不能为空。")
+        if storage not in ('dict', 'array'):
+            raise ValueError(f"未知的状态存储方式: {storage}")
         self.grid = grid
+        self.storage = storage
+        self.backing_file = backing_file
+        self.prune_dominated = prune_dominated
+        self.queue = queue
+        self.stats = {'expanded': 0, 'pushed': 0, 'pruned': 0}
         self.rows = len(grid)
         self.cols = len(grid[0])
 
@@ -49,6 +75,36 @@ class OptimalPathfinderWithRepeats:
             raise ValueError("迷宫必须包含一个起点 'S' 和一个终点 'E'。")
 
         self.num_items = len(self.item_locations)
+        self.positive_mask = 0
+        self.negative_mask = 0
+        for item_index, value in enumerate(self.item_values):
+            if value > 0:
+                self.positive_mask |= 1 << item_index
+            elif value < 0:
+                self.negative_mask |= 1 << item_index
+
+    def _insert_label(self, labels, mask, steps):
+        """
+        把标签 (mask, steps) 加入某个格子的帕累托标签集 labels ({mask: steps})。
+        若被已有标签支配则返回 False；否则移除被它支配的旧标签并返回 True。
+        """
+        positive_mask = self.positive_mask
+        negative_mask = self.negative_mask
+        dominated = []
+        for other_mask, other_steps in labels.items():
+            if other_mask == mask:
+                continue
+            gold_superset = not (mask & ~other_mask & positive_mask)
+            trap_subset = not (other_mask & ~mask & negative_mask)
+            if gold_superset and trap_subset and other_steps <= steps:
+                return False
+            if (not (other_mask & ~mask & positive_mask) and not (mask & ~other_mask & negative_mask)
+                    and steps <= other_steps):
+                dominated.append(other_mask)
+        for other_mask in dominated:
+            del labels[other_mask]
+        labels[mask] = steps
+        return True
 
     def _reconstruct_path(self, predecessor, best_final_state):
         path = []
@@ -64,12 +120,19 @@ class OptimalPathfinderWithRepeats:
         """
         主函数：计算最优路径（分数优先，步数次之）。
         """
-        # 优先队列: (-score, steps, r, c, mask)
-        pq = []
+        if self.storage == 'array':
+            return self._calculate_with_state_tables()
+
+        # 优先队列: 键 (-score, steps)，元素 (r, c, mask)
+        max_score = sum(value for value in self.item_values if value > 0)
+        pq = create_priority_queue(self.queue, min_key=(-max_score, 0))
         # 记录到达每个状态 (r, c, mask) 的信息: (score, steps)
         best_records = {}
         # 记录路径回溯的前驱节点
         predecessor = {}
+        # 每个格子 (r, c) 上的帕累托标签集: {mask: steps}
+        pareto_labels = {}
+        self.stats = {'expanded': 0, 'pushed': 0, 'pruned': 0}
 
         # 初始化起点状态
         if self.start_pos is None:
@@ -85,19 +148,25 @@ class OptimalPathfinderWithRepeats:
             initial_score = self.item_values[item_index]
 
         start_state = (start_r, start_c, initial_mask)
-        heapq.heappush(pq, (-initial_score, initial_steps, start_r, start_c, initial_mask))
+        pq.push((-initial_score, initial_steps), (start_r, start_c, initial_mask))
         best_records[start_state] = (initial_score, initial_steps)
         predecessor[start_state] = None
+        pareto_labels[(start_r, start_c)] = {initial_mask: initial_steps}
+        self.stats['pushed'] += 1
 
         # 主循环
         while pq:
-            neg_score, steps, r, c, mask = heapq.heappop(pq)
+            (neg_score, steps), (r, c, mask) = pq.pop()
             score = -neg_score
 
             # 如果有更优路径到达当前状态，则跳过
             current_best_score, current_best_steps = best_records.get((r, c, mask), (-float('inf'), float('inf')))
             if score < current_best_score or (score == current_best_score and steps > current_best_steps):
                 continue
+            # 入队后被新标签支配的状态不再扩展
+            if self.prune_dominated and pareto_labels[(r, c)].get(mask) != steps:
+                continue
+            self.stats['expanded'] += 1
 
             # 探索邻居
             for dr, dc in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
@@ -122,9 +191,14 @@ class OptimalPathfinderWithRepeats:
                 # 如果发现了更优的路径
                 new_best_score, new_best_steps = best_records.get(new_state, (-float('inf'), float('inf')))
                 if new_score > new_best_score or (new_score == new_best_score and new_steps < new_best_steps):
+                    if self.prune_dominated and not self._insert_label(
+                            pareto_labels.setdefault((nr, nc), {}), new_mask, new_steps):
+                        self.stats['pruned'] += 1
+                        continue
                     best_records[new_state] = (new_score, new_steps)
                     predecessor[new_state] = (r, c, mask)
-                    heapq.heappush(pq, (-new_score, new_steps, nr, nc, new_mask))
+                    pq.push((-new_score, new_steps), (nr, nc, new_mask))
+                    self.stats['pushed'] += 1
 
         # 查找终点的最优解
         best_score = -float('inf')
@@ -145,14 +219,1067 @@ class OptimalPathfinderWithRepeats:
         return best_score, optimal_path, min_steps
 
 
+    def _allocate_state_tables(self, num_states):
+        """
+        分配两张扁平状态表:
+        - steps: uint32，存 步数+1，0 表示尚未到达
+        - predecessor: uint8，低两位+1 为来时方向在 DIRECTIONS 中的下标，
+          第4位表示本步新收集了当前格的物品；0 表示没有前驱 (起点)
+
+        匿名 mmap 与稀疏文件都是按页惰性分配的，只有真正触及的状态才占用内存。
+        """
+        size = num_states * 5
+        if self.backing_file is None:
+            buffer = mmap.mmap(-1, size)
+        else:
+            with open(self.backing_file, 'w+b') as f:
+                f.truncate(size)
+                buffer = mmap.mmap(f.fileno(), size)
+        view = memoryview(buffer)
+        steps_table = view[:num_states * 4].cast('I')
+        predecessor_table = view[num_states * 4:]
+        return buffer, view, steps_table, predecessor_table
+
+    def _calculate_with_state_tables(self):
+        """
+        与字典版完全相同的搜索，但状态表改为扁平数组，优先队列中也只存一个整数键，
+        每个状态的开销从数百字节降到 5 字节。
+        """
+        n = self.num_items
+        num_masks = 1 << n
+        full_mask = num_masks - 1
+
+        cell_ids = [[-1] * self.cols for _ in range(self.rows)]
+        cells = []
+        for r in range(self.rows):
+            for c in range(self.cols):
+                if self.grid[r][c] != WALL:
+                    cell_ids[r][c] = len(cells)
+                    cells.append((r, c))
+        num_states = len(cells) * num_masks
+
+        # 每个格子的邻居: (方向下标, 邻居格子编号, 邻居物品位 或 0, 邻居物品价值)
+        neighbours = []
+        for r, c in cells:
+            entries = []
+            for direction, (dr, dc) in enumerate(DIRECTIONS):
+                nr, nc = r + dr, c + dc
+                if not (0 <= nr < self.rows and 0 <= nc < self.cols and self.grid[nr][nc] != WALL):
+                    continue
+                item_index = self.item_map.get((nr, nc))
+                if item_index is None:
+                    entries.append((direction, cell_ids[nr][nc], 0, 0))
+                else:
+                    entries.append((direction, cell_ids[nr][nc], 1 << item_index, self.item_values[item_index]))
+            neighbours.append(entries)
+
+        # 优先级整数键: ((max_score - score) * step_range + steps) * num_states + state_index
+        # 状态编号按 (r, c, mask) 的字典序分配，因此与字典版的元组优先级排序完全一致
+        max_score = sum(value for value in self.item_values if value > 0)
+        step_range = num_states + 1
+        key_scale = step_range * num_states
+
+        buffer, view, steps_table, predecessor_table = self._allocate_state_tables(num_states)
+        try:
+            start_r, start_c = self.start_pos
+            initial_mask = 0
+            initial_score = 0
+            if (start_r, start_c) in self.item_map:
+                item_index = self.item_map[(start_r, start_c)]
+                initial_mask = 1 << item_index
+                initial_score = self.item_values[item_index]
+
+            start_index = cell_ids[start_r][start_c] * num_masks + initial_mask
+            steps_table[start_index] = 1
+            pq = [(max_score - initial_score) * key_scale + start_index]
+            pareto_labels = [None] * len(cells)
+            pareto_labels[start_index >> n] = {initial_mask: 0}
+            self.stats = {'expanded': 0, 'pushed': 1, 'pruned': 0}
+
+            end_cell = cell_ids[self.end_pos[0]][self.end_pos[1]]
+            end_states = []
+            if start_index >> n == end_cell:
+                end_states.append(start_index)
+
+            while pq:
+                key = heapq.heappop(pq)
+                rest, state_index = divmod(key, num_states)
+                score_gap, steps = divmod(rest, step_range)
+                if steps + 1 > steps_table[state_index]:
+                    continue
+
+                score = max_score - score_gap
+                cell = state_index >> n
+                mask = state_index & full_mask
+                if self.prune_dominated and pareto_labels[cell].get(mask) != steps:
+                    continue
+                self.stats['expanded'] += 1
+                new_steps = steps + 1
+                for direction, next_cell, bit, value in neighbours[cell]:
+                    new_mask = mask
+                    new_score = score
+                    code = direction + 1
+                    if bit and not (mask & bit):
+                        new_mask = mask | bit
+                        new_score = score + value
+                        code |= 8
+
+                    new_index = next_cell * num_masks + new_mask
+                    recorded = steps_table[new_index]
+                    if recorded == 0 or new_steps + 1 < recorded:
+                        if self.prune_dominated:
+                            if pareto_labels[next_cell] is None:
+                                pareto_labels[next_cell] = {}
+                            if not self._insert_label(pareto_labels[next_cell], new_mask, new_steps):
+                                self.stats['pruned'] += 1
+                                continue
+                        if recorded == 0 and next_cell == end_cell:
+                            end_states.append(new_index)
+                        steps_table[new_index] = new_steps + 1
+                        predecessor_table[new_index] = code
+                        heapq.heappush(pq, ((max_score - new_score) * step_range + new_steps) * num_states + new_index)
+                        self.stats['pushed'] += 1
+
+            # 查找终点的最优解 (按首次到达的顺序遍历，与字典版的插入顺序一致)
+            best_score = -float('inf')
+            min_steps = float('inf')
+            best_final_index = None
+            for state_index in end_states:
+                score = sum(self.item_values[i] for i in range(n) if state_index & (1 << i))
+                steps = steps_table[state_index] - 1
+                if score > best_score or (score == best_score and steps < min_steps):
+                    best_score = score
+                    min_steps = steps
+                    best_final_index = state_index
+
+            if best_final_index is None:
+                return -1, [], -1
+
+            path = []
+            state_index = best_final_index
+            while True:
+                r, c = cells[state_index >> n]
+                path.append((r, c))
+                code = predecessor_table[state_index]
+                if code == 0:
+                    break
+                dr, dc = DIRECTIONS[(code & 7) - 1]
+                mask = state_index & full_mask
+                if code & 8:
+                    mask ^= 1 << self.item_map[(r, c)]
+                state_index = cell_ids[r - dr][c - dc] * num_masks + mask
+            path.reverse()
+            return best_score, path, min_steps
+        finally:
+            steps_table.release()
+            predecessor_table.release()
+            view.release()
+            buffer.close()
+
+
+class ItemGraphPathfinder(OptimalPathfinderWithRepeats):
+    """
+    物品图压缩引擎 (分数优先，步数次之)
+
+    先从起点、终点和每个物品 (G/T) 出发做BFS，得到一张只包含这些关键点的
+    紧凑距离图；再在物品子集上做带上界剪枝的最优优先搜索，
+    最后把关键点序列展开回逐格路径。结果与 OptimalPathfinderWithRepeats 等价，
+    但状态数只与物品数有关，而与迷宫面积无关。
+
+    距离图建好后可以被增量修改: set_start 更换出发格，remove_item 在物品被
+    清除后修补距离表，供 IncrementalPathPlanner 在多次规划之间复用。
+
+    contract_corridors=True 时，关键点之间的直达距离在通道收缩图 (JunctionGraph) 上
+    用 Dijkstra 求出，而不是在整张网格上做位并行BFS。
+    """
+
+    def __init__(self, grid, contract_corridors=False):
+        super().__init__(grid)
+        self._junction_graph = JunctionGraph(self.grid) if contract_corridors else None
+        # 关键点编号: 0..n-1 为物品, n 为起点, n+1 为终点
+        self.start_node = self.num_items
+        self.end_node = self.num_items + 1
+        self.node_locations = self.item_locations + [self.start_pos, self.end_pos]
+
+        self._bit_grid = BitGrid(self.grid, WALL)
+        self._item_bits = self._bit_grid.mask_of(self.item_locations)
+        self.direct_dist = []
+        self.direct_expanders = []
+        for node in range(len(self.node_locations)):
+            dist, expander = self._bfs_direct(node)
+            self.direct_dist.append(dist)
+            self.direct_expanders.append(expander)
+
+        # 被清除的物品: 其位置变为普通通路，经过它的直达距离记录中转点以便展开路径
+        self.removed_mask = 0
+        self._hop_via = {}
+        self._rebuild_direct_edges()
+        self.plain_dist = self._metric_closure(self.direct_dist)
+        self._build_bridge_tree()
+        self._penalty_cache = {}
+        self._gain_cache = {}
+        self._mst_cache = {}
+        self._lower_bound_cache = {}
+
+    def _bfs_direct(self, source_node):
+        """
+        从关键点出发的位并行BFS。除出发点外，其它物品格只可到达、不可穿过，
+        因此得到的距离是"途中不触碰任何其它物品"的直达距离。
+        返回各关键点的距离，以及把到某个关键点的一跳展开为逐格路径 (不含出发格) 的函数。
+        """
+        source = self.node_locations[source_node]
+        if self._junction_graph is not None:
+            dist, expand = self._junction_graph.distances_from(source, self.node_locations, self.item_map)
+            return dist, lambda to_node: expand(to_node)[1:]
+
+        bit_grid = self._bit_grid
+        expandable = (bit_grid.passable & ~self._item_bits) | bit_grid.bit(source)
+
+        node_bits = {}
+        for node, location in enumerate(self.node_locations):
+            node_bits.setdefault(bit_grid.bit(location), []).append(node)
+        nodes_mask = bit_grid.mask_of(self.node_locations)
+
+        dist = [INF] * len(self.node_locations)
+        layers = []
+        for distance, layer in enumerate(bit_grid.layers([source], expandable)):
+            layers.append(layer)
+            hit = layer & nodes_mask
+            while hit:
+                low = hit & -hit
+                for node in node_bits[low]:
+                    dist[node] = distance
+                hit ^= low
+
+        hop_lengths = dist[:]
+
+        def expand(to_node):
+            return bit_grid.backtrack(layers, self.node_locations[to_node], expandable, hop_lengths[to_node])[1:]
+
+        return dist, expand
+
+    def _rebuild_direct_edges(self):
+        """直达边通常很稀疏 (迷宫中物品之间多被其它物品隔开)，整理为邻接表"""
+        excluded = {self.start_node} | {
+            item_index for item_index in range(self.num_items) if self.removed_mask & (1 << item_index)
+        }
+        self.direct_edges = [
+            [(v, d) for v, d in enumerate(dist) if v != u and v not in excluded and d != INF]
+            for u, dist in enumerate(self.direct_dist)
+        ]
+
+    def set_start(self, position):
+        """把出发关键点移到任意可通行格 (r, c)，只需重做一次BFS"""
+        node = self.start_node
+        self.start_pos = position
+        self.node_locations[node] = position
+        for key in [key for key in self._hop_via if node in key]:
+            del self._hop_via[key]
+
+        dist, expander = self._bfs_direct(node)
+        self.direct_dist[node] = dist
+        self.direct_expanders[node] = expander
+        for v, d in enumerate(dist):
+            self.direct_dist[v][node] = d
+        self._rebuild_direct_edges()
+
+        # 普通距离: 经过第一个直达关键点后沿已有的普通距离继续
+        plain = dist[:]
+        for u, d in enumerate(dist):
+            if d == INF or u == node:
+                continue
+            for v, d_uv in enumerate(self.plain_dist[u]):
+                if d + d_uv < plain[v]:
+                    plain[v] = d + d_uv
+        plain[node] = 0
+        self.plain_dist[node] = plain
+        for v, d in enumerate(plain):
+            self.plain_dist[v][node] = d
+
+        self._update_tree_tables(node)
+        for cache in (self._penalty_cache, self._gain_cache, self._lower_bound_cache):
+            for key in [key for key in cache if key[0] == node]:
+                del cache[key]
+
+    def remove_item(self, item_index):
+        """
+        物品被清除 (格子变成普通通路) 后修补距离表。
+
+        清除物品 x 只会让途经 x 的直达路径变得可行，
+        因此对所有关键点对做一次以 x 为中转的松弛 d(u,v) = min(d(u,v), d(u,x) + d(x,v))，
+        即Floyd-Warshall的一轮增量迭代，无需重跑任何BFS。
+        """
+        bit = 1 << item_index
+        if self.removed_mask & bit:
+            return
+        self.removed_mask |= bit
+        del self.item_map[self.item_locations[item_index]]
+        self._item_bits &= ~self._bit_grid.bit(self.item_locations[item_index])
+        self.item_values[item_index] = 0
+        self.positive_mask &= ~bit
+        self.negative_mask &= ~bit
+
+        dist = self.direct_dist
+        dist_x = dist[item_index]
+        for u in range(len(dist)):
+            d_ux = dist[u][item_index]
+            if d_ux == INF or u == item_index:
+                continue
+            dist_u = dist[u]
+            for v in range(len(dist)):
+                if v != u and v != item_index and d_ux + dist_x[v] < dist_u[v]:
+                    dist_u[v] = d_ux + dist_x[v]
+                    self._hop_via[(u, v)] = item_index
+
+        self._rebuild_direct_edges()
+        # 普通距离、桥树与最小生成树都不受影响，只有与惩罚相关的缓存失效
+        self._penalty_cache.clear()
+        self._gain_cache.clear()
+
+    @staticmethod
+    def _metric_closure(direct_dist):
+        """Floyd-Warshall: 允许途经物品的普通最短距离，用作步数下界。"""
+        size = len(direct_dist)
+        dist = [row[:] for row in direct_dist]
+        for k in range(size):
+            dist_k = dist[k]
+            for i in range(size):
+                dist_ik = dist[i][k]
+                if dist_ik == INF:
+                    continue
+                dist_i = dist[i]
+                for j in range(size):
+                    if dist_ik + dist_k[j] < dist_i[j]:
+                        dist_i[j] = dist_ik + dist_k[j]
+        return dist
+
+    def _penalty_to_reach(self, node, mask):
+        """
+        在物品图上跑Dijkstra：到达每个关键点至少还要踩到多少负收益
+        (未收集的陷阱按其惩罚计价，已收集的物品可以免费通过)。
+        结果只取决于尚未踩过的负收益物品，按此缓存。
+        """
+        cache_key = (node, mask & self.negative_mask)
+        if cache_key in self._penalty_cache:
+            return self._penalty_cache[cache_key]
+
+        step_costs = [
+            -value if value < 0 and not (mask & (1 << item_index)) else 0
+            for item_index, value in enumerate(self.item_values)
+        ] + [0, 0]
+        penalty = [INF] * len(self.node_locations)
+        penalty[node] = 0
+        pq = [(0, node)]
+        while pq:
+            cost, u = heapq.heappop(pq)
+            if cost > penalty[u] or u == self.end_node:
+                continue
+            for v, _ in self.direct_edges[u]:
+                new_cost = cost + step_costs[v]
+                if new_cost < penalty[v]:
+                    penalty[v] = new_cost
+                    heapq.heappush(pq, (new_cost, v))
+
+        self._penalty_cache[cache_key] = penalty
+        return penalty
+
+    def _gain_table(self, node, mask):
+        """到达终点所需惩罚，以及按所需惩罚排序的正收益物品表，按负收益掩码缓存。"""
+        cache_key = (node, mask & self.negative_mask)
+        if cache_key not in self._gain_cache:
+            penalty = self._penalty_to_reach(node, mask)
+            gains = sorted(
+                (penalty[item_index], value, 1 << item_index)
+                for item_index, value in enumerate(self.item_values)
+                if value > 0 and penalty[item_index] != INF
+            )
+            self._gain_cache[cache_key] = (penalty[self.end_node], gains)
+        return self._gain_cache[cache_key]
+
+    def _bound(self, node, mask, score):
+        """
+        计算状态的乐观上界 (最高可能得分, 必须收集的正收益物品掩码)。
+
+        任何收集了正收益集合 P 的后续走法，至少要付出 max(到达P中每个物品、
+        到达终点所需的惩罚)，因此可枚举惩罚阈值取最大收益。
+        若最终得分恰好等于上界，则阈值内的正收益物品必然全部被收集。
+        """
+        exit_penalty, gains = self._gain_table(node, mask)
+        if exit_penalty == INF:
+            return None, 0
+
+        remaining = [(p, value, bit) for p, value, bit in gains if not (mask & bit)]
+        best_gain = -exit_penalty
+        required_mask = 0
+        total = 0
+        collected_mask = 0
+        for index, (p, value, bit) in enumerate(remaining):
+            total += value
+            collected_mask |= bit
+            # 同一惩罚阈值的物品要一起计入
+            if index + 1 < len(remaining) and remaining[index + 1][0] == p:
+                continue
+            gain = total - max(p, exit_penalty)
+            if gain > best_gain:
+                best_gain = gain
+                required_mask = collected_mask
+        return score + best_gain, required_mask
+
+    def _build_bridge_tree(self):
+        """
+        用Tarjan算法找出网格中的所有桥，把双连通分量缩点成一棵"桥树"。
+        从当前位置出发、经过一组关键点后到达终点的任意走法，
+        对于分隔两侧关键点的每一条桥都至少要走两次 (终点同侧) 或一次 (终点异侧)，
+        据此得到的步数下界在完美迷宫 (树) 上是精确的。
+        """
+        rows, cols = self.rows, self.cols
+        passable = [self.grid[r][c] != WALL for r in range(rows) for c in range(cols)]
+
+        def neighbours(cell):
+            r, c = divmod(cell, cols)
+            if c + 1 < cols and passable[cell + 1]:
+                yield cell + 1
+            if c > 0 and passable[cell - 1]:
+                yield cell - 1
+            if r + 1 < rows and passable[cell + cols]:
+                yield cell + cols
+            if r > 0 and passable[cell - cols]:
+                yield cell - cols
+
+        # 迭代版Tarjan求桥
+        discovery = [-1] * (rows * cols)
+        low = [0] * (rows * cols)
+        bridges = set()
+        timer = 0
+        for root in range(rows * cols):
+            if not passable[root] or discovery[root] != -1:
+                continue
+            discovery[root] = low[root] = timer
+            timer += 1
+            stack = [(root, -1, neighbours(root))]
+            while stack:
+                cell, parent, it = stack[-1]
+                advanced = False
+                for nxt in it:
+                    if nxt == parent:
+                        continue
+                    if discovery[nxt] == -1:
+                        discovery[nxt] = low[nxt] = timer
+                        timer += 1
+                        stack.append((nxt, cell, neighbours(nxt)))
+                        advanced = True
+                        break
+                    low[cell] = min(low[cell], discovery[nxt])
+                if advanced:
+                    continue
+                stack.pop()
+                if parent != -1:
+                    low[parent] = min(low[parent], low[cell])
+                    if low[cell] > discovery[parent]:
+                        bridges.add((parent, cell))
+                        bridges.add((cell, parent))
+
+        # 不跨越桥的连通块即为双连通分量
+        component = [-1] * (rows * cols)
+        tree_edges = []
+        num_components = 0
+        for seed in range(rows * cols):
+            if not passable[seed] or component[seed] != -1:
+                continue
+            component[seed] = num_components
+            queue = [seed]
+            for cell in queue:
+                for nxt in neighbours(cell):
+                    if (cell, nxt) in bridges:
+                        continue
+                    if component[nxt] == -1:
+                        component[nxt] = num_components
+                        queue.append(nxt)
+            tree_edges.append([])
+            num_components += 1
+        for cell, nxt in bridges:
+            tree_edges[component[cell]].append(component[nxt])
+
+        self._tree_component = component
+        self._tree_edges = tree_edges
+
+        # 以终点所在分量为根: 深度、DFS序与关键点两两之间的最近公共祖先深度
+        end_r, end_c = self.end_pos
+        root = component[end_r * cols + end_c]
+        self._tree_depth_map = self._tree_distances(root)
+        self._tree_order_map = {}
+        stack = [root]
+        visited = {root}
+        while stack:
+            comp = stack.pop()
+            self._tree_order_map[comp] = len(self._tree_order_map)
+            for nxt in tree_edges[comp]:
+                if nxt not in visited:
+                    visited.add(nxt)
+                    stack.append(nxt)
+
+        size = len(self.node_locations)
+        self.tree_depth = [0] * size
+        self.tree_order = [0] * size
+        self.tree_lca_depth = [[0] * size for _ in range(size)]
+        for node in range(size):
+            self._update_tree_tables(node)
+
+    def _tree_distances(self, source):
+        """桥树上从某个分量出发的BFS距离 (经过的桥数)"""
+        dist = {source: 0}
+        queue = [source]
+        for comp in queue:
+            for nxt in self._tree_edges[comp]:
+                if nxt not in dist:
+                    dist[nxt] = dist[comp] + 1
+                    queue.append(nxt)
+        return dist
+
+    def _update_tree_tables(self, node):
+        """计算关键点在桥树上的深度、DFS序，以及与其它关键点的最近公共祖先深度"""
+        r, c = self.node_locations[node]
+        comp = self._tree_component[r * self.cols + c]
+        self.tree_depth[node] = self._tree_depth_map.get(comp, 0)
+        self.tree_order[node] = self._tree_order_map.get(comp, 0)
+
+        dist = self._tree_distances(comp)
+        for v, (vr, vc) in enumerate(self.node_locations):
+            other = self._tree_component[vr * self.cols + vc]
+            if other in dist:
+                lca_depth = (self.tree_depth[node] + self.tree_depth[v] - dist[other]) // 2
+                self.tree_lca_depth[node][v] = lca_depth
+                self.tree_lca_depth[v][node] = lca_depth
+
+    def _bridge_lower_bound(self, node, required_mask):
+        """桥树下界: 2 × (关键点到根路径之并的桥数) - 当前位置到终点的桥数。"""
+        nodes = [node] + [i for i in range(self.num_items) if required_mask & (1 << i)]
+        nodes.sort(key=self.tree_order.__getitem__)
+        union = self.tree_depth[nodes[0]]
+        for prev, curr in zip(nodes, nodes[1:]):
+            union += self.tree_depth[curr] - self.tree_lca_depth[prev][curr]
+        return 2 * union - self.tree_depth[node]
+
+    def _mst_weight(self, required_mask):
+        """必收物品与终点组成的最小生成树权重 (普通距离)，按掩码缓存。"""
+        if required_mask in self._mst_cache:
+            return self._mst_cache[required_mask]
+
+        nodes = [self.end_node] + [i for i in range(self.num_items) if required_mask & (1 << i)]
+        in_tree = {nodes[0]}
+        best_edge = {v: self.plain_dist[nodes[0]][v] for v in nodes[1:]}
+        weight = 0
+        while best_edge:
+            v = min(best_edge, key=best_edge.get)
+            weight += best_edge.pop(v)
+            in_tree.add(v)
+            for u in best_edge:
+                if self.plain_dist[v][u] < best_edge[u]:
+                    best_edge[u] = self.plain_dist[v][u]
+
+        self._mst_cache[required_mask] = weight
+        return weight
+
+    def _steps_lower_bound(self, node, required_mask):
+        """从当前关键点出发，遍历全部必收物品后到达终点的步数下界。"""
+        cache_key = (node, required_mask)
+        if cache_key not in self._lower_bound_cache:
+            plain_dist = self.plain_dist[node]
+            nearest = plain_dist[self.end_node]
+            for item_index in range(self.num_items):
+                if required_mask & (1 << item_index) and plain_dist[item_index] < nearest:
+                    nearest = plain_dist[item_index]
+            self._lower_bound_cache[cache_key] = max(nearest + self._mst_weight(required_mask),
+                                                     self._bridge_lower_bound(node, required_mask))
+        return self._lower_bound_cache[cache_key]
+
+    def _expand_hop(self, from_node, to_node):
+        """把关键点之间的一跳展开为逐格坐标 (不含出发格)。"""
+        via = self._hop_via.get((from_node, to_node))
+        if via is not None:
+            return self._expand_hop(from_node, via) + self._expand_hop(via, to_node)
+
+        return self.direct_expanders[from_node](to_node)
+
+    def _reconstruct_item_path(self, predecessor, final_state):
+        nodes = []
+        state = final_state
+        while state is not None:
+            nodes.append(state[0])
+            state = predecessor[state]
+        nodes.reverse()
+
+        path = [self.start_pos]
+        for from_node, to_node in zip(nodes, nodes[1:]):
+            path.extend(self._expand_hop(from_node, to_node))
+        return path
+
+    def calculate_optimal_path(self, initial_mask=0):
+        """
+        主函数：在物品图上做字典序 A* (上界得分优先，步数下界次之)。
+        第一个出队的终点状态即为最优解。
+
+        initial_mask 为出发前已经收集过的物品，它们不再计分；
+        得分只统计本次路径上新收集的物品。
+        """
+        for score, path, steps, _, _ in self._search(initial_mask, anytime=False):
+            return score, path, steps
+        return -1, [], -1
+
+    def iter_improving_paths(self, initial_mask=0, time_budget=None):
+        """
+        随时可中断 (anytime) 的求解: 生成逐步变好的 (score, path, steps, upper_bound, is_optimal)。
+
+        搜索过程中，每当某个出队状态可以不经其它物品直达终点、且由此得到的完整路径
+        优于当前最好解，就立即产出该路径；upper_bound 是出队上界，即已证明的可达最高分。
+        最后一项 is_optimal 为 True 时即为精确最优解。
+        time_budget (秒) 用尽时生成器提前结束，此时最后产出的是当前最好解。
+        """
+        return self._search(initial_mask, anytime=True, time_budget=time_budget)
+
+    def _search(self, initial_mask, anytime, time_budget=None):
+        initial_score = 0
+        item_index = self.item_map.get(self.start_pos)
+        if item_index is not None and not (initial_mask & (1 << item_index)):
+            initial_mask |= 1 << item_index
+            initial_score = self.item_values[item_index]
+
+        start_state = (self.start_node, initial_mask)
+        upper_bound, required_mask = self._bound(self.start_node, initial_mask, initial_score)
+        if upper_bound is None:
+            return
+
+        # 优先队列: (-上界得分, 步数下界, -已走步数, 得分, 关键点, 掩码)
+        pq = [(-upper_bound, self._steps_lower_bound(self.start_node, required_mask), 0, initial_score,
+               self.start_node, initial_mask)]
+        best_steps = {start_state: 0}
+        predecessor = {start_state: None}
+
+        # anytime 模式下的当前最好解 (得分, 步数)
+        best_score, best_total = -INF, INF
+        proven_bound = upper_bound
+        deadline = time.monotonic() + time_budget if time_budget is not None else None
+        pops = 0
+
+        while pq:
+            neg_bound, _, neg_steps, score, node, mask = heapq.heappop(pq)
+            steps = -neg_steps
+            if steps > best_steps[(node, mask)]:
+                continue
+
+            if node == self.end_node:
+                path = self._reconstruct_item_path(predecessor, (node, mask))
+                yield score, path, steps, score, True
+                return
+
+            if anytime:
+                # 出队时队首的上界覆盖所有尚未展开的状态，因此是全局可证上界
+                proven_bound = min(proven_bound, -neg_bound)
+                # 直达终点即可得到一条完整路径，途中不经过其它物品，因此得分不变
+                to_end = self.direct_dist[node][self.end_node]
+                if to_end != INF and (score > best_score or (score == best_score and steps + to_end < best_total)):
+                    best_score, best_total = score, steps + to_end
+                    path = self._reconstruct_item_path(predecessor, (node, mask))
+                    path.extend(self._expand_hop(node, self.end_node))
+                    yield score, path, best_total, max(proven_bound, score), False
+
+                pops += 1
+                if deadline is not None and pops % 256 == 0 and time.monotonic() > deadline:
+                    return
+
+            # 沿直达边走向终点或下一个物品 (允许重复经过已收集的物品)
+            for next_node, distance in self.direct_edges[node]:
+                new_steps = steps + distance
+                if next_node == self.end_node:
+                    new_mask = mask
+                    new_score = score
+                else:
+                    new_mask = mask | (1 << next_node)
+                    new_score = score if new_mask == mask else score + self.item_values[next_node]
+
+                new_state = (next_node, new_mask)
+                if new_steps >= best_steps.get(new_state, INF):
+                    continue
+
+                if next_node == self.end_node:
+                    upper_bound, lower_bound = new_score, new_steps
+                else:
+                    upper_bound, required_mask = self._bound(next_node, new_mask, new_score)
+                    if upper_bound is None:
+                        continue
+                    lower_bound = new_steps + self._steps_lower_bound(next_node, required_mask)
+
+                best_steps[new_state] = new_steps
+                predecessor[new_state] = (node, mask)
+                heapq.heappush(pq, (-upper_bound, lower_bound, -new_steps, new_score, next_node, new_mask))
+
+
+class HeuristicItemPathfinder(OptimalPathfinderWithRepeats):
+    """
+    启发式定向越野引擎 (分数优先，步数次之，近似解)
+
+    只把起点、终点和金币作为关键点，从每个关键点出发按 (途经陷阱数, 步数) 字典序
+    求到其它关键点的最短路: 能绕开陷阱时这一跳不扣分，途中经过的金币只会加分；
+    绕不开时记下这一跳途经的陷阱集合。路线得分中同一个陷阱只扣一次分。
+
+    路线构造: 最近邻串联无需穿越陷阱的金币 -> 对其余金币做最廉价插入 (只插入使路线变好的)
+    -> 单枚金币不值得穿越陷阱时，试探插入后连同陷阱后方的其它金币一起评估
+    -> 2-opt 与 Or-opt 局部搜索缩短步数。最后把路线展开为逐格路径并精确计分。
+    多项式时间，适用于物品数量很多、精确搜索不可行的迷宫。
+    """
+
+    def __init__(self, grid, time_limit=0.05):
+        super().__init__(grid)
+        self.time_limit = time_limit
+        rows, cols = self.rows, self.cols
+
+        # 扁平化的可通行格邻接表
+        self._neighbours = [[] for _ in range(rows * cols)]
+        for r in range(rows):
+            for c in range(cols):
+                if grid[r][c] == WALL:
+                    continue
+                cell = r * cols + c
+                for dr, dc in DIRECTIONS:
+                    nr, nc = r + dr, c + dc
+                    if 0 <= nr < rows and 0 <= nc < cols and grid[nr][nc] != WALL:
+                        self._neighbours[cell].append(nr * cols + nc)
+        self._trap_cells = {r * cols + c for (r, c), value in zip(self.item_locations, self.item_values)
+                            if value < 0}
+
+        # 关键点: 0..k-1 为金币, k 为起点, k+1 为终点
+        gold_locations = [location for location, value in zip(self.item_locations, self.item_values) if value > 0]
+        self.node_locations = gold_locations + [self.start_pos, self.end_pos]
+        self.start_node = len(gold_locations)
+        self.end_node = self.start_node + 1
+        self._node_cells = [r * cols + c for r, c in self.node_locations]
+
+        # cost[u][v] 为步数，hop_traps[u][v] 为途经的陷阱集合；
+        # 两个方向都用编号较小的关键点的搜索结果，保证代价对称，便于 2-opt 翻转路段
+        num_nodes = len(self.node_locations)
+        self._parents = [None] * num_nodes
+        self.cost = [[INF] * num_nodes for _ in range(num_nodes)]
+        self.hop_traps = [[frozenset()] * num_nodes for _ in range(num_nodes)]
+        for node in range(num_nodes):
+            dist, parents = self._fewest_traps_search(node)
+            self._parents[node] = parents
+            for other in range(node + 1, num_nodes):
+                cell = self._node_cells[other]
+                if dist[cell] < 0:
+                    continue
+                traps = []
+                while cell != self._node_cells[node]:
+                    if cell in self._trap_cells:
+                        traps.append(cell)
+                    cell = parents[cell]
+                traps = frozenset(traps)
+                self.cost[node][other] = self.cost[other][node] = dist[self._node_cells[other]]
+                self.hop_traps[node][other] = self.hop_traps[other][node] = traps
+
+    def _fewest_traps_search(self, node):
+        """
+        按 (途经陷阱数, 步数) 字典序的逐层BFS，返回 (步数数组, 父节点数组)，不可达为 -1。
+
+        第 k 层只扩展普通格；碰到的陷阱格作为第 k+1 层的起点 (各自带着不同的初始步数)，
+        到达对应步数时再并入BFS前沿，因此总代价与普通BFS同阶。
+        """
+        neighbours = self._neighbours
+        traps = self._trap_cells
+        dist = [-1] * len(neighbours)
+        parents = [-1] * len(neighbours)
+        seeds = [(0, self._node_cells[node], -1)]
+        while seeds:
+            seeds.sort()
+            next_seeds = {}
+            index = 0
+            steps = seeds[0][0]
+            frontier = []
+            while True:
+                while index < len(seeds) and seeds[index][0] == steps:
+                    _, cell, parent = seeds[index]
+                    index += 1
+                    if dist[cell] < 0:
+                        dist[cell] = steps
+                        parents[cell] = parent
+                        frontier.append(cell)
+                if not frontier:
+                    if index == len(seeds):
+                        break
+                    steps = seeds[index][0]
+                    continue
+                next_frontier = []
+                for cell in frontier:
+                    for nxt in neighbours[cell]:
+                        if dist[nxt] >= 0:
+                            continue
+                        if nxt in traps:
+                            if nxt not in next_seeds:
+                                next_seeds[nxt] = (steps + 1, nxt, cell)
+                        else:
+                            dist[nxt] = steps + 1
+                            parents[nxt] = cell
+                            next_frontier.append(nxt)
+                frontier = next_frontier
+                steps += 1
+            seeds = [seed for cell, seed in next_seeds.items() if dist[cell] < 0]
+        return dist, parents
+
+    def _route_key(self, route):
+        """路线的比较键 (负得分, 步数)，越小越好；陷阱按集合去重计分"""
+        cost, hop_traps = self.cost, self.hop_traps
+        traps = set()
+        steps = 0
+        for u, v in zip(route, route[1:]):
+            steps += cost[u][v]
+            traps |= hop_traps[u][v]
+        golds = len(route) - 2
+        return -(golds * CELL_VALUES['G'] + len(traps) * CELL_VALUES['T']), steps
+
+    def _trap_counts(self, route):
+        """路线上每个陷阱被多少跳经过"""
+        counts = {}
+        for u, v in zip(route, route[1:]):
+            for trap in self.hop_traps[u][v]:
+                counts[trap] = counts.get(trap, 0) + 1
+        return counts
+
+    def _trap_delta(self, counts, removed_hops, added_hops):
+        """把 removed_hops 换成 added_hops 后，路线上去重陷阱数的变化量"""
+        hop_traps = self.hop_traps
+        change = {}
+        for u, v in removed_hops:
+            for trap in hop_traps[u][v]:
+                change[trap] = change.get(trap, 0) - 1
+        for u, v in added_hops:
+            for trap in hop_traps[u][v]:
+                change[trap] = change.get(trap, 0) + 1
+        delta = 0
+        for trap, diff in change.items():
+            before = counts.get(trap, 0)
+            if before == 0 and diff > 0:
+                delta += 1
+            elif before > 0 and before + diff == 0:
+                delta -= 1
+        return delta
+
+    def _best_insertion(self, route, key, counts, node):
+        """
+        node 在路线中的最佳插入位置，返回 (插入后的键, 位置)。
+        key/counts 为当前路线的键和陷阱计数。
+        """
+        cost = self.cost
+        neg_score, steps = key
+        best = None
+        for position in range(1, len(route)):
+            u, v = route[position - 1], route[position]
+            if cost[u][node] == INF or cost[node][v] == INF:
+                continue
+            trap_delta = self._trap_delta(counts, ((u, v),), ((u, node), (node, v)))
+            candidate = (neg_score - CELL_VALUES['G'] - trap_delta * CELL_VALUES['T'],
+                         steps + cost[u][node] + cost[node][v] - cost[u][v])
+            if best is None or candidate < best[0]:
+                best = (candidate, position)
+        return best
+
+    def _insert_greedily(self, route, candidates):
+        """反复插入能使路线变好的金币，直到没有改进；返回 (路线, 键)"""
+        route = list(route)
+        candidates = set(candidates)
+        current = self._route_key(route)
+        counts = self._trap_counts(route)
+        while candidates:
+            best = None
+            for node in candidates:
+                insertion = self._best_insertion(route, current, counts, node)
+                if insertion is not None and (best is None or insertion[0] < best[0]):
+                    best = insertion + (node,)
+            if best is None or best[0] >= current:
+                break
+            current, position, node = best
+            route.insert(position, node)
+            candidates.discard(node)
+            counts = self._trap_counts(route)
+        return route, current
+
+    def _construct_route(self, deadline):
+        cost = self.cost
+        start, end = self.start_node, self.end_node
+        # 最近邻: 只沿不经过陷阱的跳串联金币
+        remaining = {node for node in range(self.start_node)
+                     if cost[start][node] != INF and not self.hop_traps[start][node]}
+        route = [start]
+        while remaining:
+            last = route[-1]
+            nearest = min(remaining, key=lambda node: cost[last][node])
+            route.append(nearest)
+            remaining.discard(nearest)
+        route.append(end)
+
+        # 最廉价插入: 其余金币只要能使路线的 (得分, 步数) 变好就插入
+        candidates = {node for node in range(self.start_node) if node not in route and cost[start][node] != INF}
+        route, current = self._insert_greedily(route, candidates)
+
+        # 单枚金币不值得穿越陷阱时，试探性地插入一枚，再看同一陷阱后的其它金币能否一起带回正收益
+        candidates.difference_update(route)
+        while candidates and time.monotonic() < deadline:
+            counts = self._trap_counts(route)
+            trials = sorted((self._best_insertion(route, current, counts, node), node) for node in candidates)
+            for (_, position), node in trials:
+                trial = route[:position] + [node] + route[position:]
+                trial, key = self._insert_greedily(trial, candidates - {node})
+                if key < current:
+                    route, current = trial, key
+                    candidates.difference_update(route)
+                    break
+            else:
+                break
+        return route
+
+    def _improve_route(self, route, deadline):
+        """2-opt 与 Or-opt，直到没有改进或时间用尽；改进按 (陷阱扣分变化, 步数变化) 字典序判断"""
+        cost = self.cost
+        trap_penalty = -CELL_VALUES['T']
+        improved = True
+        while improved and time.monotonic() < deadline:
+            improved = False
+            counts = self._trap_counts(route)
+            n = len(route)
+            # 2-opt: 翻转 route[i..j]
+            for i in range(1, n - 2):
+                for j in range(i + 1, n - 1):
+                    a, b, c, d = route[i - 1], route[i], route[j], route[j + 1]
+                    trap_delta = self._trap_delta(counts, ((a, b), (c, d)), ((a, c), (b, d)))
+                    if (trap_delta * trap_penalty, cost[a][c] + cost[b][d] - cost[a][b] - cost[c][d]) < (0, 0):
+                        route[i:j + 1] = route[i:j + 1][::-1]
+                        counts = self._trap_counts(route)
+                        improved = True
+            # Or-opt: 把长度 1~3 的路段 (可翻转) 移到别处
+            for length in (1, 2, 3):
+                i = 1
+                while i + length < len(route):
+                    segment = route[i:i + length]
+                    prev, nxt = route[i - 1], route[i + length]
+                    rest = route[:i] + route[i + length:]
+                    removed = ((prev, segment[0]), (segment[-1], nxt))
+                    removal = cost[prev][segment[0]] + cost[segment[-1]][nxt] - cost[prev][nxt]
+                    best = None
+                    for position in range(1, len(rest)):
+                        if position == i:
+                            continue
+                        u, v = rest[position - 1], rest[position]
+                        for candidate in (segment, segment[::-1]):
+                            trap_delta = self._trap_delta(
+                                counts, removed + ((u, v),),
+                                ((prev, nxt), (u, candidate[0]), (candidate[-1], v))
+                            )
+                            delta = (trap_delta * trap_penalty,
+                                     cost[u][candidate[0]] + cost[candidate[-1]][v] - cost[u][v] - removal)
+                            if delta < (0, 0) and (best is None or delta < best[0]):
+                                best = (delta, position, candidate)
+                    if best is not None:
+                        _, position, candidate = best
+                        route[:] = rest[:position] + candidate + rest[position:]
+                        counts = self._trap_counts(route)
+                        improved = True
+                    i += 1
+        return route
+
+    def _expand_hop(self, u, v):
+        """把关键点之间的一跳展开为逐格坐标 (不含出发格)"""
+        source, target = min(u, v), max(u, v)
+        parents = self._parents[source]
+        cells = []
+        walk = self._node_cells[target]
+        while walk != self._node_cells[source]:
+            cells.append(walk)
+            walk = parents[walk]
+        cells.append(walk)
+        # cells 为 target -> source 的顺序
+        if source == u:
+            cells.reverse()
+        cols = self.cols
+        return [divmod(cell, cols) for cell in cells[1:]]
+
+    def calculate_optimal_path(self):
+        """构造并改进路线，返回 (score, path, steps)；得分按展开后的逐格路径精确计算"""
+        if self.cost[self.start_node][self.end_node] == INF:
+            return -1, [], -1
+        deadline = time.monotonic() + self.time_limit
+        route = self._improve_route(self._construct_route(deadline), deadline)
+
+        path = [self.start_pos]
+        for u, v in zip(route, route[1:]):
+            path.extend(self._expand_hop(u, v))
+
+        score = 0
+        seen = set()
+        for cell in path:
+            item_index = self.item_map.get(cell)
+            if item_index is not None and item_index not in seen:
+                seen.add(item_index)
+                score += self.item_values[item_index]
+        return score, path, len(path) - 1
+
+
+# 物品数超过该值时，find_maze_path 默认切换到物品图引擎
+ITEM_GRAPH_THRESHOLD = 12
+# 'auto' 选用物品图引擎时的时间预算 (秒)。精确搜索的耗时随物品分布波动很大:
+# 101x101 的递归分割迷宫上，25 个物品的个别种子需要约 40 秒，30 个物品需要约 30 秒。
+# 预算用尽时取 anytime 当前最好解与启发式引擎结果中较好的一个，不保证最优
+AUTO_TIME_BUDGET = 2.0
+
+PATHFINDING_ENGINES = {
+    'cell': OptimalPathfinderWithRepeats,
+    'item_graph': ItemGraphPathfinder,
+    'heuristic': HeuristicItemPathfinder,
+}
+
+
+def _better(a, b):
+    """两个 (score, path, steps) 中分数更高、同分时步数更少的一个"""
+    if b[2] < 0:
+        return a
+    if a is None or a[2] < 0 or (b[0], -b[2]) > (a[0], -a[2]):
+        return b
+    return a
+
+
+def _solve_within_budget(grid, time_budget, stats):
+    """物品图引擎的 anytime 搜索；预算内未证明最优时与启发式引擎的结果比较后取较好者"""
+    best = None
+    pathfinder = ItemGraphPathfinder(grid)
+    for score, path, steps, _, is_optimal in pathfinder.iter_improving_paths(time_budget=time_budget):
+        best = (score, path, steps)
+        if is_optimal:
+            stats.update(engine='item_graph', is_optimal=True)
+            return best
+    heuristic = HeuristicItemPathfinder(grid).calculate_optimal_path()
+    result = _better(best, heuristic)
+    stats.update(engine='heuristic' if result is heuristic else 'item_graph', is_optimal=False)
+    if result is None or result[2] < 0:
+        return -1, [], -1
+    print(f"警告: 物品图精确搜索超出 {time_budget} 秒预算，返回当前最好路径 (不保证最优)")
+    return result
+
+
 # --- 主程序接口 ---
 
-def find_maze_path(grid):
+def find_maze_path(grid, engine='auto', storage='dict', backing_file=None, queue='heap',
+                   time_budget=AUTO_TIME_BUDGET, stats=None):
     """
     接收一个迷宫网格，计算并返回最优路径信息。
 
     Args:
         grid (list[list[str]]): 表示迷宫的二维列表。
+        engine (str): 求解引擎。'cell' 为逐格状态搜索，'item_graph' 为物品图压缩搜索，
+               'heuristic' 为启发式近似求解 (插入 + 2-opt/Or-opt，不保证最优)，
+               'auto' 在物品数超过 ITEM_GRAPH_THRESHOLD 时自动选用物品图引擎，
+               并限制在 time_budget 秒内: 超时后返回 anytime 当前最好解与启发式解中较好的一个。
+        storage (str): 逐格引擎的状态存储方式，'dict' 或 'array'。
+        backing_file (str | None): storage='array' 时可选的内存映射文件路径。
+        queue (str): 逐格引擎使用的优先队列，'heap' 或 'bucket'。
+        time_budget (float | None): 'auto' 选用物品图引擎时的时间预算 (秒)，None 表示不限时。
+        stats (dict | None): 传入时记录实际使用的引擎 ('engine') 和结果是否已证明最优 ('is_optimal')。
 
     Returns:
         tuple: 一个包含三个元素的元组 (score, path, steps)。
@@ -161,15 +1288,52 @@ def find_maze_path(grid):
                - steps (int): 走完最优路径所需的步数。
                如果找不到路径，则返回 (-1, [], -1)。
     """
+    stats = {} if stats is None else stats
     try:
-        pathfinder = OptimalPathfinderWithRepeats(grid)
+        if engine == 'auto':
+            num_items = sum(1 for row in grid for char in row if char in ('G', 'T'))
+            if num_items > ITEM_GRAPH_THRESHOLD:
+                if time_budget is not None:
+                    return _solve_within_budget(grid, time_budget, stats)
+                engine = 'item_graph'
+            else:
+                engine = 'cell'
+        if engine not in PATHFINDING_ENGINES:
+            raise ValueError(f"未知的寻路引擎: {engine}")
+        if engine == 'cell':
+            pathfinder = OptimalPathfinderWithRepeats(grid, storage=storage, backing_file=backing_file,
+                                                      queue=queue)
+        else:
+            pathfinder = PATHFINDING_ENGINES[engine](grid)
         max_score, optimal_path, min_steps = pathfinder.calculate_optimal_path()
+        stats.update(engine=engine, is_optimal=engine != 'heuristic')
         return max_score, optimal_path, min_steps
     except ValueError as e:
         print(f"处理迷宫时发生错误: {e}")
         return -1, [], -1
 
 
+def find_maze_path_anytime(grid, time_budget=None):
+    """
+    find_maze_path 的 anytime 版本 (物品图引擎)，以生成器形式逐步产出更好的解。
+
+    Args:
+        grid (list[list[str]]): 表示迷宫的二维列表。
+        time_budget (float | None): 求解的时间预算 (秒)，None 表示一直搜索到最优。
+
+    Yields:
+        tuple: (score, path, steps, upper_bound, is_optimal)。
+               upper_bound 为已证明的最高可达分数；is_optimal 为 True 的一项是精确最优解，
+               且一定是最后一项。预算用尽时最后一项即当前最好解。
+    """
+    try:
+        pathfinder = ItemGraphPathfinder(grid)
+    except ValueError as e:
+        print(f"处理迷宫时发生错误: {e}")
+        return
+    yield from pathfinder.iter_improving_paths(time_budget=time_budget)
+
+
 if __name__ == "__main__":
     # --- 输入接口 ---
     # 示例: 从 JSON 文件中读取迷宫数据。
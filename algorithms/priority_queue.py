@@ -0,0 +1,183 @@
+"""
+整数键优先队列 - 为步数、分数、回合数这类小整数优先级提供O(1)的入队/出队
+
+所有队列都提供相同的接口:
+    push(key, item)      入队
+    pop() -> (key, item) 弹出键最小的元素
+    len(queue)           当前元素个数
+HeapQueue 在键相同时比较 item，与直接使用 heapq 的行为一致；
+桶队列在键相同时先进先出。
+"""
+
+import heapq
+from collections import deque
+
+
+class HeapQueue:
+    """基于 heapq 的参考实现，键可以是任意可比较对象 (包括元组)"""
+
+    def __init__(self):
+        self._heap = []
+
+    def push(self, key, item):
+        heapq.heappush(self._heap, (key, item))
+
+    def pop(self):
+        return heapq.heappop(self._heap)
+
+    def __len__(self):
+        return len(self._heap)
+
+
+class BucketQueue:
+    """
+    有界整数键的桶队列 (Dial算法)
+
+    每个键值对应一个桶，游标指向最小的非空桶。键单调不减时入队、出队都是O(1)；
+    若入队的键比游标小，游标直接回退，因此也能用于分数可升可降的搜索。
+    min_key 允许负数键 (例如 -score)，桶数组按需增长。
+    """
+
+    def __init__(self, min_key=0):
+        self._min_key = min_key
+        self._buckets = []
+        self._cursor = 0
+        self._size = 0
+
+    def push(self, key, item):
+        index = key - self._min_key
+        if index < 0:
+            raise ValueError(f"键 {key} 小于队列的最小键 {self._min_key}")
+        buckets = self._buckets
+        while len(buckets) <= index:
+            buckets.append(deque())
+        buckets[index].append(item)
+        if index < self._cursor or self._size == 0:
+            self._cursor = index
+        self._size += 1
+
+    def pop(self):
+        if self._size == 0:
+            raise IndexError("pop from empty BucketQueue")
+        buckets = self._buckets
+        cursor = self._cursor
+        while not buckets[cursor]:
+            cursor += 1
+        self._cursor = cursor
+        self._size -= 1
+        return cursor + self._min_key, buckets[cursor].popleft()
+
+    def __len__(self):
+        return self._size
+
+
+class LexicographicBucketQueue:
+    """
+    二元整数键 (primary, secondary) 的桶队列，按字典序弹出。
+
+    外层按 primary 分桶，每个外层桶是一个以 secondary 为键的 BucketQueue，
+    适用于"分数优先，步数次之"、"f值优先，回合数次之"这类复合优先级。
+    """
+
+    def __init__(self, min_primary=0, min_secondary=0):
+        self._min_primary = min_primary
+        self._min_secondary = min_secondary
+        self._levels = []
+        self._cursor = 0
+        self._size = 0
+
+    def push(self, key, item):
+        primary, secondary = key
+        index = primary - self._min_primary
+        if index < 0:
+            raise ValueError(f"键 {key} 小于队列的最小键 {self._min_primary}")
+        levels = self._levels
+        while len(levels) <= index:
+            levels.append(None)
+        if levels[index] is None:
+            levels[index] = BucketQueue(self._min_secondary)
+        levels[index].push(secondary, item)
+        if index < self._cursor or self._size == 0:
+            self._cursor = index
+        self._size += 1
+
+    def pop(self):
+        if self._size == 0:
+            raise IndexError("pop from empty LexicographicBucketQueue")
+        levels = self._levels
+        cursor = self._cursor
+        while levels[cursor] is None or not len(levels[cursor]):
+            cursor += 1
+        self._cursor = cursor
+        self._size -= 1
+        secondary, item = levels[cursor].pop()
+        return (cursor + self._min_primary, secondary), item
+
+    def __len__(self):
+        return self._size
+
+
+class RadixHeap:
+    """
+    单调整数键的基数堆
+
+    要求入队的键不小于最近一次弹出的键 (一致启发式下的A*、Dijkstra都满足)。
+    按与上次弹出键的最高不同位分桶，每个元素最多被重新分配 O(log C) 次。
+    键相同的元素之间不保证弹出顺序。
+    """
+
+    def __init__(self):
+        self._buckets = [[] for _ in range(65)]
+        self._last = 0
+        self._size = 0
+
+    def push(self, key, item):
+        if key < self._last:
+            raise ValueError(f"RadixHeap 要求键单调不减: {key} < {self._last}")
+        self._buckets[(key ^ self._last).bit_length()].append((key, item))
+        self._size += 1
+
+    def pop(self):
+        if self._size == 0:
+            raise IndexError("pop from empty RadixHeap")
+        buckets = self._buckets
+        if not buckets[0]:
+            index = 1
+            while not buckets[index]:
+                index += 1
+            entries = buckets[index]
+            buckets[index] = []
+            last = min(entry[0] for entry in entries)
+            self._last = last
+            for entry in entries:
+                buckets[(entry[0] ^ last).bit_length()].append(entry)
+        self._size -= 1
+        return buckets[0].pop()
+
+    def __len__(self):
+        return self._size
+
+
+PRIORITY_QUEUES = ('heap', 'bucket', 'radix')
+
+
+def create_priority_queue(kind='heap', min_key=0):
+    """
+    按名称创建优先队列。
+
+    Args:
+        kind (str): 'heap'、'bucket' 或 'radix'。
+        min_key (int | tuple): 桶队列允许的最小键；传入二元组时创建
+               LexicographicBucketQueue，用于 (primary, secondary) 复合键。
+    """
+    if kind == 'heap':
+        return HeapQueue()
+    if kind == 'bucket':
+        if isinstance(min_key, tuple):
+            return LexicographicBucketQueue(*min_key)
+        return BucketQueue(min_key)
+    if kind == 'radix':
+        if isinstance(min_key, tuple):
+            raise ValueError("RadixHeap 只支持单个整数键")
+        return RadixHeap()
+    raise ValueError(f"未知的优先队列类型: {kind}")
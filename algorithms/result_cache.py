@@ -0,0 +1,171 @@
+"""
+求解结果缓存 - 以输入内容的哈希为键，缓存寻路、BOSS战等纯函数的结果
+
+两级结构:
+- 内存层: 按条数淘汰的 LRU
+- 磁盘层: 项目根目录下的 sqlite 文件，总大小超过上限时淘汰最久未使用的条目，
+          重启游戏后同一关卡可以直接命中
+值以 pickle 形式保存，每次命中都返回一份新的副本，调用方修改结果不会污染缓存。
+"""
+
+import hashlib
+import json
+import pathlib
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import config as cfg
+
+# 求解算法的输出格式变化时递增，使旧的磁盘缓存自然失效
+CACHE_VERSION = 1
+
+
+def make_cache_key(namespace, *parts):
+    """把命名空间和输入内容 (网格、BOSS数据等) 规范化后取 SHA-256"""
+    payload = json.dumps([CACHE_VERSION, namespace, parts], sort_keys=True, separators=(',', ':'),
+                         ensure_ascii=False, default=repr)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """
+    内存 LRU + sqlite 磁盘层的两级结果缓存 (线程安全)
+
+    Args:
+        path (str | Path | None): 磁盘层文件路径，None 表示只使用内存层。
+        memory_entries (int): 内存层最多保留的条目数。
+        max_disk_bytes (int): 磁盘层所有值的总字节数上限。
+    """
+
+    def __init__(self, path=cfg.RESULT_CACHE_PATH, memory_entries=cfg.RESULT_CACHE_MEMORY_ENTRIES,
+                 max_disk_bytes=cfg.RESULT_CACHE_MAX_BYTES):
+        self.path = path
+        self.memory_entries = memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection = None
+
+    def _connect(self):
+        """首次访问磁盘层时才创建文件；失败时退化为纯内存缓存"""
+        if self._connection is None and self.path is not None:
+            try:
+                path = pathlib.Path(self.path)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                connection = sqlite3.connect(str(path), check_same_thread=False)
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS results ("
+                    "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)"
+                )
+                connection.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+                connection.commit()
+                self._connection = connection
+            except (OSError, sqlite3.Error) as e:
+                print(f"警告: 无法打开结果缓存文件 {self.path}: {e}，仅使用内存缓存")
+                self.path = None
+        return self._connection
+
+    def _remember(self, key, blob):
+        memory = self._memory
+        memory[key] = blob
+        memory.move_to_end(key)
+        while len(memory) > self.memory_entries:
+            memory.popitem(last=False)
+
+    def get(self, key, default=None):
+        """查找缓存结果，内存层未命中时再查磁盘层"""
+        with self._lock:
+            blob = self._memory.get(key)
+            if blob is not None:
+                self._memory.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return pickle.loads(blob)
+
+            connection = self._connect()
+            if connection is not None:
+                try:
+                    row = connection.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+                    if row is not None:
+                        connection.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+                        connection.commit()
+                        blob = bytes(row[0])
+                except sqlite3.Error as e:
+                    print(f"警告: 读取结果缓存失败: {e}")
+            if blob is None:
+                self.stats['misses'] += 1
+                return default
+
+            self.stats['disk_hits'] += 1
+            self._remember(key, blob)
+            return pickle.loads(blob)
+
+    def put(self, key, value):
+        """写入两级缓存，磁盘层超出大小上限时淘汰最久未使用的条目"""
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._remember(key, blob)
+            connection = self._connect()
+            if connection is None or len(blob) > self.max_disk_bytes:
+                return
+            try:
+                connection.execute(
+                    "INSERT OR REPLACE INTO results (key, value, size, last_used) VALUES (?, ?, ?, ?)",
+                    (key, blob, len(blob), time.time())
+                )
+                total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+                if total > self.max_disk_bytes:
+                    rows = connection.execute(
+                        "SELECT key, size FROM results WHERE key != ? ORDER BY last_used", (key,)
+                    ).fetchall()
+                    evicted = []
+                    for old_key, size in rows:
+                        if total <= self.max_disk_bytes:
+                            break
+                        evicted.append((old_key,))
+                        total -= size
+                    connection.executemany("DELETE FROM results WHERE key = ?", evicted)
+                connection.commit()
+            except sqlite3.Error as e:
+                print(f"警告: 写入结果缓存失败: {e}")
+
+    def clear(self):
+        """清空两级缓存"""
+        with self._lock:
+            self._memory.clear()
+            connection = self._connect()
+            if connection is not None:
+                try:
+                    connection.execute("DELETE FROM results")
+                    connection.commit()
+                except sqlite3.Error as e:
+                    print(f"警告: 清空结果缓存失败: {e}")
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+# 游戏内共享的默认缓存实例 (磁盘文件在首次使用时才创建)
+result_cache = ResultCache()
+
+
+def cached_call(namespace, func, *args, cache=None, **kwargs):
+    """
+    以 (namespace, 参数) 的内容哈希为键调用纯函数 func，命中时直接返回缓存结果。
+
+    例如 cached_call('find_maze_path', find_maze_path, grid)。
+    参数需能以 JSON 表示 (网格、字典、列表、数字、字符串)。
+    """
+    cache = result_cache if cache is None else cache
+    key = make_cache_key(namespace, args, kwargs)
+    result = cache.get(key)
+    if result is None:
+        result = func(*args, **kwargs)
+        cache.put(key, result)
+    return result
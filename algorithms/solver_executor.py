@@ -0,0 +1,215 @@
+"""
+求解执行器 - 在独立进程中运行寻路、BOSS战、解谜等CPU密集的求解，避免与渲染循环争抢GIL
+
+每类求解使用一个单工作进程的 ProcessPoolExecutor:
+- 输入以 pickle 快照的形式发送给子进程，主进程的迷宫可以继续被修改
+- 'path' 的工作进程内常驻一个 IncrementalPathPlanner，多次规划之间复用距离图
+- 子进程内的寻路和BOSS战同样经过结果缓存 (result_cache)，磁盘层与主进程共享；
+  解谜的方法 C 随机排列数字，结果不确定，不缓存
+- 求解函数可以调用 report_progress 回传中间结果 (例如 anytime 寻路的逐步改进)
+游戏循环每帧调用 SolverJob.poll() / SolverJob.updates() 轮询，不会阻塞。
+"""
+
+import itertools
+import multiprocessing
+import queue
+import time
+from concurrent.futures import ProcessPoolExecutor, CancelledError
+
+import config as cfg
+from algorithms.boss_battle_solver import optimize_boss_fight
+from algorithms.incremental_planner import IncrementalPathPlanner
+from algorithms.puzzle_solver import solve_from_data
+from algorithms.result_cache import cached_call, result_cache
+
+# 工作进程内常驻的路径规划器 (仅在 'path' 进程中使用)
+_worker_planner = None
+# 工作进程内的中间结果队列和当前任务编号
+_progress_queue = None
+_current_token = None
+
+
+def _init_worker(progress_queue):
+    global _progress_queue
+    _progress_queue = progress_queue
+
+
+def report_progress(value):
+    """在工作进程中回传当前任务的一个中间结果"""
+    if _progress_queue is not None:
+        _progress_queue.put((_current_token, value))
+
+
+def _run_solver(kind, token, args):
+    global _current_token
+    _current_token = token
+    return SOLVERS[kind](*args)
+
+
+def _solve_path(grid, start=None, time_budget=None):
+    global _worker_planner
+    if (_worker_planner is None or len(_worker_planner.grid) != len(grid)
+            or len(_worker_planner.grid[0]) != len(grid[0])):
+        _worker_planner = IncrementalPathPlanner(grid, result_cache=result_cache)
+    else:
+        _worker_planner.sync(grid)
+    return _worker_planner.plan(start=start, time_budget=time_budget, on_improvement=report_progress)
+
+
+def _solve_boss(input_data):
+    return cached_call('optimize_boss_fight', optimize_boss_fight, input_data)
+
+
+def _solve_puzzle(data):
+    # solve_from_data 不是纯函数 (方法 C 随机排列数字)，不经过结果缓存
+    return solve_from_data(data)
+
+
+SOLVERS = {
+    'path': _solve_path,
+    'boss': _solve_boss,
+    'puzzle': _solve_puzzle,
+}
+
+
+class SolverJob:
+    """
+    一次提交的求解任务。
+
+    poll() 在任务结束 (完成、失败、取消或超时) 时返回 True；
+    之后 result() 返回求解结果，失败时返回 None 并把原因记录在 error 中。
+    """
+
+    def __init__(self, executor, kind, token, future, timeout):
+        self.kind = kind
+        self.token = token
+        self.future = future
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.cancelled = False
+        self.timed_out = False
+        self.error = None
+        self._executor = executor
+
+    def poll(self):
+        if self.cancelled or self.future.done():
+            return True
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            self.timed_out = True
+            self.error = "求解超时"
+            self.cancel()
+            return True
+        return False
+
+    def updates(self):
+        """取出自上次调用以来收到的中间结果 (按产生顺序)"""
+        if self.cancelled:
+            return []
+        return self._executor.collect_updates(self)
+
+    def cancel(self):
+        if not self.cancelled and not self.future.done():
+            self.cancelled = True
+            self._executor.cancel(self)
+
+    def result(self):
+        if self.cancelled or not self.future.done():
+            if self.error is None:
+                self.error = "任务已取消" if self.cancelled else "任务尚未完成"
+            return None
+        try:
+            return self.future.result()
+        except CancelledError:
+            self.error = "任务已取消"
+        except Exception as e:
+            self.error = f"求解失败: {e}"
+        return None
+
+    def wait(self):
+        """阻塞直到任务结束 (仅用于脚本或测试)，遵守超时设置"""
+        remaining = None if self.deadline is None else max(0.0, self.deadline - time.monotonic())
+        try:
+            self.future.result(timeout=remaining)
+        except Exception:
+            pass
+        self.poll()
+        return self.result()
+
+
+class SolverExecutor:
+    """
+    按求解类型管理工作进程池。
+
+    Args:
+        timeout (float | None): 默认超时秒数，None 表示不限时。
+    """
+
+    def __init__(self, timeout=cfg.SOLVER_TIMEOUT):
+        self.timeout = timeout
+        self._pools = {}
+        self._progress_queues = {}
+        self._updates = {}
+        self._tokens = itertools.count()
+        # 使用 spawn，避免子进程继承主进程中的图形上下文
+        self._context = multiprocessing.get_context('spawn')
+
+    def _pool(self, kind):
+        pool = self._pools.get(kind)
+        if pool is None:
+            progress_queue = self._context.Queue()
+            pool = ProcessPoolExecutor(max_workers=1, mp_context=self._context,
+                                       initializer=_init_worker, initargs=(progress_queue,))
+            self._pools[kind] = pool
+            self._progress_queues[kind] = progress_queue
+        return pool
+
+    def submit(self, kind, *args, timeout=None):
+        """提交一次求解，立即返回 SolverJob"""
+        if kind not in SOLVERS:
+            raise ValueError(f"未知的求解类型: {kind}")
+        token = next(self._tokens)
+        future = self._pool(kind).submit(_run_solver, kind, token, args)
+        return SolverJob(self, kind, token, future, self.timeout if timeout is None else timeout)
+
+    def collect_updates(self, job):
+        """把该类型队列中的中间结果按任务分发，返回属于 job 的部分"""
+        progress_queue = self._progress_queues.get(job.kind)
+        while progress_queue is not None:
+            try:
+                token, value = progress_queue.get_nowait()
+            except (queue.Empty, OSError, EOFError):
+                break
+            self._updates.setdefault(token, []).append(value)
+        return self._updates.pop(job.token, [])
+
+    def cancel(self, job):
+        """
+        取消任务。尚未开始的任务直接出队；正在运行的任务无法中断，
+        只能终止该类型的工作进程，下次提交时会重新创建 (常驻的规划器随之重建)。
+        """
+        self._updates.pop(job.token, None)
+        if job.future.cancel():
+            return
+        pool = self._pools.pop(job.kind, None)
+        if pool is not None:
+            self._terminate(pool)
+        # 进程被终止时队列可能残留半条消息，随进程池一起丢弃
+        progress_queue = self._progress_queues.pop(job.kind, None)
+        if progress_queue is not None:
+            progress_queue.close()
+
+    @staticmethod
+    def _terminate(pool):
+        # ProcessPoolExecutor 没有公开终止运行中任务的接口，只能直接结束其工作进程
+        for process in list((getattr(pool, '_processes', None) or {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        """退出游戏时调用，终止所有工作进程"""
+        for pool in self._pools.values():
+            self._terminate(pool)
+        for progress_queue in self._progress_queues.values():
+            progress_queue.close()
+        self._pools.clear()
+        self._progress_queues.clear()
+        self._updates.clear()
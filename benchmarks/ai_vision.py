@@ -0,0 +1,32 @@
+"""
+AI 贪心视野对比 - 在生成的迷宫上无界面地批量运行 AIAgent，比较不同视野半径的资源、步数和耗时
+
+用法: python benchmarks/ai_vision.py
+"""
+
+import os
+import sys
+import time
+
+# 确保能从根目录导入
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game_logic.simulator import run_episodes, summarize
+
+VISION_RADII = (1, 2, 3, 5)
+
+
+def report(size, episodes):
+    started = time.perf_counter()
+    results = run_episodes(range(episodes), VISION_RADII, width=size, height=size)
+    elapsed = time.perf_counter() - started
+    print(f"{size}x{size}: {len(results)} 个回合，总耗时 {elapsed:.2f}s ({len(results) / elapsed:.0f} 回合/秒)")
+    for radius, stats in summarize(results).items():
+        print(f"  视野半径 {radius}: 平均资源 {stats['mean_resources']:.1f}  平均步数 {stats['mean_steps']:.1f}  "
+              f"到达出口 {stats['exit_rate']:.0%} (超时 {stats['timeouts']} / 停滞 {stats['stalls']} / "
+              f"无路 {stats['no_route']})  单回合 {stats['mean_wall_time'] * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    report(15, episodes=2000)
+    report(31, episodes=500)
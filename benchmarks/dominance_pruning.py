@@ -0,0 +1,50 @@
+"""
+支配剪枝效果对比 - 统计 OptimalPathfinderWithRepeats 开启/关闭帕累托剪枝时的扩展次数
+
+用法: python benchmarks/dominance_pruning.py
+"""
+
+import os
+import random
+import sys
+import time
+
+# 确保能从根目录导入
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game_logic.maze import Maze
+from algorithms.pathfinding import OptimalPathfinderWithRepeats
+
+
+def _generated_grid(width, height, seed):
+    """生成迷宫并随机放置起点、终点和物品"""
+    random.seed(seed)
+    return Maze(width, height, use_generated=True).grid
+
+
+def _run(grid, prune_dominated):
+    pathfinder = OptimalPathfinderWithRepeats(grid, prune_dominated=prune_dominated)
+    start = time.perf_counter()
+    score, _, steps = pathfinder.calculate_optimal_path()
+    elapsed = time.perf_counter() - start
+    return score, steps, pathfinder.stats, elapsed
+
+
+def compare(name, grid):
+    """打印同一迷宫上剪枝前后的扩展次数与耗时"""
+    num_items = sum(1 for row in grid for char in row if char in ('G', 'T'))
+    score_a, steps_a, stats_a, time_a = _run(grid, prune_dominated=False)
+    score_b, steps_b, stats_b, time_b = _run(grid, prune_dominated=True)
+    assert (score_a, steps_a) == (score_b, steps_b), "剪枝改变了最优解"
+
+    ratio = stats_a['expanded'] / max(1, stats_b['expanded'])
+    print(f"{name:<16} 物品 {num_items:>2}  得分 {score_b:>3}  步数 {steps_b:>4}  "
+          f"扩展 {stats_a['expanded']:>9} -> {stats_b['expanded']:>8} ({ratio:6.1f}x)  "
+          f"剪枝 {stats_b['pruned']:>7}  耗时 {time_a:6.2f}s -> {time_b:5.2f}s")
+
+
+if __name__ == "__main__":
+    compare("preset 15x15", Maze(15, 15, use_generated=False).grid)
+    for size in (15, 21):
+        for seed in range(3):
+            compare(f"generated {size}x{size}#{seed}", _generated_grid(size, size, seed))
@@ -0,0 +1,71 @@
+"""
+启发式引擎质量与耗时 - 在精确解可算的迷宫上统计 'heuristic' 相对 'item_graph' 的得分/步数差距，
+并在 51x51、40+ 物品的迷宫上测量启发式引擎的耗时
+
+用法: python benchmarks/heuristic_gap.py
+"""
+
+import os
+import random
+import sys
+import time
+
+# 确保能从根目录导入
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from algorithms.maze_generator import generate_recursive_division_maze
+from algorithms.pathfinding import find_maze_path
+
+
+def _generated_grid(width, height, num_gold, num_trap, seed):
+    """生成空迷宫 (不经过 Maze，避免重复放置物品) 并随机放置起点、终点和指定数量的金币、陷阱"""
+    random.seed(seed)
+    grid = generate_recursive_division_maze(width, height)
+    cells = [(r, c) for r in range(height) for c in range(width) if grid[r][c] == ' ']
+    random.shuffle(cells)
+    for symbol, count in (('S', 1), ('E', 1), ('G', num_gold), ('T', num_trap)):
+        for _ in range(min(count, len(cells))):
+            r, c = cells.pop()
+            grid[r][c] = symbol
+    return grid
+
+
+def _timed(grid, engine):
+    start = time.perf_counter()
+    score, _, steps = find_maze_path(grid, engine=engine)
+    return score, steps, time.perf_counter() - start
+
+
+def report_gap(size, num_gold, num_trap, runs):
+    """精确解可验证的规模上，统计启发式解的得分差距和同分时的多余步数"""
+    score_gaps = []
+    extra_steps = []
+    for seed in range(runs):
+        grid = _generated_grid(size, size, num_gold, num_trap, seed)
+        exact_score, exact_steps, _ = _timed(grid, 'item_graph')
+        score, steps, _ = _timed(grid, 'heuristic')
+        if exact_steps < 0:
+            continue
+        score_gaps.append(exact_score - score)
+        if score == exact_score:
+            extra_steps.append(steps - exact_steps)
+
+    exact_hits = sum(1 for gap in score_gaps if gap == 0)
+    print(f"{size}x{size} 金币 {num_gold} 陷阱 {num_trap}: 同分 {exact_hits}/{len(score_gaps)}  "
+          f"最大得分差 {max(score_gaps)}  平均得分差 {sum(score_gaps) / len(score_gaps):.2f}  "
+          f"同分时平均多走 {sum(extra_steps) / max(1, len(extra_steps)):.2f} 步")
+
+
+def report_time(size, num_gold, num_trap, runs):
+    """大量物品时只运行启发式引擎，报告耗时分布"""
+    times = sorted(_timed(_generated_grid(size, size, num_gold, num_trap, seed), 'heuristic')[2]
+                   for seed in range(runs))
+    print(f"{size}x{size} 物品 {num_gold + num_trap}: 启发式耗时 中位数 {times[len(times) // 2] * 1000:.1f}ms  "
+          f"最大 {times[-1] * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    report_gap(21, 6, 5, runs=50)
+    report_gap(31, 9, 6, runs=30)
+    report_time(51, 25, 20, runs=20)
+    report_time(51, 40, 20, runs=20)
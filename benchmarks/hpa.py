@@ -0,0 +1,68 @@
+"""
+分层寻路对比 - 超大迷宫上 HPA* 的预计算、点到点查询和墙壁变化后的惰性重算耗时
+
+用法: python benchmarks/hpa.py
+"""
+
+import os
+import random
+import sys
+import time
+
+# 确保能从根目录导入
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import config as cfg
+from algorithms.hpa import HierarchicalPathfinder
+from algorithms.maze_generator import generate_recursive_division_maze
+from game_logic.ai_agent import find_shortest_path
+from game_logic.maze import Maze
+
+GRID_SIZES = (201, 501, 1001)
+CLUSTER_SIZES = (16, cfg.HPA_CLUSTER_SIZE, 64)
+
+
+def _timed(func, repeats):
+    started = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - started) / repeats * 1000
+
+
+def report(size, queries):
+    random.seed(size)
+    grid = generate_recursive_division_maze(size, size)
+    cells = [(r, c) for r, row in enumerate(grid) for c, tile in enumerate(row) if tile != '#']
+    pairs = [tuple(random.sample(cells, 2)) for _ in range(queries)]
+    print(f"{size}x{size}: 可通行格 {len(cells)}")
+
+    bitset_ms = _timed(lambda: [find_shortest_path(grid, a, b, engine='bitset') for a, b in pairs[:5]], 1) / 5
+    print(f"  位并行BFS 点到点 {bitset_ms:.1f}ms")
+
+    for cluster_size in CLUSTER_SIZES:
+        hierarchy = HierarchicalPathfinder(grid, cluster_size=cluster_size)
+        precompute_ms = _timed(hierarchy.precompute, 1)
+        query_ms = _timed(lambda: [find_shortest_path(grid, a, b, engine='hpa', graph=hierarchy)
+                                   for a, b in pairs], 1) / queries
+        print(f"  簇 {cluster_size:>2}: 入口 {len(hierarchy._edges):>6}  预计算 {precompute_ms:7.0f}ms  "
+              f"点到点 {query_ms:6.1f}ms")
+
+    # 墙壁变化: 只有涉及的簇在下一次查询时重算
+    maze = Maze.from_grid(grid)
+    hierarchy = maze.hierarchy
+    hierarchy.precompute()
+    builds = hierarchy.stats['cluster_builds']
+    for _ in range(10):
+        r, c = random.choice(cells)
+        maze.set_tile_type(c, r, '#')
+        maze.set_tile_type(c, r, ' ')
+    a, b = pairs[0]
+    refresh_ms = _timed(lambda: hierarchy.shortest_path(a, b), 1)
+    clean_ms = _timed(lambda: hierarchy.shortest_path(a, b), 1)
+    print(f"  10 处墙壁变化后: 查询时重算 {hierarchy.stats['cluster_builds'] - builds} 个簇，"
+          f"首次查询 {refresh_ms:.1f}ms / 之后 {clean_ms:.1f}ms")
+
+
+if __name__ == "__main__":
+    for size in GRID_SIZES:
+        report(size, queries=20)
@@ -0,0 +1,69 @@
+"""
+通道收缩图对比 - 收缩前后的规模，以及点到点寻路、距离场、物品图建图在收缩图上的耗时
+
+用法: python benchmarks/junction_graph.py
+"""
+
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+# 确保能从根目录导入
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from algorithms.junction_graph import JunctionGraph
+from algorithms.maze_generator import generate_recursive_division_maze
+from algorithms.pathfinding import ItemGraphPathfinder
+from game_logic.ai_agent import find_shortest_path
+from game_logic.navigation import NavigationField
+
+GRID_SIZES = (51, 101, 201)
+
+
+def _timed(func, repeats):
+    started = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - started) / repeats * 1000
+
+
+def report(size, queries):
+    random.seed(size)
+    grid = generate_recursive_division_maze(size, size)
+    cells = [(r, c) for r, row in enumerate(grid) for c, tile in enumerate(row) if tile != '#']
+    build_ms = _timed(lambda: JunctionGraph(grid), 3)
+    graph = JunctionGraph(grid)
+    edges = len(graph.edges)
+    print(f"{size}x{size}: 可通行格 {len(cells)} -> 节点 {len(graph.nodes)} / 边 {edges} "
+          f"(缩小 {len(cells) / len(graph.nodes):.1f}x)，建图 {build_ms:.1f}ms")
+
+    pairs = [tuple(random.sample(cells, 2)) for _ in range(queries)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        timings = {engine: _timed(lambda: [find_shortest_path(grid, a, b, engine=engine, graph=graph)
+                                           for a, b in pairs], 1) / queries
+                   for engine in ('astar', 'bitset', 'junction')}
+    print("  点到点: " + "  ".join(f"{engine} {ms:.2f}ms" for engine, ms in timings.items()))
+
+    targets = random.sample(cells, 10)
+    plain = NavigationField(grid)
+    contracted = NavigationField(grid, junction_graph=graph)
+    plain_ms = _timed(lambda: [plain._build(target) for target in targets], 1) / len(targets)
+    contracted_ms = _timed(lambda: [contracted._build(target) for target in targets], 1) / len(targets)
+    print(f"  距离场: 逐格 BFS {plain_ms:.2f}ms  收缩图 {contracted_ms:.2f}ms")
+
+    item_grid = [row[:] for row in grid]
+    random.shuffle(cells)
+    for symbol in 'SE' + 'G' * 10 + 'T' * 10:
+        r, c = cells.pop()
+        item_grid[r][c] = symbol
+    bitset_ms = _timed(lambda: ItemGraphPathfinder(item_grid), 3)
+    junction_ms = _timed(lambda: ItemGraphPathfinder(item_grid, contract_corridors=True), 3)
+    print(f"  物品图建图 (20 物品): 位并行BFS {bitset_ms:.1f}ms  收缩图 {junction_ms:.1f}ms")
+
+
+if __name__ == "__main__":
+    for size in GRID_SIZES:
+        report(size, queries=20)
@@ -0,0 +1,53 @@
+"""
+迷宫生成耗时 - 各生成算法在不同尺寸下生成一张迷宫所需的时间
+
+用法: python benchmarks/maze_generation.py
+"""
+
+import os
+import random
+import sys
+import time
+
+# 确保能从根目录导入
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from algorithms.maze_generator import (generate_binary_tree_array, generate_eller_maze, generate_kruskal_maze,
+                                       generate_recursive_division_array, generate_recursive_division_maze,
+                                       generate_sidewinder_array)
+
+# 网格边长 (行数 = 列数)
+GRID_SIZES = (101, 501, 1001, 2001, 4097)
+# 只测整体向量化的生成器的超大尺寸
+LARGE_GRID_SIZES = (10001,)
+
+# 名称 -> 按网格边长生成迷宫的函数 (字符网格或 uint8 数组)
+GENERATORS = {
+    'kruskal': lambda size: generate_kruskal_maze(size // 2, size // 2),
+    'eller': lambda size: generate_eller_maze(size // 2, size // 2),
+    'division': lambda size: generate_recursive_division_maze(size, size),
+    'division (uint8)': lambda size: generate_recursive_division_array(size, size),
+}
+VECTORIZED_GENERATORS = {
+    'binary tree (uint8)': lambda size: generate_binary_tree_array(size // 2, size // 2),
+    'sidewinder (uint8)': lambda size: generate_sidewinder_array(size // 2, size // 2),
+}
+
+
+def report(size, generators):
+    timings = []
+    for name, generate in generators.items():
+        random.seed(size)
+        started = time.perf_counter()
+        grid = generate(size)
+        elapsed = time.perf_counter() - started
+        assert len(grid) == size and len(grid[0]) == size
+        timings.append(f"{name} {elapsed:.2f}s")
+    print(f"{size}x{size}: " + "  ".join(timings))
+
+
+if __name__ == "__main__":
+    for size in GRID_SIZES:
+        report(size, {**GENERATORS, **VECTORIZED_GENERATORS})
+    for size in LARGE_GRID_SIZES:
+        report(size, VECTORIZED_GENERATORS)
@@ -22,12 +22,19 @@ GAME_TITLE = "算法迷宫探险"
 TILE_SIZE = 45  # 每个格子的像素大小
 MAZE_WIDTH = 15  # 迷宫宽度（格子数）
 MAZE_HEIGHT = 15  # 迷宫高度（格子数）
+MAZE_BACKEND = 'list'  # 迷宫网格的存储方式: 'list' (字符列表) 或 'uint8' (NumPy 编码数组)
+ITEM_MIN_SPACING = 2  # 放置物品时相互之间的最小切比雪夫距离 (2 即互不相邻)
+MAZE_GENERATION_ATTEMPTS = 10  # 生成的迷宫放置物品后不可解时最多重新生成的次数
 
 # === 玩家和AI代理设置 ===
 PLAYER_SPEED = 4
 PLAYER_MAX_HEALTH = 100 # 新增: 玩家最大生命值 (也用于AI代理)
 GOLD_VALUE = 10         # 新增: 金币价值 (也用于AI代理)
 TRAP_DAMAGE = 20        # 新增: 陷阱伤害 (也用于AI代理)
+AI_VISION_RADIUS = 1    # AI 贪心视野半径 (1 即 3×3)
+ITEM_INDEX_BUCKET_SIZE = 8  # 物品空间索引的分桶边长 (格子数)
+AI_FRAME_BUDGET = 0.002 # AI 推迟任务每帧最多占用的时间 (秒)
+HPA_CLUSTER_SIZE = 32   # 分层寻路 (HPA*) 的簇边长 (格子数)
 
 # === 游戏数值 ===
 TRAP_PENALTY = 30  # 陷阱惩罚（扣除资源） - 这与TRAP_DAMAGE可能冲突，后续可考虑统一
@@ -109,4 +116,12 @@ MUSIC_PATHS = {
 
 # 音量设置
 BACKGROUND_VOLUME = 0.3  # 背景音乐音量
-EFFECT_VOLUME = 0.5     # 音效音量
\ No newline at end of file
+EFFECT_VOLUME = 0.5     # 音效音量
+# === 求解结果缓存 ===
+RESULT_CACHE_PATH = PROJECT_ROOT / ".cache" / "solver_results.sqlite3"  # 磁盘层缓存文件
+RESULT_CACHE_MEMORY_ENTRIES = 64                # 内存层最多保留的结果条数
+RESULT_CACHE_MAX_BYTES = 16 * 1024 * 1024       # 磁盘层总大小上限，超出后按最久未使用淘汰
+
+# === 后台求解 ===
+SOLVER_TIMEOUT = 30.0  # 单次后台求解的超时秒数
+PATH_TIME_BUDGET = 5.0  # 按 P 寻路的时间预算 (秒)，超出后采用当前最好路径
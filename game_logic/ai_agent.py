@@ -1,37 +1,74 @@
 # game_logic/ai_agent.py (最终重构版 - 智能返回)
 import numpy as np
-import heapq
 import config as cfg
+from algorithms.bitset_bfs import BitGrid
+from algorithms.hpa import HierarchicalPathfinder
+from algorithms.junction_graph import JunctionGraph
+from algorithms.priority_queue import create_priority_queue
 
-def find_shortest_path(grid_data, start_node, end_node):
+def find_shortest_path(grid_data, start_node, end_node, queue='heap', engine='astar', stats=None,
+                       graph=None):
     """
     【诊断版】A*算法，会打印出详细的执行过程。
+
+    queue 选择开放列表的实现: 'heap'、'bucket' 或 'radix'。
+    开放列表采用惰性删除并带关闭集合: 曼哈顿距离在网格上是一致启发式，
+    出队的 f 值单调不减，因此三者 (包括要求键单调的 'radix') 都适用。
+
+    engine 选择搜索方式:
+    - 'astar' (默认)
+    - 'bitset': 位并行BFS，整层波前一次扩展，无步数安全阀
+    - 'jps': 四连通跳点搜索，沿直线通道跳跃，只把跳点放入开放列表
+    - 'junction': 在通道收缩图上做 A*；graph 传入 Maze.junction_graph 时复用已缓存的图，
+      否则按 grid_data 临时建图
+    - 'hpa': 分层寻路 (HPA*)，在簇入口图上搜索后逐段细化；用于超大迷宫，graph 传入
+      Maze.hierarchy 时复用已缓存的簇内距离，否则按 grid_data 临时建立
+    各引擎返回的路径长度相同；只有 'astar' 打印诊断信息，其余引擎不输出。
+
+    传入 stats (dict) 时记录开放列表的入队 ('pushes') 和出队 ('pops') 次数。
     """
+    if engine == 'bitset':
+        return _bitset_shortest_path(grid_data, start_node, end_node)
+    if engine == 'jps':
+        return _jps_shortest_path(grid_data, start_node, end_node, queue, stats)
+    if engine == 'junction':
+        return _junction_shortest_path(grid_data, start_node, end_node, graph)
+    if engine == 'hpa':
+        return _hpa_shortest_path(grid_data, start_node, end_node, graph)
+    if engine != 'astar':
+        raise ValueError(f"未知的寻路引擎: {engine}")
+
     print(f"\n--- A* 寻路算法启动 ---")
     print(f"起点(行,列): {start_node}, 终点(行,列): {end_node}")
 
     grid = np.array(grid_data)
     rows, cols = grid.shape
     
-    open_set = [(0, start_node)]
+    open_set = create_priority_queue(queue)
+    open_set.push(_heuristic(start_node, end_node), start_node)
     came_from = {}
-    g_score = { (r,c): float('inf') for r in range(rows) for c in range(cols) }
-    g_score[start_node] = 0
-    f_score = { (r,c): float('inf') for r in range(rows) for c in range(cols) }
-    f_score[start_node] = _heuristic(start_node, end_node)
-    
-    open_set_hash = {start_node}
+    g_score = {start_node: 0}
+    # 惰性删除: g 值改进时直接重新入队，出队时跳过已关闭的节点；
+    # 一致启发式下每个节点只在 f 最小时被扩展一次，出队的 f 值单调不减
+    closed = set()
+    if stats is not None:
+        stats['pushes'] = 1
+        stats['pops'] = 0
     
     step_count = 0
     while open_set:
+        _, current = open_set.pop()
+        if stats is not None:
+            stats['pops'] += 1
+        if current in closed:
+            continue
+        closed.add(current)
+
         step_count += 1
         if step_count > 3000: # 安全阀
             print("!!! A* 错误: 搜索步数超过3000，可能陷入死循环或地图无解。")
             return []
 
-        _, current = heapq.heappop(open_set)
-        open_set_hash.remove(current)
-
         if current == end_node:
             print(f"--- A* 成功: 在 {step_count} 步后找到终点！ ---")
             return _reconstruct_path(came_from, current)
@@ -45,21 +82,134 @@ def find_shortest_path(grid_data, start_node, end_node):
                 continue
 
             # 修正：只要邻居不是墙壁，就认为是可通行的
-            if grid[neighbor[0], neighbor[1]] != cfg.WALL:
+            if grid[neighbor[0], neighbor[1]] != cfg.WALL and neighbor not in closed:
                 tentative_g_score = g_score[current] + 1
             
                 if tentative_g_score < g_score.get(neighbor, float('inf')):
                     came_from[neighbor] = current
                     g_score[neighbor] = tentative_g_score
-                    f_score[neighbor] = tentative_g_score + _heuristic(neighbor, end_node)
-                    if neighbor not in open_set_hash:
-                        # print(f"  -> 发现到 {neighbor} 的更优路径, f_score: {f_score[neighbor]:.2f}")
-                        heapq.heappush(open_set, (int(f_score[neighbor]), neighbor))
-                        open_set_hash.add(neighbor)
+                    # print(f"  -> 发现到 {neighbor} 的更优路径")
+                    open_set.push(tentative_g_score + _heuristic(neighbor, end_node), neighbor)
+                    if stats is not None:
+                        stats['pushes'] += 1
     
     print(f"--- A* 失败: 在 {step_count} 步后仍然没有找到通往 {end_node} 的路径！ ---")
     return []
 
+def _bitset_shortest_path(grid_data, start_node, end_node):
+    return BitGrid(grid_data, cfg.WALL).shortest_path(start_node, end_node)
+
+def _junction_shortest_path(grid_data, start_node, end_node, graph):
+    if graph is None:
+        graph = JunctionGraph(grid_data)
+    return graph.shortest_path(start_node, end_node)
+
+def _hpa_shortest_path(grid_data, start_node, end_node, hierarchy):
+    if hierarchy is None:
+        hierarchy = HierarchicalPathfinder(grid_data, cluster_size=cfg.HPA_CLUSTER_SIZE)
+    return hierarchy.shortest_path(start_node, end_node)
+
+def _jps_shortest_path(grid_data, start_node, end_node, queue, stats):
+    """
+    四连通跳点搜索 (JPS)。
+
+    规范路径约定为"先竖直、后水平":
+    - 水平移动只沿原方向继续；当上(下)方可走而其后方的上(下)格是墙时，
+      上(下)方成为强迫邻居，当前格是跳点
+    - 竖直移动沿原方向继续，并在每一格向左右各做一次水平跳跃，找到跳点则当前格也是跳点
+    开放列表中只出现跳点，两跳点之间总在同一直线上，展开后即为逐格路径。
+    """
+    grid = grid_data
+    rows, cols = len(grid), len(grid[0])
+
+    def walkable(r, c):
+        return 0 <= r < rows and 0 <= c < cols and grid[r][c] != cfg.WALL
+
+    def jump_horizontal(r, c, dc):
+        while True:
+            c += dc
+            if not walkable(r, c):
+                return None
+            if (r, c) == end_node:
+                return (r, c)
+            if ((walkable(r - 1, c) and not walkable(r - 1, c - dc))
+                    or (walkable(r + 1, c) and not walkable(r + 1, c - dc))):
+                return (r, c)
+
+    def jump_vertical(r, c, dr):
+        while True:
+            r += dr
+            if not walkable(r, c):
+                return None
+            if (r, c) == end_node:
+                return (r, c)
+            if jump_horizontal(r, c, 1) is not None or jump_horizontal(r, c, -1) is not None:
+                return (r, c)
+
+    def successors(current, parent):
+        r, c = current
+        if parent is None:
+            directions = ((0, 1), (0, -1), (1, 0), (-1, 0))
+        elif parent[0] == r:
+            dc = 1 if c > parent[1] else -1
+            directions = [(0, dc)]
+            for dr in (1, -1):
+                if walkable(r + dr, c) and not walkable(r + dr, c - dc):
+                    directions.append((dr, 0))
+        else:
+            dr = 1 if r > parent[0] else -1
+            directions = ((dr, 0), (0, 1), (0, -1))
+        for dr, dc in directions:
+            if dr == 0:
+                jump_point = jump_horizontal(r, c, dc)
+            else:
+                jump_point = jump_vertical(r, c, dr)
+            if jump_point is not None:
+                yield jump_point
+
+    if not walkable(*start_node) or not walkable(*end_node):
+        return []
+
+    open_set = create_priority_queue(queue)
+    open_set.push(_heuristic(start_node, end_node), start_node)
+    came_from = {}
+    g_score = {start_node: 0}
+    closed = set()
+    pushes, pops = 1, 0
+    while open_set:
+        _, current = open_set.pop()
+        pops += 1
+        if current in closed:
+            continue
+        closed.add(current)
+
+        if current == end_node:
+            if stats is not None:
+                stats['pushes'], stats['pops'] = pushes, pops
+            path = [current]
+            while current in came_from:
+                previous = came_from[current]
+                # 跳点之间在同一直线上，逐格补全
+                dr = (previous[0] > current[0]) - (previous[0] < current[0])
+                dc = (previous[1] > current[1]) - (previous[1] < current[1])
+                while current != previous:
+                    current = (current[0] + dr, current[1] + dc)
+                    path.append(current)
+            path.reverse()
+            return path
+
+        for jump_point in successors(current, came_from.get(current)):
+            tentative_g_score = g_score[current] + _heuristic(current, jump_point)
+            if tentative_g_score < g_score.get(jump_point, float('inf')):
+                g_score[jump_point] = tentative_g_score
+                came_from[jump_point] = current
+                open_set.push(tentative_g_score + _heuristic(jump_point, end_node), jump_point)
+                pushes += 1
+
+    if stats is not None:
+        stats['pushes'], stats['pops'] = pushes, pops
+    return []
+
 def _heuristic(a, b):
     return abs(a[0] - b[0]) + abs(a[1] - b[1])
 
@@ -80,12 +230,13 @@ class AIAgent:
         # AI现在是无状态的，不需要构造函数参数
         pass
 
-    def decide_next_target(self, current_pos_grid, grid_data):
+    def decide_next_target(self, current_pos_grid, grid_data, item_index=None,
+                           vision_radius=cfg.AI_VISION_RADIUS):
         """
         任务3: 贪心算法 - 在3×3视野内选择最优目标。
 
         贪心策略：
-        - 扫描3x3视野范围。
+        - 扫描视野范围 (vision_radius 为 1 时即 3x3)。
         - 为每个格子根据其内容（资源, 陷阱）赋予一个基础价值。
         - BOSS和宝箱不再具有短期收益值，因为它们在主路径上。
         - 选择价值最高的格子作为短期目标。
@@ -95,46 +246,61 @@ class AIAgent:
         评分标准 (基础价值):
         - 资源点: +50 (cfg.RESOURCE_VALUE)
         - 陷阱: -30 (cfg.TRAP_PENALTY)
+
+        传入 item_index (ItemSpatialIndex) 时只检查视野内的物品，
+        开销与附近物品数量成正比，与视野面积和迷宫大小无关；
+        两种方式按相同的 (行, 列) 顺序比较，选出的目标一致。
         """
-        grid = np.array(grid_data)
         current_row, current_col = current_pos_grid
+        if item_index is not None:
+            candidates = ((cell, item_index.tile_at(cell))
+                          for cell in item_index.within(current_pos_grid, vision_radius))
+        else:
+            # 直接索引嵌套列表，避免每帧把整张网格复制为 numpy 数组
+            grid = grid_data
+            candidates = (((r, c), grid[r][c])
+                          for r in range(max(0, current_row - vision_radius),
+                                         min(len(grid), current_row + vision_radius + 1))
+                          for c in range(max(0, current_col - vision_radius),
+                                         min(len(grid[r]), current_col + vision_radius + 1)))
         
         best_target = None
         max_score = 0
 
-        # 扫描3×3视野
-        for r in range(max(0, current_row - 1), min(grid.shape[0], current_row + 2)):
-            for c in range(max(0, current_col - 1), min(grid.shape[1], current_col + 2)):
-                if r == current_row and c == current_col:
-                    continue  # 不把自己作为目标
-
-                if grid[r, c] == cfg.WALL:
-                    continue # 不考虑墙壁
-
-                tile_type = grid[r, c]
-                score = 0
-
-                if tile_type == cfg.BOSS:
-                    score = 0 # BOSS在必经之路上，不计入短期贪心收益
-                elif tile_type == cfg.LOCKER:
-                    score = 0 # 宝箱在必经之路上，不计入短期贪心收益
-                elif tile_type == cfg.RESOURCE_NODE:
-                    score = cfg.RESOURCE_VALUE
-                elif tile_type == cfg.TRAP:
-                    score = -cfg.TRAP_PENALTY # 陷阱是负收益
-                
-                if score > max_score:
-                    max_score = score
-                    best_target = (r, c)
+        for (r, c), tile_type in candidates:
+            if r == current_row and c == current_col:
+                continue  # 不把自己作为目标
+
+            if tile_type == cfg.WALL:
+                continue # 不考虑墙壁
+
+            score = _tile_score(tile_type)
+            if score > max_score:
+                max_score = score
+                best_target = (r, c)
         
+        view = f"{2 * vision_radius + 1}×{2 * vision_radius + 1}"
         if best_target:
-            print(f"AI决策: 在3×3视野内发现最优目标 {best_target} (价值: {max_score})")
+            print(f"AI决策: 在{view}视野内发现最优目标 {best_target} (价值: {max_score})")
             return best_target
         
         # 如果视野内没有正收益目标，则返回None，按主路径前进
-        print("AI决策: 3×3视野内无正收益目标，按主路径前进。")
+        print(f"AI决策: {view}视野内无正收益目标，按主路径前进。")
         return None
 
+
+def _tile_score(tile_type):
+    """贪心决策使用的格子基础价值"""
+    if tile_type == cfg.BOSS:
+        return 0 # BOSS在必经之路上，不计入短期贪心收益
+    if tile_type == cfg.LOCKER:
+        return 0 # 宝箱在必经之路上，不计入短期贪心收益
+    if tile_type == cfg.RESOURCE_NODE:
+        return cfg.RESOURCE_VALUE
+    if tile_type == cfg.TRAP:
+        return -cfg.TRAP_PENALTY # 陷阱是负收益
+    return 0
+
 # 移除所有旧的、复杂的、基于索引的状态管理方法
 # _execute_follow_path, _execute_side_quest, _plan_return_path, 
 # _find_nearest_node_on_main_path, _find_gold_nearby 均被新的update逻辑取代。
\ No newline at end of file
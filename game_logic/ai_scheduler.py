@@ -0,0 +1,91 @@
+"""
+AI 调度模块 - 只在事件发生时触发 AI 决策，并把可推迟的预计算分摊到各帧
+"""
+
+import time
+from collections import deque
+from typing import Callable, Deque, Optional, Set, Tuple
+import config as cfg
+
+ARRIVAL = 'arrival'            # 到达一个格子
+TILE_CHANGED = 'tile_changed'  # 视野内 (或影响通行) 的格子发生变化
+REPLAN = 'replan'              # 显式请求重新决策 (例如刚接管控制)
+
+
+class AIScheduler:
+    """
+    事件驱动的 AI 决策调度器。
+
+    AI 的决策只依赖于所在格子和迷宫内容，两者不变时重复决策只会得到相同的结果，
+    因此只在以下事件之后才允许下一次决策:
+    - ARRIVAL: 沿路径到达下一个格子
+    - TILE_CHANGED: 视野半径内的格子变化，或任何位置的墙壁、出口变化 (影响到出口的路线)
+    - REPLAN: 显式请求
+    决策时机与逐帧决策时完全一致 (空闲且状态可能已变化时)，AI 走出的路线不变。
+
+    defer() 登记的预计算 (例如预先建立附近物品的距离场) 在 run_deferred() 中执行，
+    每帧最多占用 frame_budget 秒，超出的部分留到下一帧。
+    """
+
+    def __init__(self, vision_radius: int = cfg.AI_VISION_RADIUS,
+                 frame_budget: float = cfg.AI_FRAME_BUDGET):
+        self.vision_radius = vision_radius
+        self.frame_budget = frame_budget
+        self.stats = {'decisions': 0, 'skipped': 0, 'deferred_runs': 0}
+        self._events: Set[str] = {REPLAN}
+        self._agent_cell: Optional[Tuple[int, int]] = None
+        self._deferred: Deque[Callable[[], None]] = deque()
+
+    def reset(self) -> None:
+        """重新开始 (切换控制或重开游戏时调用)，清空待办并要求立即决策一次"""
+        self._events = {REPLAN}
+        self._agent_cell = None
+        self._deferred.clear()
+
+    def notify_arrival(self) -> None:
+        self._events.add(ARRIVAL)
+
+    def request_replan(self) -> None:
+        self._events.add(REPLAN)
+
+    def on_tile_changed(self, x: int, y: int, old_type: str, new_type: str) -> None:
+        """Maze 的格子监听器 (坐标约定与 Maze.set_tile_type 相同，x 为列、y 为行)"""
+        if old_type == new_type:
+            return
+        if cfg.WALL in (old_type, new_type) or cfg.EXIT in (old_type, new_type):
+            self._events.add(TILE_CHANGED)
+            return
+        cell = self._agent_cell
+        if cell is None or (abs(y - cell[0]) <= self.vision_radius and abs(x - cell[1]) <= self.vision_radius):
+            self._events.add(TILE_CHANGED)
+
+    def should_decide(self, agent_cell: Tuple[int, int]) -> bool:
+        """
+        AI 空闲时每帧调用。有待处理的事件时返回 True 并消费这些事件，
+        否则返回 False，本帧跳过决策。
+        """
+        if not self._events and agent_cell == self._agent_cell:
+            self.stats['skipped'] += 1
+            return False
+        self._events.clear()
+        self._agent_cell = agent_cell
+        self.stats['decisions'] += 1
+        return True
+
+    def defer(self, task: Callable[[], None]) -> None:
+        """登记一项可推迟的预计算"""
+        self._deferred.append(task)
+
+    def run_deferred(self) -> int:
+        """在本帧的时间预算内执行推迟的任务，返回执行的数量 (至少执行一项以保证进展)"""
+        if not self._deferred:
+            return 0
+        deadline = time.perf_counter() + self.frame_budget
+        count = 0
+        while self._deferred:
+            self._deferred.popleft()()
+            count += 1
+            if time.perf_counter() >= deadline:
+                break
+        self.stats['deferred_runs'] += count
+        return count
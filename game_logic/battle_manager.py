@@ -5,6 +5,7 @@ from typing import Optional, List, Dict, Any
 
 from game_logic.interactive_objects import BossSprite
 from algorithms.boss_battle_solver import optimize_boss_fight
+from algorithms.result_cache import cached_call
 import config as cfg
 
 
@@ -35,9 +36,10 @@ class BattleManager:
         self.current_boss_idx = 0
         self.projectiles = arcade.SpriteList()
 
-    def setup_battle(self, boss_data: BossSprite):
+    def setup_battle(self, boss_data: BossSprite, solution: Optional[tuple] = None):
         """
         准备战斗UI和数据。
+        solution 为后台预先求得的 (技能序列, 错误信息)，为 None 时在此同步求解。
         返回战斗需要的总回合数。
         """
         print("BattleManager: Setting up battle...")
@@ -61,7 +63,9 @@ class BattleManager:
         
         # --- 调用算法 ---
         input_data = {"B": self.boss_hps, "PlayerSkills": skills}
-        sequence, error = optimize_boss_fight(input_data)
+        if solution is None:
+            solution = cached_call('optimize_boss_fight', optimize_boss_fight, input_data)
+        sequence, error = solution
         
         if error:
             self.battle_log.append(f"错误: {error}")
@@ -40,20 +40,32 @@ class PuzzleView(arcade.View):
             print(f"错误：无法加载视频 {cfg.PUZZLE_VIDEO_PATH}: {e}")
             self.is_video_done = True # 如果视频加载失败，直接跳过
 
-        # --- AI自动解谜 ---
+        # --- AI自动解谜 (在后台进程中进行，视频播放期间求解) ---
         self.password = None
         self.attempts = 0
+        self.is_solving = False
+        self.puzzle_job = None
         self.solve_puzzle()
 
     def solve_puzzle(self):
-        """调用解谜算法，处理结果"""
+        """调用解谜算法；游戏视图提供后台求解执行器时异步求解，否则同步求解"""
         print("开始自动解谜...")
         puzzle_data = {
             "C": self.puzzle_chest.puzzle_constraints,
             "L": self.puzzle_chest.puzzle_hash
         }
-        
-        result, attempts, method = solve_from_data(puzzle_data)
+
+        executor = getattr(self.game_view, "solver_executor", None)
+        if executor:
+            self.is_solving = True
+            self.puzzle_job = executor.submit('puzzle', puzzle_data)
+        else:
+            self._apply_puzzle_result(solve_from_data(puzzle_data))
+
+    def _apply_puzzle_result(self, solve_result):
+        """处理解谜结果"""
+        self.is_solving = False
+        result, attempts, method = solve_result
         
         self.attempts = attempts
         resource_penalty = max(0, self.attempts - 1)
@@ -79,6 +91,14 @@ class PuzzleView(arcade.View):
             self.video_player.pause()
 
     def on_update(self, delta_time: float):
+        if self.puzzle_job and self.puzzle_job.poll():
+            solve_result = self.puzzle_job.result()
+            if solve_result is None:
+                print(f"解谜任务未完成: {self.puzzle_job.error}")
+                solve_result = (None, 0, "None")
+            self.puzzle_job = None
+            self._apply_puzzle_result(solve_result)
+
         if self.video_player and self.video_player.source and not self.video_player.playing:
             self.is_video_done = True
             
@@ -112,7 +132,15 @@ class PuzzleView(arcade.View):
                          font_size=18,
                          anchor_x="center")
 
-        if self.password:
+        if self.is_solving:
+            arcade.draw_text("AI 正在解谜...",
+                             self.window.width / 2,
+                             self.window.height * 0.55,
+                             arcade.color.WHITE,
+                             font_size=30,
+                             font_name="SimHei",
+                             anchor_x="center")
+        elif self.password:
             resource_penalty = max(0, self.attempts - 1)
             arcade.draw_text(f"AI 已解出密码: {self.password}", 
                              self.window.width / 2, 
@@ -149,5 +177,5 @@ class PuzzleView(arcade.View):
                          anchor_x="center")
 
     def on_key_press(self, key, modifiers):
-        if key == arcade.key.ESCAPE:
+        if key == arcade.key.ESCAPE and not self.is_solving:
             self.window.show_view(self.game_view) 
\ No newline at end of file
@@ -0,0 +1,62 @@
+"""
+地标索引模块 - 记录起点、出口、宝箱、BOSS的位置和各类物品的数量，查询为 O(1)
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+import config as cfg
+
+# 被记录的格子类型 (墙壁和通路不计入)
+LANDMARK_TILES = (cfg.START, cfg.EXIT, cfg.LOCKER, cfg.BOSS, cfg.RESOURCE_NODE, cfg.TRAP)
+
+
+class LandmarkIndex:
+    """
+    迷宫地标的位置索引。
+
+    - 每种格子一个坐标字典 (当作有序集合使用)，数量即字典长度
+    - 同类格子只有一个时 (起点、出口通常如此) first() 直接返回；有多个时返回按行优先顺序的第一个，
+      与逐格扫描的结果一致
+    坐标使用 (x, y)，与 Maze 的接口一致。
+
+    Args:
+        tiles (Iterable): 初始的 (x, y, 格子类型)，类型不在 LANDMARK_TILES 中的会被忽略。
+    """
+
+    def __init__(self, tiles: Iterable[Tuple[int, int, str]]):
+        self._positions: Dict[str, Dict[Tuple[int, int], None]] = {tile: {} for tile in LANDMARK_TILES}
+        for x, y, tile_type in tiles:
+            positions = self._positions.get(tile_type)
+            if positions is not None:
+                positions[(x, y)] = None
+
+    def on_tile_changed(self, x: int, y: int, old_type: str, new_type: str) -> None:
+        """由 Maze.set_tile_type 调用，保持索引与网格一致"""
+        if old_type == new_type:
+            return
+        old_positions = self._positions.get(old_type)
+        if old_positions is not None:
+            old_positions.pop((x, y), None)
+        new_positions = self._positions.get(new_type)
+        if new_positions is not None:
+            new_positions[(x, y)] = None
+
+    def first(self, tile_type: str) -> Optional[Tuple[int, int]]:
+        """按行优先顺序的第一个 tile_type 格子，没有时返回 None"""
+        positions = self._positions.get(tile_type)
+        if not positions:
+            return None
+        if len(positions) == 1:
+            return next(iter(positions))
+        return min(positions, key=lambda position: (position[1], position[0]))
+
+    def positions(self, tile_type: str) -> List[Tuple[int, int]]:
+        """所有 tile_type 格子的坐标，按行优先顺序"""
+        return sorted(self._positions.get(tile_type, ()), key=lambda position: (position[1], position[0]))
+
+    def count(self, tile_type: str) -> int:
+        """tile_type 格子的数量"""
+        return len(self._positions.get(tile_type, ()))
+
+    def counts(self) -> Dict[str, int]:
+        """各类地标的数量"""
+        return {tile: len(positions) for tile, positions in self._positions.items()}
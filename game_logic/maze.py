@@ -3,25 +3,177 @@
 """
 
 import random
-from typing import List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional, Union
+import numpy as np
 import config as cfg
-from algorithms.maze_generator import generate_recursive_division_maze
+from algorithms.connectivity import label_components
+from algorithms.hpa import HierarchicalPathfinder
+from algorithms.junction_graph import JunctionGraph
+from algorithms.maze_generator import (PATH_CODE, WALL_CODE, generate_recursive_division_array,
+                                       generate_recursive_division_maze)
+from game_logic.landmarks import LandmarkIndex
+from game_logic.navigation import NavigationField
+from game_logic.spatial_index import ItemSpatialIndex
+
+
+# uint8 存储方式的符号编码 (通路和墙与 maze_generator 的编码一致)
+TILE_CODES: Dict[str, int] = {
+    cfg.PATH: PATH_CODE,
+    cfg.WALL: WALL_CODE,
+    cfg.START: 2,
+    cfg.EXIT: 3,
+    cfg.RESOURCE_NODE: 4,
+    cfg.TRAP: 5,
+    cfg.LOCKER: 6,
+    cfg.BOSS: 7,
+}
+
+BACKENDS = ('list', 'uint8')
 
 
 class Maze:
-    """迷宫数据模型类，负责迷宫生成和物品放置"""
+    """
+    迷宫数据模型类，负责迷宫生成和物品放置
+
+    backend 选择网格的存储方式:
+    - 'list' (默认): grid 为字符列表 (list of list of str)
+    - 'uint8': 存为 NumPy uint8 编码数组 (TILE_CODES)，codes 为零拷贝的只读视图；
+      grid 只在旧代码访问时才生成一次字符列表，之后随 set_tile_type 同步更新
+    get_tile_type / set_tile_type / is_wall / clear_tile 在两种方式下行为相同。
+
+    use_generated=True 时生成迷宫后立即放置物品并校验可解，不可解则重新生成，
+    cfg.MAZE_GENERATION_ATTEMPTS 次都失败时抛出 ValueError。
+    """
     
-    def __init__(self, width: int, height: int, use_generated: bool ):
+    def __init__(self, width: int, height: int, use_generated: bool, backend: str = cfg.MAZE_BACKEND):
         """初始化迷宫"""
         self.width = width
         self.height = height
+        self._init_storage(backend)
         
-        if use_generated:
-            self.grid = self._generate_maze()
-        else:
-            self.grid = self._get_preset_map()
+        if not use_generated:
+            self._store(self._get_preset_map())
+            self._reset_derived()
+            return
         
-        #self._place_game_items()
+        # 生成的迷宫随机放置物品；布局不可解 (例如迷宫太小放不下必需的物品) 时重新生成
+        for _ in range(max(1, cfg.MAZE_GENERATION_ATTEMPTS)):
+            if backend == 'uint8':
+                self._codes = generate_recursive_division_array(width, height)
+            else:
+                self._grid = self._generate_maze()
+            self._reset_derived()
+            if self._place_game_items():
+                return
+        raise ValueError(f"无法生成可解的 {width}x{height} 迷宫 (已尝试 {cfg.MAZE_GENERATION_ATTEMPTS} 次)")
+    
+    def _reset_derived(self) -> None:
+        """清空由网格派生的缓存结构 (寻路图、索引等) 和监听器"""
+        self._junction_graph: Optional[JunctionGraph] = None
+        self._hierarchy: Optional[HierarchicalPathfinder] = None
+        self._navigation: Optional[NavigationField] = None
+        self._item_index: Optional[ItemSpatialIndex] = None
+        self._landmarks: Optional[LandmarkIndex] = None
+        self._tile_listeners: List[Callable[[int, int, str, str], None]] = []
+        # 每次 set_tile_type 加一，使用方可据此判断自己的缓存是否过期
+        self.version = 0
+    
+    @classmethod
+    def from_grid(cls, grid: Union[List[List[str]], np.ndarray], backend: str = cfg.MAZE_BACKEND) -> "Maze":
+        """
+        用已有的网格 (会复制一份) 构造迷宫，不重新生成。
+        grid 可以是字符列表，也可以是 TILE_CODES 编码的 uint8 数组 (例如生成器的 *_array 结果)。
+        """
+        maze = cls.__new__(cls)
+        maze.height = len(grid)
+        maze.width = len(grid[0]) if len(grid) else 0
+        maze._init_storage(backend)
+        if isinstance(grid, np.ndarray):
+            maze._store_codes(grid)
+        else:
+            maze._store([row[:] for row in grid])
+        maze._reset_derived()
+        return maze
+    
+    def _init_storage(self, backend: str) -> None:
+        if backend not in BACKENDS:
+            raise ValueError(f"未知的迷宫存储方式: {backend}")
+        self.backend = backend
+        self._grid: Optional[List[List[str]]] = None
+        self._codes: Optional[np.ndarray] = None
+        # 每个迷宫一份编码表，遇到表外的符号时追加新编码
+        self._tile_codes = dict(TILE_CODES)
+        self._tile_symbols = [None] * len(self._tile_codes)
+        for symbol, code in self._tile_codes.items():
+            self._tile_symbols[code] = symbol
+    
+    def _encode(self, symbol: str) -> int:
+        code = self._tile_codes.get(symbol)
+        if code is None:
+            if len(self._tile_symbols) > 255:
+                raise ValueError(f"uint8 网格最多支持 256 种符号: {symbol!r}")
+            code = len(self._tile_symbols)
+            self._tile_codes[symbol] = code
+            self._tile_symbols.append(symbol)
+        return code
+    
+    def _encode_grid(self, grid: List[List[str]]) -> np.ndarray:
+        symbols, inverse = np.unique(np.array(grid), return_inverse=True)
+        lookup = np.array([self._encode(str(symbol)) for symbol in symbols], dtype=np.uint8)
+        return lookup[inverse].reshape(self.height, self.width)
+    
+    def _decode_codes(self, codes: np.ndarray) -> List[List[str]]:
+        return np.array(self._tile_symbols, dtype=object)[codes].tolist()
+    
+    def _store(self, grid: List[List[str]]) -> None:
+        """按存储方式保存字符网格"""
+        if self.backend == 'uint8':
+            self._codes = self._encode_grid(grid)
+        else:
+            self._grid = grid
+    
+    def _store_codes(self, codes: np.ndarray) -> None:
+        """按存储方式保存编码数组"""
+        codes = np.array(codes, dtype=np.uint8)
+        if self.backend == 'uint8':
+            self._codes = codes
+        else:
+            self._grid = self._decode_codes(codes)
+    
+    @property
+    def grid(self) -> List[List[str]]:
+        """
+        字符网格 (list of list of str)。
+        uint8 方式下首次访问时生成，之后由 set_tile_type 同步；不要直接修改其中的格子。
+        """
+        if self._grid is None:
+            self._grid = self._decode_codes(self._codes)
+        return self._grid
+    
+    @property
+    def codes(self) -> np.ndarray:
+        """
+        TILE_CODES 编码的 (height, width) uint8 网格，供求解器向量化处理。
+        uint8 方式下是内部数组的只读视图 (零拷贝，随 set_tile_type 变化)；list 方式下每次新编码一份。
+        """
+        if self._codes is None:
+            return self._encode_grid(self._grid)
+        view = self._codes.view()
+        view.flags.writeable = False
+        return view
+    
+    def _special_tiles(self):
+        """所有既不是墙也不是通路的格子 (x, y, 类型)"""
+        if self._codes is not None:
+            rows, cols = np.nonzero(self._codes > WALL_CODE)
+            symbols = self._tile_symbols
+            for r, c, code in zip(rows.tolist(), cols.tolist(), self._codes[rows, cols].tolist()):
+                yield c, r, symbols[code]
+            return
+        for r, row in enumerate(self._grid):
+            for c, tile in enumerate(row):
+                if tile != cfg.PATH and tile != cfg.WALL:
+                    yield c, r, tile
     
     def _generate_maze(self) -> List[List[str]]:
         """使用算法生成迷宫"""
@@ -47,65 +199,177 @@ class Maze:
             ["#","#","#","#","#","#","#","#","#","E","#","#","#","#","#"]
         ]
     
-    def _place_game_items(self) -> None:
-        """在迷宫中放置游戏物品"""
-        # 获取所有可通行位置
-        path_coords = []
-        for r in range(self.height):
-            for c in range(self.width):
-                if self.grid[r][c] == cfg.PATH:
-                    path_coords.append((c, r))
-        
-        if not path_coords:
-            return
+    def _place_game_items(self) -> bool:
+        """
+        在迷宫中放置游戏物品，并保证布局可解:
+        1. 用 label_components 标记可通行格子的连通分量，物品只放在最大的分量中，
+           起点因此能到达出口、宝箱、BOSS和每一个物品
+        2. 候选空地用 NumPy 一次随机排列，依次接受与已放物品的切比雪夫距离不小于
+           cfg.ITEM_MIN_SPACING 的格子；出口优先选与起点曼哈顿距离不小于 (宽 + 高) / 3 的格子
+        3. 间距约束下放不完时逐步减小间距补齐，最后用 is_solvable 校验
+        金币、陷阱的数量规则与原来相同，只是按最大分量的空地数计算。
+        返回布局是否可解。
+        """
+        codes = self.codes
+        labels = label_components(codes != WALL_CODE)
+        free = codes == PATH_CODE
+        if not free.any():
+            return False
+        component = int(np.argmax(np.bincount(labels[free])))
+        rows, cols = np.nonzero(free & (labels == component))
+        order = np.random.default_rng(random.getrandbits(64)).permutation(len(rows))
+        rows, cols = rows[order], cols[order]
+        count = len(rows)
         
-        random.shuffle(path_coords)
-        
-        # 放置物品
+        # 放置顺序: 起点、出口、宝箱、BOSS 必不可少，先放
         items = [
             (cfg.START, 1),   # 起点
             (cfg.EXIT, 1),    # 终点
-            (cfg.RESOURCE_NODE, min(8, len(path_coords) // 4)),     # 金币
-            (cfg.TRAP, min(6, len(path_coords) // 5)),     # 陷阱
             (cfg.LOCKER, 1),  # 宝箱
             (cfg.BOSS, 1),    # BOSS
+            (cfg.RESOURCE_NODE, min(8, count // 4)),     # 金币
+            (cfg.TRAP, min(6, count // 5)),     # 陷阱
         ]
+        symbols = [symbol for symbol, item_count in items for _ in range(item_count)][:count]
+        
+        used = np.zeros(count, dtype=bool)
+        blocked = np.zeros(codes.shape, dtype=bool)
+        chosen = []
+        
+        def block(i: int, spacing: int) -> None:
+            r, c = int(rows[i]), int(cols[i])
+            blocked[max(0, r - spacing + 1):r + spacing, max(0, c - spacing + 1):c + spacing] = True
+        
+        def take(i: int, spacing: int) -> None:
+            used[i] = True
+            block(i, spacing)
+            chosen.append(i)
         
-        for item_symbol, count in items:
-            for _ in range(count):
-                if path_coords:
-                    x, y = path_coords.pop()
-                    self.grid[y][x] = item_symbol
+        # 起点和出口
+        spacing = max(1, cfg.ITEM_MIN_SPACING)
+        take(0, spacing)
+        if len(symbols) > 1:
+            distance = np.abs(rows - rows[0]) + np.abs(cols - cols[0])
+            far_enough = np.flatnonzero((distance >= (self.width + self.height) // 3) & ~blocked[rows, cols])
+            take(int(far_enough[0]) if len(far_enough) else int(np.argmax(np.where(used, -1, distance))), spacing)
+        
+        # 其余物品按随机顺序依次接受满足间距的格子 (blocked 只增不减，游标不必回退)；
+        # 放不完时把间距减一重新标记已放的物品后继续 (修复)，间距为 1 时只要求不重叠
+        while True:
+            cursor = 0
+            while len(chosen) < len(symbols):
+                while cursor < count and (used[cursor] or blocked[rows[cursor], cols[cursor]]):
+                    cursor += 1
+                if cursor == count:
+                    break
+                take(cursor, spacing)
+            if len(chosen) == len(symbols) or spacing == 1:
+                break
+            spacing -= 1
+            blocked[:] = False
+            for i in chosen:
+                block(i, spacing)
+        
+        for symbol, i in zip(symbols, chosen):
+            self.set_tile_type(int(cols[i]), int(rows[i]), symbol)
+        return self.is_solvable()
+    
+    def is_solvable(self) -> bool:
+        """起点和出口都存在，且出口、宝箱、BOSS和所有物品都与起点连通"""
+        start = self.landmarks.first(cfg.START)
+        if start is None or self.landmarks.first(cfg.EXIT) is None:
+            return False
+        codes = self.codes
+        labels = label_components(codes != WALL_CODE)
+        rows, cols = np.nonzero(codes > WALL_CODE)
+        return bool((labels[rows, cols] == labels[start[1], start[0]]).all())
     
     def get_start_position(self) -> Tuple[int, int]:
         """获取起始位置"""
-        for r in range(self.height):
-            for c in range(self.width):
-                if self.grid[r][c] == cfg.START:
-                    return (c, r)
+        position = self.landmarks.first(cfg.START)
+        if position is not None:
+            return position
         return (1, 1)  # 默认位置
     
     def get_exit_position(self) -> Optional[Tuple[int, int]]:
         """获取出口位置"""
-        for r in range(self.height):
-            for c in range(self.width):
-                if self.grid[r][c] == cfg.EXIT:
-                    return (c, r)
-        return None  # 如果没有找到出口
+        return self.landmarks.first(cfg.EXIT)  # 如果没有找到出口则为 None
     
     def get_tile_type(self, x: int, y: int) -> Optional[str]:
         """获取指定位置的瓦片类型"""
         if self.is_valid_position(x, y):
-            return self.grid[y][x]
+            if self._codes is not None:
+                return self._tile_symbols[self._codes[y, x]]
+            return self._grid[y][x]
         return None
     
     def set_tile_type(self, x: int, y: int, tile_type: str) -> bool:
         """设置指定位置的类型"""
         if self.is_valid_position(x, y):
-            self.grid[y][x] = tile_type
+            old_type = self.get_tile_type(x, y)
+            if self._codes is not None:
+                self._codes[y, x] = self._encode(tile_type)
+            if self._grid is not None:
+                self._grid[y][x] = tile_type
+            self.version += 1
+            if self._landmarks is not None:
+                self._landmarks.on_tile_changed(x, y, old_type, tile_type)
+            if self._junction_graph is not None:
+                self._junction_graph.on_tile_changed(y, x, old_type, tile_type)
+            if self._hierarchy is not None:
+                self._hierarchy.on_tile_changed(y, x, old_type, tile_type)
+            if self._navigation is not None:
+                self._navigation.on_tile_changed(y, x, old_type, tile_type)
+            if self._item_index is not None:
+                self._item_index.on_tile_changed(y, x, old_type, tile_type)
+            for listener in self._tile_listeners:
+                listener(x, y, old_type, tile_type)
             return True
         return False
     
+    def add_tile_listener(self, listener: Callable[[int, int, str, str], None]) -> None:
+        """注册格子变化监听器，每次 set_tile_type 后以 (x, y, 旧类型, 新类型) 调用"""
+        self._tile_listeners.append(listener)
+    
+    @property
+    def navigation(self) -> NavigationField:
+        """
+        到出口和各物品的 BFS 距离场，首次访问时创建，之后随 set_tile_type 增量更新。
+        不使用通道收缩图 (墙壁变化时整图重建代价较高)；需要时自行构造
+        NavigationField(maze.grid, junction_graph=maze.junction_graph)。
+        """
+        if self._navigation is None:
+            self._navigation = NavigationField(self.grid)
+        return self._navigation
+    
+    @property
+    def junction_graph(self) -> JunctionGraph:
+        """通道收缩图 (路口、死路和特殊格子为节点)，首次访问时创建，之后随 set_tile_type 增量更新"""
+        if self._junction_graph is None:
+            self._junction_graph = JunctionGraph(self.grid)
+        return self._junction_graph
+    
+    @property
+    def hierarchy(self) -> HierarchicalPathfinder:
+        """分层寻路 (HPA*) 的簇和入口，首次访问时创建；墙壁变化只让涉及的簇在下次查询时重算"""
+        if self._hierarchy is None:
+            self._hierarchy = HierarchicalPathfinder(self.grid, cluster_size=cfg.HPA_CLUSTER_SIZE)
+        return self._hierarchy
+    
+    @property
+    def landmarks(self) -> LandmarkIndex:
+        """起点、出口、宝箱、BOSS的位置和各类物品数量，首次访问时建立，之后随 set_tile_type 增量更新"""
+        if self._landmarks is None:
+            self._landmarks = LandmarkIndex(self._special_tiles())
+        return self._landmarks
+    
+    @property
+    def item_index(self) -> ItemSpatialIndex:
+        """物品空间索引，首次访问时创建，之后随 set_tile_type 增量更新"""
+        if self._item_index is None:
+            self._item_index = ItemSpatialIndex(self.grid)
+        return self._item_index
+    
     def is_valid_position(self, x: int, y: int) -> bool:
         """检查坐标是否有效"""
         return 0 <= x < self.width and 0 <= y < self.height
@@ -118,4 +382,6 @@ class Maze:
         """检查是否为墙壁"""
         if not self.is_valid_position(x, y):
             return True
-        return self.grid[y][x] == cfg.WALL
\ No newline at end of file
+        if self._codes is not None:
+            return bool(self._codes[y, x] == WALL_CODE)
+        return self._grid[y][x] == cfg.WALL
\ No newline at end of file
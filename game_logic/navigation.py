@@ -0,0 +1,216 @@
+"""
+导航场模块 - 迷宫持有的 BFS 距离场，供 AI 每帧 O(1) 查询下一步
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+import numpy as np
+import config as cfg
+
+UNREACHABLE = -1
+
+# 批量查询的目标: 单个格子 (行, 列)，或一组格子 (走向其中最近的一个，例如一簇物品)
+Target = Union[Tuple[int, int], Iterable[Tuple[int, int]]]
+
+# 与 next_step 相同的邻居顺序: 上、下、左、右
+_DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+class NavigationField:
+    """
+    到出口及各物品的 BFS 距离场 (扁平列表，下标 r * width + c)。
+
+    - 每个目标的距离场在第一次查询时用一次 BFS 建立，之后保留
+    - 金币、陷阱、宝箱等格子的变化不影响可通行性，距离场保持有效；
+      目标格本身被清除时只丢弃该目标的距离场
+    - 墙壁变化时丢弃全部距离场，下次查询时重建
+    传入 junction_graph (JunctionGraph) 时，距离场在通道收缩图上求出节点距离后
+    再沿通道填充，而不是逐格 BFS。
+    这样 next_step 只需比较当前格四个邻居的距离，与迷宫大小无关。
+
+    多个代理共享同一迷宫时使用 next_steps: 每个目标 (或一组目标格) 用 NumPy
+    计算一张流场 (每格下一步的扁平下标)，所有代理的下一步由一次向量化索引得到。
+    坐标统一使用 (行, 列)。
+    """
+
+    def __init__(self, grid: List[List[str]], junction_graph=None):
+        self.grid = grid
+        self.junction_graph = junction_graph
+        self.height = len(grid)
+        self.width = len(grid[0]) if grid else 0
+        self.stats = {'builds': 0, 'queries': 0}
+        self._fields: Dict[Tuple[int, int], List[int]] = {}
+        self._flows: Dict[Tuple[Tuple[int, int], ...], np.ndarray] = {}
+        self._passable: Optional[np.ndarray] = None
+
+    def on_tile_changed(self, r: int, c: int, old_type: str, new_type: str) -> None:
+        """由 Maze.set_tile_type 调用，按变化类型更新或丢弃距离场"""
+        if old_type == new_type:
+            return
+        if (old_type == cfg.WALL) != (new_type == cfg.WALL):
+            self._fields.clear()
+            self._flows.clear()
+            self._passable = None
+        else:
+            self._fields.pop((r, c), None)
+            for key in [key for key in self._flows if (r, c) in key]:
+                del self._flows[key]
+
+    def _field(self, target: Tuple[int, int]) -> Optional[List[int]]:
+        field = self._fields.get(target)
+        if field is None:
+            field = self._build(target)
+            if field is not None:
+                self._fields[target] = field
+        return field
+
+    def _build(self, target: Tuple[int, int]) -> Optional[List[int]]:
+        """从目标格出发做一次 BFS，得到所有格子到目标的步数"""
+        width, height, grid = self.width, self.height, self.grid
+        tr, tc = target
+        if not (0 <= tr < height and 0 <= tc < width) or grid[tr][tc] == cfg.WALL:
+            return None
+
+        self.stats['builds'] += 1
+        if self.junction_graph is not None:
+            return self.junction_graph.distance_field(target)
+        dist = [UNREACHABLE] * (width * height)
+        dist[tr * width + tc] = 0
+        frontier = deque([(tr, tc)])
+        while frontier:
+            r, c = frontier.popleft()
+            next_dist = dist[r * width + c] + 1
+            for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+                if 0 <= nr < height and 0 <= nc < width:
+                    index = nr * width + nc
+                    if dist[index] == UNREACHABLE and grid[nr][nc] != cfg.WALL:
+                        dist[index] = next_dist
+                        frontier.append((nr, nc))
+        return dist
+
+    def prepare(self, target: Tuple[int, int]) -> None:
+        """预先建立 target 的距离场 (供调度器在空闲帧中提前计算)"""
+        self._field(target)
+
+    def distance(self, cell: Tuple[int, int], target: Tuple[int, int]) -> int:
+        """cell 到 target 的最短步数，不可达时返回 -1"""
+        field = self._field(target)
+        r, c = cell
+        if field is None or not (0 <= r < self.height and 0 <= c < self.width):
+            return UNREACHABLE
+        return field[r * self.width + c]
+
+    def next_step(self, cell: Tuple[int, int], target: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """
+        从 cell 沿最短路向 target 走一步后所在的格子。
+        已在目标上或不可达时返回 None。
+        """
+        self.stats['queries'] += 1
+        field = self._field(target)
+        r, c = cell
+        width = self.width
+        if field is None or not (0 <= r < self.height and 0 <= c < width):
+            return None
+        current = field[r * width + c]
+        if current <= 0:
+            return None
+        for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+            if 0 <= nr < self.height and 0 <= nc < width and field[nr * width + nc] == current - 1:
+                return (nr, nc)
+        return None
+
+    def path(self, cell: Tuple[int, int], target: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """沿距离场下降得到的完整最短路径 (含起点和终点)，不可达时返回空列表"""
+        if self.distance(cell, target) == UNREACHABLE:
+            return []
+        path = [cell]
+        step = self.next_step(cell, target)
+        while step is not None:
+            path.append(step)
+            step = self.next_step(step, target)
+        return path
+
+    @staticmethod
+    def _flow_key(target: Target) -> Tuple[Tuple[int, int], ...]:
+        if len(target) == 2 and all(isinstance(v, (int, np.integer)) for v in target):
+            return (tuple(target),)
+        return tuple(sorted(set(tuple(cell) for cell in target)))
+
+    def _flow(self, key: Tuple[Tuple[int, int], ...]) -> np.ndarray:
+        flow = self._flows.get(key)
+        if flow is None:
+            flow = self._build_flow(key)
+            self._flows[key] = flow
+        return flow
+
+    def _build_flow(self, sources: Tuple[Tuple[int, int], ...]) -> np.ndarray:
+        """
+        以 sources 为起点做一次整图波前扩展 (多源 BFS)，再为每格选出距离减一的邻居。
+        返回扁平的下一步下标数组；目标格、不可达格和墙壁指向自身。
+        """
+        height, width = self.height, self.width
+        if self._passable is None:
+            self._passable = np.array(self.grid) != cfg.WALL
+        passable = self._passable
+        self.stats['builds'] += 1
+
+        dist = np.full((height, width), UNREACHABLE, dtype=np.int32)
+        frontier = np.zeros((height, width), dtype=bool)
+        for r, c in sources:
+            if 0 <= r < height and 0 <= c < width and passable[r, c]:
+                frontier[r, c] = True
+        distance = 0
+        while frontier.any():
+            dist[frontier] = distance
+            grown = np.zeros_like(frontier)
+            grown[1:, :] |= frontier[:-1, :]
+            grown[:-1, :] |= frontier[1:, :]
+            grown[:, 1:] |= frontier[:, :-1]
+            grown[:, :-1] |= frontier[:, 1:]
+            frontier = grown & passable & (dist == UNREACHABLE)
+            distance += 1
+
+        # 四周补一圈不可达，邻居距离可以直接切片得到
+        padded = np.full((height + 2, width + 2), UNREACHABLE, dtype=np.int32)
+        padded[1:-1, 1:-1] = dist
+        flat = np.arange(height * width, dtype=np.int64).reshape(height, width)
+        flow = flat.copy()
+        unresolved = dist > 0
+        for dr, dc in _DIRECTIONS:
+            neighbour = padded[1 + dr:1 + dr + height, 1 + dc:1 + dc + width]
+            chosen = unresolved & (neighbour == dist - 1)
+            flow[chosen] = flat[chosen] + dr * width + dc
+            unresolved &= ~chosen
+        return flow.ravel()
+
+    def next_steps(self, cells, targets: Sequence[Target],
+                   target_ids: Optional[Sequence[int]] = None) -> np.ndarray:
+        """
+        批量查询多个代理的下一步。
+
+        Args:
+            cells (array-like): 形如 (N, 2) 的代理坐标 (行, 列)。
+            targets (Sequence): 目标列表，每项是一个格子或一组格子 (走向最近的一个)。
+            target_ids (Sequence[int] | None): 每个代理使用 targets 中的第几个目标，
+                   None 表示全部使用第 0 个。
+
+        Returns:
+            np.ndarray: 形如 (N, 2) 的下一步坐标；已在目标上、不可达、在墙上或越界的代理保持原地。
+        """
+        cells = np.asarray(cells, dtype=np.int64).reshape(-1, 2)
+        # 越界的坐标不能直接算扁平下标 (负数或超出列数会落到别的格子上)，先指向 0 号格再还原
+        inside = ((cells[:, 0] >= 0) & (cells[:, 0] < self.height)
+                  & (cells[:, 1] >= 0) & (cells[:, 1] < self.width))
+        index = np.where(inside, cells[:, 0] * self.width + cells[:, 1], 0)
+        if target_ids is None or len(targets) == 1:
+            next_index = self._flow(self._flow_key(targets[0]))[index]
+        else:
+            # 按目标分组取值，只读取被用到的流场，不复制整张 (目标数, H*W) 的数组
+            target_ids = np.asarray(target_ids, dtype=np.int64)
+            next_index = np.empty_like(index)
+            for target_id in np.unique(target_ids):
+                chosen = target_ids == target_id
+                next_index[chosen] = self._flow(self._flow_key(targets[target_id]))[index[chosen]]
+        # 墙壁格在流场中指向自身，越界的代理在这里保持原地
+        steps = np.stack((next_index // self.width, next_index % self.width), axis=1)
+        return np.where(inside[:, None], steps, cells)
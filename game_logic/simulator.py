@@ -0,0 +1,198 @@
+"""
+无界面 AI 仿真模块 - 不打开窗口，按格子推进 AIAgent，批量评估不同的贪心视野
+
+一个回合 (episode) 的规则与游戏内一致:
+- 金币、陷阱由 Player.handle_interaction 结算
+- 宝箱调用解谜求解器，按尝试次数扣除资源 (与 PuzzleView 相同)
+- BOSS调用BOSS战求解器，按回合数扣除资源 (与 MazeGame.end_battle 相同)
+- 到达出口、无路可走、超过步数上限或长时间没有进展时结束
+  (视野较大时贪心 AI 可能在两个同分目标之间来回走而不拾取任何东西，
+  连续 stall_steps 步迷宫没有变化即判定为停滞)，结束原因记录在 end_reason 中
+多个回合通过 ProcessPoolExecutor 并行运行。
+"""
+
+import contextlib
+import io
+import json
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional
+import config as cfg
+from algorithms.boss_battle_solver import optimize_boss_fight
+from algorithms.puzzle_solver import solve_from_data
+from algorithms.result_cache import ResultCache, cached_call
+from game_logic.ai_agent import AIAgent
+from game_logic.maze import Maze
+from game_logic.player import Player
+
+# 与 interactive_objects 中宝箱、BOSS 的默认数据一致
+DEFAULT_ENCOUNTER_DATA = {
+    "B": [150, 200],
+    "PlayerSkills": [[20, 2], [50, 5], [10, 0]],
+    "C": [[-1, -1], [1, 0]],
+    "L": "c1606491763321ac3149620026e9532c524354247883204950529454845b42d7",
+}
+
+# 每个进程内只在内存中缓存BOSS战的解，同一份数据只求解一次 (解谜含随机步骤，每次重新求解)
+_solver_cache = ResultCache(path=None)
+
+
+def load_encounter_data() -> Dict:
+    """读取 test.json 中的BOSS和谜题数据，缺失时使用默认值"""
+    data = dict(DEFAULT_ENCOUNTER_DATA)
+    try:
+        with open(cfg.PROJECT_ROOT / "test.json", "r", encoding="utf-8") as f:
+            loaded = json.load(f)
+        data.update({key: loaded[key] for key in DEFAULT_ENCOUNTER_DATA if key in loaded})
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"警告: 无法读取 test.json: {e}，使用默认BOSS和谜题数据")
+    return data
+
+
+def generate_episode_grid(width: int, height: int, seed: int) -> List[List[str]]:
+    """按种子生成迷宫并放置起点、出口、金币、陷阱、宝箱和BOSS"""
+    random.seed(seed)
+    return Maze(width, height, use_generated=True).grid
+
+
+def simulate_episode(grid: List[List[str]], vision_radius: int = cfg.AI_VISION_RADIUS,
+                     encounter_data: Optional[Dict] = None, max_steps: Optional[int] = None,
+                     stall_steps: Optional[int] = None) -> Dict:
+    """
+    在 grid 上从起点开始运行一个回合。
+
+    Args:
+        grid (list): 迷宫网格 (不会被修改)。
+        vision_radius (int): AI 贪心视野半径。
+        encounter_data (dict | None): BOSS和谜题数据 (B / PlayerSkills / C / L)，None 时读取 test.json。
+        max_steps (int | None): 步数上限，默认为格子总数的 4 倍。
+        stall_steps (int | None): 连续这么多步没有拾取或清除任何格子 (迷宫版本号不变) 时
+                   判定为停滞并结束，默认为格子总数 (足够走到任意可达的格子)。
+
+    Returns:
+        dict: resources (最终资源)、steps (行走步数)、reached_exit (是否到达出口)、
+              end_reason (结束原因: 'exit' 到达出口、'max_steps' 达到步数上限、
+              'stalled' 停滞、'no_route' 没有出口或无路可走)、wall_time (耗时，秒)。
+    """
+    started = time.perf_counter()
+    if encounter_data is None:
+        encounter_data = load_encounter_data()
+    maze = Maze.from_grid(grid)
+    if max_steps is None:
+        max_steps = maze.width * maze.height * 4
+    if stall_steps is None:
+        stall_steps = maze.width * maze.height
+    start_x, start_y = maze.get_start_position()
+    player = Player(start_x, start_y, maze)
+    agent = AIAgent()
+    navigation = maze.navigation
+    item_index = maze.item_index
+
+    steps = 0
+    reached_exit = False
+    end_reason = 'max_steps'
+    # 最近一次迷宫发生变化 (拾取金币、踩陷阱、打开宝箱等) 时的版本号和步数
+    last_version, last_progress = maze.version, 0
+    # 屏蔽玩家、AI 和求解器的逐步打印
+    with contextlib.redirect_stdout(io.StringIO()):
+        while steps < max_steps:
+            if maze.version != last_version:
+                last_version, last_progress = maze.version, steps
+            elif steps - last_progress >= stall_steps:
+                end_reason = 'stalled'
+                break
+            current = player.get_grid_position()
+            target = agent.decide_next_target(current, maze.grid, item_index=item_index,
+                                              vision_radius=vision_radius)
+            if target is None:
+                exit_position = maze.get_exit_position()
+                if exit_position is None:
+                    end_reason = 'no_route'
+                    break
+                target = (exit_position[1], exit_position[0])
+            next_cell = navigation.next_step(current, target)
+            if next_cell is None:
+                end_reason = 'no_route'
+                break
+
+            player.set_grid_position(next_cell[1], next_cell[0])
+            steps += 1
+            interaction = player.handle_interaction()
+            if interaction == cfg.LOCKER:
+                puzzle = {"C": encounter_data["C"], "L": encounter_data["L"]}
+                _, attempts, _ = solve_from_data(puzzle)
+                player.deduct_resources(max(0, attempts - 1))
+                maze.clear_tile(player.grid_x, player.grid_y)
+            elif interaction == cfg.BOSS:
+                battle = {"B": list(encounter_data["B"]), "PlayerSkills": encounter_data["PlayerSkills"]}
+                sequence, error = cached_call('optimize_boss_fight', optimize_boss_fight, battle,
+                                              cache=_solver_cache)
+                if not error:
+                    player.deduct_resources(len(sequence))
+                maze.clear_tile(player.grid_x, player.grid_y)
+            elif interaction == cfg.EXIT:
+                reached_exit = True
+                end_reason = 'exit'
+                break
+
+    return {
+        'resources': player.resources,
+        'steps': steps,
+        'reached_exit': reached_exit,
+        'end_reason': end_reason,
+        'wall_time': time.perf_counter() - started,
+    }
+
+
+def _run_episode(task):
+    seed, width, height, vision_radius, encounter_data = task
+    result = simulate_episode(generate_episode_grid(width, height, seed), vision_radius, encounter_data)
+    result['seed'] = seed
+    result['vision_radius'] = vision_radius
+    return result
+
+
+def run_episodes(seeds: Iterable[int], vision_radii: Iterable[int] = (cfg.AI_VISION_RADIUS,),
+                 width: int = cfg.MAZE_WIDTH, height: int = cfg.MAZE_HEIGHT,
+                 workers: Optional[int] = None) -> List[Dict]:
+    """
+    对每个 (种子, 视野半径) 组合运行一个回合，同一种子在不同视野下使用同一张迷宫。
+
+    Args:
+        workers (int | None): 进程数，None 为 CPU 核数；0 表示在当前进程中顺序运行。
+
+    Returns:
+        list: simulate_episode 的结果，附带 seed 和 vision_radius。
+    """
+    encounter_data = load_encounter_data()
+    tasks = [(seed, width, height, radius, encounter_data) for radius in vision_radii for seed in seeds]
+    if workers == 0:
+        return [_run_episode(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_run_episode, tasks, chunksize=max(1, len(tasks) // 64)))
+
+
+def summarize(results: List[Dict]) -> Dict[int, Dict]:
+    """
+    按视野半径汇总平均资源、平均步数、到达出口比例和平均耗时。
+    未到达出口的回合按结束原因分别计数: timeouts (达到步数上限)、stalls (停滞)、no_route (无路可走)，
+    这些回合的资源和步数也计入平均值。
+    """
+    groups: Dict[int, List[Dict]] = {}
+    for result in results:
+        groups.setdefault(result['vision_radius'], []).append(result)
+    summary = {}
+    for radius, group in sorted(groups.items()):
+        count = len(group)
+        summary[radius] = {
+            'episodes': count,
+            'mean_resources': sum(r['resources'] for r in group) / count,
+            'mean_steps': sum(r['steps'] for r in group) / count,
+            'exit_rate': sum(1 for r in group if r['reached_exit']) / count,
+            'timeouts': sum(1 for r in group if r['end_reason'] == 'max_steps'),
+            'stalls': sum(1 for r in group if r['end_reason'] == 'stalled'),
+            'no_route': sum(1 for r in group if r['end_reason'] == 'no_route'),
+            'mean_wall_time': sum(r['wall_time'] for r in group) / count,
+        }
+    return summary
@@ -0,0 +1,131 @@
+"""
+物品空间索引模块 - 按类型和粗粒度分桶记录迷宫中的物品坐标
+"""
+
+import heapq
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import config as cfg
+
+# 被索引的格子类型 (墙壁、通路、起点、终点不计入)
+INDEXED_TILES = (cfg.RESOURCE_NODE, cfg.TRAP, cfg.LOCKER, cfg.BOSS)
+
+
+class ItemSpatialIndex:
+    """
+    迷宫物品的空间索引。
+
+    - 每种物品一个坐标集合，可直接枚举某类物品
+    - 另有 bucket_size × bucket_size 的分桶网格，半径查询和 k 近邻查询
+      只访问覆盖范围内的桶，开销与附近的物品数量成正比，与迷宫大小无关
+    坐标统一使用 (行, 列)；距离使用切比雪夫距离 (与 AI 的方形视野一致)。
+    """
+
+    def __init__(self, grid: List[List[str]], bucket_size: int = cfg.ITEM_INDEX_BUCKET_SIZE):
+        self.bucket_size = max(1, bucket_size)
+        self.height = len(grid)
+        self.width = len(grid[0]) if grid else 0
+        self.by_type: Dict[str, Set[Tuple[int, int]]] = {tile: set() for tile in INDEXED_TILES}
+        self._types: Dict[Tuple[int, int], str] = {}
+        self._buckets: Dict[Tuple[int, int], Set[Tuple[int, int]]] = {}
+        for r, row in enumerate(grid):
+            for c, tile in enumerate(row):
+                if tile in self.by_type:
+                    self._add(r, c, tile)
+
+    def __len__(self) -> int:
+        return len(self._types)
+
+    def _bucket_of(self, r: int, c: int) -> Tuple[int, int]:
+        return (r // self.bucket_size, c // self.bucket_size)
+
+    def _add(self, r: int, c: int, tile_type: str) -> None:
+        cell = (r, c)
+        self._types[cell] = tile_type
+        self.by_type[tile_type].add(cell)
+        self._buckets.setdefault(self._bucket_of(r, c), set()).add(cell)
+
+    def _remove(self, r: int, c: int) -> None:
+        cell = (r, c)
+        tile_type = self._types.pop(cell, None)
+        if tile_type is None:
+            return
+        self.by_type[tile_type].discard(cell)
+        bucket_key = self._bucket_of(r, c)
+        bucket = self._buckets[bucket_key]
+        bucket.discard(cell)
+        if not bucket:
+            del self._buckets[bucket_key]
+
+    def on_tile_changed(self, r: int, c: int, old_type: str, new_type: str) -> None:
+        """由 Maze.set_tile_type 调用，保持索引与网格一致"""
+        if old_type == new_type:
+            return
+        if old_type in self.by_type:
+            self._remove(r, c)
+        if new_type in self.by_type:
+            self._add(r, c, new_type)
+
+    def tile_at(self, cell: Tuple[int, int]) -> Optional[str]:
+        """cell 上的物品类型，不是物品时返回 None"""
+        return self._types.get(cell)
+
+    def _wanted(self, types: Optional[Iterable[str]]) -> Optional[Set[str]]:
+        return None if types is None else set(types)
+
+    def within(self, center: Tuple[int, int], radius: int,
+               types: Optional[Iterable[str]] = None) -> List[Tuple[int, int]]:
+        """
+        与 center 的切比雪夫距离不超过 radius 的物品坐标 (按行、列排序)。
+
+        Args:
+            center (tuple): 查询中心 (行, 列)。
+            radius (int): 查询半径，1 即 3×3 视野。
+            types (Iterable[str] | None): 只返回这些类型的物品，None 表示全部。
+        """
+        wanted = self._wanted(types)
+        cr, cc = center
+        size = self.bucket_size
+        found = []
+        for br in range((cr - radius) // size, (cr + radius) // size + 1):
+            for bc in range((cc - radius) // size, (cc + radius) // size + 1):
+                for cell in self._buckets.get((br, bc), ()):
+                    if (abs(cell[0] - cr) <= radius and abs(cell[1] - cc) <= radius
+                            and (wanted is None or self._types[cell] in wanted)):
+                        found.append(cell)
+        found.sort()
+        return found
+
+    def nearest(self, center: Tuple[int, int], k: int = 1,
+                types: Optional[Iterable[str]] = None) -> List[Tuple[int, int]]:
+        """
+        距 center 最近的 k 个物品 (切比雪夫距离，同距离按行、列排序)。
+
+        以 center 所在的桶为中心逐圈向外扩展；当已找到 k 个且下一圈的桶
+        不可能包含更近的物品时停止。
+        """
+        if k <= 0 or not self._types:
+            return []
+        wanted = self._wanted(types)
+        cr, cc = center
+        size = self.bucket_size
+        center_br, center_bc = self._bucket_of(cr, cc)
+        max_ring = max(self.height, self.width) // size + 1
+        candidates = []  # 最大堆 (取负)，保留当前最近的 k 个
+        for ring in range(max_ring + 1):
+            if len(candidates) == k:
+                # 第 ring 圈的桶与 center 的距离至少为 (ring - 1) * size + 1
+                if -candidates[0][0] < (ring - 1) * size + 1:
+                    break
+            for br in range(center_br - ring, center_br + ring + 1):
+                for bc in range(center_bc - ring, center_bc + ring + 1):
+                    if max(abs(br - center_br), abs(bc - center_bc)) != ring:
+                        continue
+                    for cell in self._buckets.get((br, bc), ()):
+                        if wanted is not None and self._types[cell] not in wanted:
+                            continue
+                        key = (-max(abs(cell[0] - cr), abs(cell[1] - cc)), -cell[0], -cell[1])
+                        if len(candidates) < k:
+                            heapq.heappush(candidates, key)
+                        elif key > candidates[0]:
+                            heapq.heapreplace(candidates, key)
+        return [(-r, -c) for _, r, c in sorted(candidates, reverse=True)]
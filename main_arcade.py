@@ -7,7 +7,6 @@ import arcade
 import arcade.color
 import arcade.key
 import math
-import threading
 from typing import cast, Dict, Optional
 import config as cfg
 from game_logic.maze import Maze
@@ -18,8 +17,9 @@ from game_logic.input_handler import InputHandler
 from game_logic.game_views import PuzzleView
 from game_logic.battle_manager import BattleManager
 from game_logic.audio_manager import audio_manager
-from algorithms.pathfinding import find_maze_path
-from game_logic.ai_agent import AIAgent, find_shortest_path as ai_find_path # 导入 AIAgent 类和寻路函数
+from algorithms.solver_executor import SolverExecutor, SolverJob
+from game_logic.ai_agent import AIAgent # 导入 AIAgent 类
+from game_logic.ai_scheduler import AIScheduler
 
 
 class MazeGame(arcade.View):
@@ -46,9 +46,14 @@ class MazeGame(arcade.View):
         self.optimal_path = []
         self.is_showing_path = False
         self.is_calculating_path = False # 新增：标记是否正在计算路径
-        self.path_calculation_result: Optional[tuple] = None # 新增：存储线程计算结果
+        self.path_job: Optional[SolverJob] = None # 后台进程中的寻路任务
+        self.path_progress: Optional[tuple] = None # 计算中的当前最好解 (得分, 步数, 得分上界)
         self.path_target_index = 0
         self.path_sprites: Optional[arcade.SpriteList] = None
+        self.boss_job: Optional[SolverJob] = None # 遭遇动画期间预先求解的BOSS战任务
+
+        # 后台求解进程 (寻路、BOSS战、解谜)，常驻的规划器在多次按 P 之间复用距离图
+        self.solver_executor = SolverExecutor()
 
         # --- 摄像机 ---
         self.camera = arcade.Camera(self.window.width, self.window.height)
@@ -66,6 +71,7 @@ class MazeGame(arcade.View):
         
         # AI 代理逻辑
         self.ai_agent: Optional[AIAgent] = None
+        self.ai_scheduler: Optional[AIScheduler] = None
         self.is_ai_control_active = False
 
         # 精灵列表
@@ -108,6 +114,9 @@ class MazeGame(arcade.View):
 
         # 设置 AI 代理逻辑 (无状态)
         self.ai_agent = AIAgent()
+        # AI 只在到达格子、视野内格子变化或显式请求时重新决策
+        self.ai_scheduler = AIScheduler()
+        self.game_maze.add_tile_listener(self.ai_scheduler.on_tile_changed)
         
         # 设置物理引擎
         self.physics_engine = arcade.PhysicsEngineSimple(
@@ -199,6 +208,14 @@ class MazeGame(arcade.View):
                 arcade.color.WHITE, font_size=40,
                 anchor_x="center"
             )
+            if self.path_progress:
+                score, steps, upper_bound = self.path_progress
+                arcade.draw_text(
+                    f"当前最好: 得分 {score} (上界 {upper_bound}), 步数 {steps}",
+                    self.window.width / 2, self.window.height / 2 - 40,
+                    arcade.color.WHITE, font_size=16,
+                    anchor_x="center", font_name="SimHei"
+                )
             
         if self.is_battle_mode:
             # 绘制战斗面板背景
@@ -254,16 +271,15 @@ class MazeGame(arcade.View):
         if self.is_game_finished:
             return
 
-        # 检查玩家路径计算是否完成 (这是玩家的自动寻路，与AI代理独立)
+        # 检查玩家路径计算是否完成 (这是玩家的自动寻路，与AI代理独立)；
+        # 只轮询不返回，动画、计时器和其余逻辑照常更新，只有玩家移动等待结果
         if self.is_calculating_path:
-            if self.path_calculation_result is not None:
-                self._on_path_found(self.path_calculation_result)
-                self.path_calculation_result = None # 消费结果
-            return # 计算时暂停游戏更新
+            self._poll_path_job()
 
         if self.is_encounter_animation:
             self.encounter_timer += delta_time
-            if self.encounter_timer > self.encounter_duration:
+            # 动画播完且后台的BOSS战求解结束后才进入战斗
+            if self.encounter_timer > self.encounter_duration and (self.boss_job is None or self.boss_job.poll()):
                 self.is_encounter_animation = False
                 self._trigger_real_battle() # 计时结束后，真正开始战斗
             return
@@ -283,35 +299,43 @@ class MazeGame(arcade.View):
         self.animation_timer += delta_time
         
         # 如果 AI 控制激活，则更新 AI 逻辑
-        if self.is_ai_control_active and self.ai_agent and self.player_logic and self.game_maze and not self.is_showing_path:
+        if self.is_ai_control_active and self.ai_scheduler:
+            # 预计算在每帧的时间预算内分摊执行
+            self.ai_scheduler.run_deferred()
+        if (self.is_ai_control_active and self.ai_agent and self.ai_scheduler and self.player_logic
+                and self.game_maze and not self.is_showing_path and not self.is_calculating_path
+                and self.ai_scheduler.should_decide(self.player_logic.get_grid_position())):
             current_pos_grid = self.player_logic.get_grid_position()
             
             # 1. 让AI大脑决定下一个目标
-            target_pos = self.ai_agent.decide_next_target(current_pos_grid, self.game_maze.grid)
+            target_pos = self.ai_agent.decide_next_target(current_pos_grid, self.game_maze.grid,
+                                                          item_index=self.game_maze.item_index)
             
             # 2. 如果AI没有给出短期目标，则将最终出口作为目标
+            navigation = self.game_maze.navigation
             if target_pos is None:
-                exit_pos_xy = self.game_maze.get_exit_position()
-                if exit_pos_xy:
-                    # 关键修正：将 (x, y) 转换为 (row, col)，即 (y, x)
-                    target_pos = (exit_pos_xy[1], exit_pos_xy[0]) 
-                else:
+                # 出口位置由迷宫的地标索引维护 (x, y)，导航场使用 (row, col)
+                exit_pos = self.game_maze.get_exit_position()
+                if exit_pos is None:
                     self.optimal_path = [] # 没有出口，清空路径
                     return
+                target_pos = (exit_pos[1], exit_pos[0])
 
-            # 3. 如果有目标，则规划路径并开始移动
+            # 3. 如果有目标，则查询导航场的下一步并开始移动
             if target_pos:
-                path = ai_find_path(self.game_maze.grid, current_pos_grid, target_pos)
+                # 距离场由迷宫持有并随格子变化增量更新，每帧只是 O(1) 的邻居查表
+                next_pos = navigation.next_step(current_pos_grid, target_pos)
                 
                 # 关键修正：实现真正的"贪心"，只走路径的第一步
-                if path and len(path) > 1:
+                if next_pos is not None:
                     # AI不再执行完整路径，而是只向目标走一步，然后在下一帧重新决策
-                    self.optimal_path = [path[0], path[1]] 
+                    self.optimal_path = [current_pos_grid, next_pos] 
                     self.path_target_index = 1
                     self.is_showing_path = True
                     # 路径只有一步，不需要绘制精灵，避免闪烁
                     if self.path_sprites:
                         self.path_sprites.clear()
+                    self._defer_navigation_prewarm(next_pos)
         
         # 更新玩家移动（已整合手动和自动寻路）
         self._update_player_movement()
@@ -375,7 +399,11 @@ class MazeGame(arcade.View):
         if not self.player_sprite:
             return
 
-        if self.is_showing_path:
+        if self.is_calculating_path:
+            # 路径按提交时的位置求解，结果返回前玩家原地等待 (只屏蔽移动，不暂停其它更新)
+            self.player_sprite.change_x = 0
+            self.player_sprite.change_y = 0
+        elif self.is_showing_path:
             # 自动寻路模式 (玩家或AI)
             self._update_pathfinding_movement()
         else:
@@ -528,6 +556,10 @@ class MazeGame(arcade.View):
         self.is_encounter_animation = True
         self.encounter_timer = 0.0
         self.active_boss_sprite = boss_sprite
+
+        # 在遭遇动画期间于后台进程中求解BOSS战
+        input_data = {"B": list(boss_sprite.boss_hps), "PlayerSkills": boss_sprite.player_skills}
+        self.boss_job = self.solver_executor.submit('boss', input_data)
         
         # 从迷宫中移除BOSS标记，避免重复触发
         if self.game_maze and self.player_sprite:
@@ -545,7 +577,9 @@ class MazeGame(arcade.View):
         
         if self.active_boss_sprite and self.player_logic:
             # 设置战斗并记录回合数，但不在此处扣除资源
-            self.last_battle_rounds = self.battle_manager.setup_battle(self.active_boss_sprite)
+            solution = self.boss_job.result() if self.boss_job else None
+            self.boss_job = None
+            self.last_battle_rounds = self.battle_manager.setup_battle(self.active_boss_sprite, solution)
             print(f"任务 5: BOSS战开始，AI测算最少回合数为 {self.last_battle_rounds}。")
 
     def end_battle(self):
@@ -582,6 +616,10 @@ class MazeGame(arcade.View):
         print("重新开始游戏...")
         # 确保切换回背景音乐
         audio_manager.play_background_music("background")
+        self._cancel_path_calculation()
+        if self.boss_job:
+            self.boss_job.cancel()
+            self.boss_job = None
         self.setup()
 
     def toggle_pathfinding_visualization(self):
@@ -595,31 +633,60 @@ class MazeGame(arcade.View):
             if self.player_sprite:
                 self.player_sprite.change_x = 0
                 self.player_sprite.change_y = 0
-        elif not self.is_calculating_path:
-            # 在后台线程中开始路径计算
+        elif self.is_calculating_path:
+            # 计算过程中再次按 P 则取消
+            self._cancel_path_calculation()
+            print("已取消路径计算。")
+        else:
+            # 在后台进程中开始路径计算
             if self.game_maze:
-                print("在后台线程中计算最优路径...")
+                print("在后台进程中计算最优路径...")
                 self.is_calculating_path = True
-                self.path_calculation_result = None
                 
-                # 为线程创建一个网格副本，以确保线程安全
+                # 发送网格快照，主线程可继续修改迷宫
                 grid_copy = [row[:] for row in self.game_maze.grid]
-                
-                thread = threading.Thread(
-                    target=self._calculate_path_thread,
-                    args=(grid_copy,),
-                    daemon=True
-                )
-                thread.start()
+                start_pos = self.player_logic.get_grid_position() if self.player_logic else None
+                self.path_progress = None
+                self.path_job = self.solver_executor.submit('path', grid_copy, start_pos, cfg.PATH_TIME_BUDGET)
+
+    def _cancel_path_calculation(self):
+        """取消正在进行的后台路径计算"""
+        if self.path_job:
+            self.path_job.cancel()
+            self.path_job = None
+        self.is_calculating_path = False
+        self.path_progress = None
+        self.optimal_path = []
+        if self.path_sprites:
+            self.path_sprites.clear()
 
-    def _calculate_path_thread(self, grid):
-        """在工作线程中运行的函数，用于计算路径"""
-        score, path, steps = find_maze_path(grid)
-        self.path_calculation_result = (score, path, steps)
+    def _poll_path_job(self):
+        """每帧轮询后台寻路任务: 先显示已收到的中间解，任务结束时应用最终结果"""
+        if not self.path_job:
+            return
+        for update in self.path_job.updates():
+            self._on_path_improved(update)
+        if self.path_job.poll():
+            result = self.path_job.result()
+            if result is None:
+                print(f"路径计算未完成: {self.path_job.error}")
+                if self.optimal_path and self.path_progress:
+                    # 沿用已显示的中间解
+                    result = (self.path_progress[0], self.optimal_path, self.path_progress[1])
+            self.path_job = None
+            self._on_path_found(result or (-1, [], -1))
+
+    def _on_path_improved(self, update: tuple):
+        """收到更好的中间解时立即替换显示的路径"""
+        score, path, steps, upper_bound = update
+        self.path_progress = (score, steps, upper_bound)
+        self.optimal_path = path
+        self._create_path_sprites()
 
     def _on_path_found(self, result: tuple):
         """当路径计算完成时在主线程中调用的回调函数"""
         self.is_calculating_path = False
+        self.path_progress = None
         score, path, steps = result
         
         if path:
@@ -658,6 +725,8 @@ class MazeGame(arcade.View):
         # 检查是否已到达路径终点
         if self.path_target_index >= len(self.optimal_path):
             self.is_showing_path = False
+            if self.ai_scheduler:
+                self.ai_scheduler.notify_arrival()
             if self.player_sprite:
                 self.player_sprite.change_x = 0
                 self.player_sprite.change_y = 0
@@ -695,12 +764,27 @@ class MazeGame(arcade.View):
             self.player_sprite.change_x = (dx / distance) * cfg.PLAYER_SPEED
             self.player_sprite.change_y = (dy / distance) * cfg.PLAYER_SPEED
 
+    def _defer_navigation_prewarm(self, cell: tuple):
+        """AI 走向 cell 的途中，提前建立到达后可能用到的距离场 (出口和视野内的金币)"""
+        if not self.ai_scheduler or not self.game_maze:
+            return
+        navigation = self.game_maze.navigation
+        targets = self.game_maze.item_index.within(cell, self.ai_scheduler.vision_radius,
+                                                   types=(cfg.RESOURCE_NODE,))
+        exit_pos = self.game_maze.get_exit_position()
+        if exit_pos is not None:
+            targets.append((exit_pos[1], exit_pos[0]))
+        for target in targets:
+            self.ai_scheduler.defer(lambda target=target: navigation.prepare(target))
+
     def toggle_ai_control(self):
         """切换 AI 是否接管玩家控制"""
         self.is_ai_control_active = not self.is_ai_control_active
         
         # 停止玩家的所有当前活动
         self.is_showing_path = False
+        if self.ai_scheduler:
+            self.ai_scheduler.reset()
         self.optimal_path = []
         if self.path_sprites:
             self.path_sprites.clear()
@@ -723,6 +807,7 @@ def main() -> None:
     game_view.setup()
     window.show_view(game_view)
     arcade.run()
+    game_view.solver_executor.shutdown()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,43 @@
+"""
+迷宫回归测试
+
+用法: python -m pytest tests
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+# 确保能从根目录导入
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import config as cfg
+from game_logic.maze import Maze
+
+
+@pytest.mark.parametrize('backend', ['list', 'uint8'])
+def test_generated_maze_places_items_and_is_solvable(backend):
+    for seed in range(10):
+        random.seed(seed)
+        maze = Maze(15, 15, use_generated=True, backend=backend)
+        assert maze.is_solvable()
+        counts = maze.landmarks.counts()
+        for tile in (cfg.START, cfg.EXIT, cfg.LOCKER, cfg.BOSS):
+            assert counts[tile] == 1
+
+
+def test_generated_maze_too_small_raises():
+    with pytest.raises(ValueError):
+        Maze(1, 1, use_generated=True)
+
+
+def test_navigation_does_not_build_junction_graph():
+    random.seed(0)
+    maze = Maze(15, 15, use_generated=True)
+    exit_x, exit_y = maze.get_exit_position()
+    start_x, start_y = maze.get_start_position()
+    assert maze.navigation.next_step((start_y, start_x), (exit_y, exit_x)) is not None
+    maze.set_tile_type(1, 1, cfg.WALL)
+    assert maze._junction_graph is None
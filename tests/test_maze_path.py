@@ -0,0 +1,124 @@
+"""
+收集物品寻路回归测试
+
+用法: python -m pytest tests
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+# 确保能从根目录导入
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from algorithms.maze_generator import generate_recursive_division_maze
+from algorithms.pathfinding import (CELL_VALUES, ITEM_GRAPH_THRESHOLD, ItemGraphPathfinder, OptimalPathfinderWithRepeats,
+                                   find_maze_path, find_maze_path_anytime)
+
+SEEDS = range(8)
+
+
+def _item_grid(size, num_gold, num_trap, seed, loops=0):
+    """递归分割迷宫 (打通 loops 处墙壁制造环路) 上随机放置一个起点、一个终点和指定数量的金币、陷阱"""
+    random.seed(seed)
+    grid = generate_recursive_division_maze(size, size)
+    for _ in range(loops):
+        grid[random.randrange(1, size - 1)][random.randrange(1, size - 1)] = ' '
+    cells = [(r, c) for r in range(size) for c in range(size) if grid[r][c] == ' ']
+    random.shuffle(cells)
+    for symbol, count in (('S', 1), ('E', 1), ('G', num_gold), ('T', num_trap)):
+        for _ in range(count):
+            r, c = cells.pop()
+            grid[r][c] = symbol
+    return grid
+
+
+def _is_walk(grid, path):
+    """路径从起点到终点，每一步走到相邻的非墙格子"""
+    return (grid[path[0][0]][path[0][1]] == 'S' and grid[path[-1][0]][path[-1][1]] == 'E'
+            and all(abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1 and grid[b[0]][b[1]] != '#'
+                    for a, b in zip(path, path[1:])))
+
+
+def _path_score(grid, path):
+    """路径上每个物品只计一次分"""
+    return sum(CELL_VALUES[grid[r][c]] for r, c in set(path))
+
+
+def _baseline(grid):
+    """不剪枝的逐格 Dijkstra，作为各引擎的参照"""
+    return OptimalPathfinderWithRepeats(grid, prune_dominated=False).calculate_optimal_path()
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_item_graph_matches_cell_search(seed):
+    grid = _item_grid(15, 4, 3, seed, loops=8)
+    expected_score, _, expected_steps = _baseline(grid)
+    score, path, steps = find_maze_path(grid, engine='item_graph')
+    assert (score, steps) == (expected_score, expected_steps)
+    assert steps == len(path) - 1 and _is_walk(grid, path) and _path_score(grid, path) == score
+
+
+def test_auto_falls_back_when_budget_runs_out():
+    # 30 个物品，预算为 0 时在第一次检查处停止 (精确解约需 0.1 秒)
+    grid = _item_grid(51, 15, 15, seed=0)
+    stats = {}
+    score, path, steps = find_maze_path(grid, time_budget=0, stats=stats)
+    assert stats['is_optimal'] is False
+    assert steps == len(path) - 1 and _is_walk(grid, path)
+    exact_score, _, exact_steps = find_maze_path(grid, engine='item_graph')
+    assert (score, -steps) <= (exact_score, -exact_steps)
+
+
+def test_auto_within_budget_is_exact():
+    grid = _item_grid(31, 9, ITEM_GRAPH_THRESHOLD - 8, seed=1)
+    stats = {}
+    result = find_maze_path(grid, time_budget=None, stats=stats)
+    assert stats == {'engine': 'item_graph', 'is_optimal': True}
+    assert result[0] == find_maze_path(grid, engine='item_graph')[0]
+
+
+@pytest.mark.parametrize('storage, queue', [('dict', 'heap'), ('dict', 'bucket'), ('array', 'heap')])
+def test_dominance_pruning_matches_unpruned_search(storage, queue):
+    for seed in SEEDS:
+        grid = _item_grid(13, 3, 3, seed, loops=6)
+        expected_score, _, expected_steps = _baseline(grid)
+        pathfinder = OptimalPathfinderWithRepeats(grid, storage=storage, prune_dominated=True, queue=queue)
+        score, path, steps = pathfinder.calculate_optimal_path()
+        assert (score, steps) == (expected_score, expected_steps)
+        assert _is_walk(grid, path) and _path_score(grid, path) == score
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_anytime_improves_and_ends_with_exact_optimum(seed):
+    grid = _item_grid(15, 4, 3, seed, loops=8)
+    expected_score, _, expected_steps = _baseline(grid)
+    results = list(find_maze_path_anytime(grid))
+    assert [is_optimal for *_, is_optimal in results] == [False] * (len(results) - 1) + [True]
+    # 中间解严格变好；最终的精确解可能与最后一个中间解相同
+    keys = [(score, -steps) for score, _, steps, _, _ in results]
+    assert keys[:-1] == sorted(set(keys[:-1])) and keys == sorted(keys)
+    for score, path, steps, upper_bound, _ in results:
+        assert steps == len(path) - 1 and _is_walk(grid, path) and _path_score(grid, path) == score
+        assert upper_bound >= expected_score
+    assert results[-1][0] == expected_score and results[-1][2] == expected_steps
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_heuristic_returns_valid_path_no_better_than_exact(seed):
+    grid = _item_grid(21, 6, 5, seed, loops=10)
+    exact_score, _, exact_steps = find_maze_path(grid, engine='item_graph')
+    score, path, steps = find_maze_path(grid, engine='heuristic')
+    assert steps == len(path) - 1 and _is_walk(grid, path) and _path_score(grid, path) == score
+    assert (score, -steps) <= (exact_score, -exact_steps)
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_contracted_item_graph_matches_cell_search(seed):
+    grid = _item_grid(15, 4, 3, seed, loops=8)
+    expected_score, _, expected_steps = _baseline(grid)
+    score, path, steps = ItemGraphPathfinder(grid, contract_corridors=True).calculate_optimal_path()
+    assert (score, steps) == (expected_score, expected_steps)
+    assert steps == len(path) - 1 and _is_walk(grid, path) and _path_score(grid, path) == score
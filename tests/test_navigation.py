@@ -0,0 +1,38 @@
+"""
+导航场回归测试
+
+用法: python -m pytest tests
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# 确保能从根目录导入
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game_logic.navigation import NavigationField
+
+GRID = [list(row) for row in ("#####",
+                              "#   #",
+                              "# # #",
+                              "#   #",
+                              "#####")]
+
+
+def test_next_steps_keeps_out_of_bounds_and_wall_agents_in_place():
+    navigation = NavigationField(GRID)
+    cells = [(1, 1), (0, -1), (-1, 2), (1, 5), (5, 0), (2, 2), (0, 0)]
+    steps = navigation.next_steps(cells, [(3, 3)])
+    assert tuple(steps[0]) in {(1, 2), (2, 1)}
+    assert np.array_equal(steps[1:], np.array(cells[1:]))
+
+
+def test_next_steps_matches_next_step():
+    navigation = NavigationField(GRID)
+    cells = [(1, 1), (1, 3), (3, 1), (3, 3), (2, 3)]
+    steps = navigation.next_steps(cells, [(3, 3), (1, 1)], target_ids=[0, 0, 1, 0, 1])
+    for cell, target, step in zip(cells, [(3, 3), (3, 3), (1, 1), (3, 3), (1, 1)], steps):
+        expected = navigation.next_step(cell, target)
+        assert tuple(step) == (expected if expected is not None else cell)
@@ -0,0 +1,177 @@
+"""
+寻路回归测试
+
+用法: python -m pytest tests
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+# 确保能从根目录导入
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from collections import deque
+
+from algorithms.bitset_bfs import BitGrid
+from algorithms.hpa import HierarchicalPathfinder
+from algorithms.junction_graph import JunctionGraph
+from algorithms.maze_generator import generate_recursive_division_maze
+from game_logic.ai_agent import find_shortest_path
+from game_logic.maze import Maze
+
+SEEDS = range(6)
+
+
+def _bfs_distances(grid, source):
+    """逐格 BFS 的参照距离 {格子: 步数}"""
+    dist = {source: 0}
+    frontier = deque([source])
+    while frontier:
+        r, c = frontier.popleft()
+        for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+            if 0 <= nr < len(grid) and 0 <= nc < len(grid[0]) and grid[nr][nc] != '#' and (nr, nc) not in dist:
+                dist[(nr, nc)] = dist[(r, c)] + 1
+                frontier.append((nr, nc))
+    return dist
+
+
+def _looped_maze(size, seed):
+    """递归分割迷宫，随机打通一些墙制造多条路线，并放几个物品 (可通行的特殊格子)"""
+    random.seed(seed)
+    grid = generate_recursive_division_maze(size, size)
+    for _ in range(size):
+        grid[random.randrange(1, size - 1)][random.randrange(1, size - 1)] = ' '
+    cells = [(r, c) for r in range(size) for c in range(size) if grid[r][c] == ' ']
+    for symbol in 'SEGGT':
+        r, c = cells.pop(random.randrange(len(cells)))
+        grid[r][c] = symbol
+    return grid
+
+
+def _query_pairs(grid, count):
+    """随机的 (起点, 终点) 查询，包括少量终点为墙的不可达查询"""
+    cells = [(r, c) for r, row in enumerate(grid) for c, tile in enumerate(row) if tile != '#']
+    walls = [(r, c) for r, row in enumerate(grid) for c, tile in enumerate(row) if tile == '#']
+    pairs = [tuple(random.sample(cells, 2)) for _ in range(count)]
+    return pairs + [(cells[0], random.choice(walls))]
+
+
+def _check_path(grid, start, goal, path):
+    """path 与参照 BFS 距离一致，且是从 start 到 goal 的逐格路径"""
+    expected = _bfs_distances(grid, start).get(goal)
+    if expected is None:
+        assert path == []
+        return
+    assert len(path) - 1 == expected and path[0] == start and path[-1] == goal
+    for (r, c), (nr, nc) in zip(path, path[1:]):
+        assert abs(r - nr) + abs(c - nc) == 1 and grid[nr][nc] != '#'
+
+
+@pytest.mark.parametrize('queue', ['heap', 'bucket', 'radix'])
+def test_astar_radix_queue_does_not_crash(queue):
+    # 旧版 A* 不重新入队 g 值改进的开放节点，这张图上出队键不单调，radix 会抛 ValueError
+    grid = [list("     #"), list("   ## ")]
+    assert find_shortest_path(grid, (0, 0), (1, 5), queue=queue) == []
+    assert len(find_shortest_path(grid, (0, 0), (1, 2), queue=queue)) - 1 == 3
+
+
+@pytest.mark.parametrize('queue', ['heap', 'bucket', 'radix'])
+def test_astar_matches_bfs_on_generated_mazes(queue):
+    random.seed(1)
+    for _ in range(100):
+        size = random.choice([9, 15, 21])
+        grid = generate_recursive_division_maze(size, size)
+        # 打通一些墙，制造多条路线
+        for _ in range(size):
+            grid[random.randrange(1, size - 1)][random.randrange(1, size - 1)] = ' '
+        cells = [(r, c) for r in range(size) for c in range(size) if grid[r][c] != '#']
+        start, goal = random.sample(cells, 2)
+        expected = BitGrid(grid).shortest_path(start, goal)
+        assert len(find_shortest_path(grid, start, goal, queue=queue)) == len(expected)
+
+
+@pytest.mark.parametrize('engine', ['bitset', 'jps', 'junction', 'hpa'])
+def test_engines_do_not_print(engine, capsys):
+    random.seed(2)
+    grid = generate_recursive_division_maze(21, 21)
+    cells = [(r, c) for r in range(21) for c in range(21) if grid[r][c] != '#']
+    assert find_shortest_path(grid, cells[0], cells[-1], engine=engine)
+    assert find_shortest_path(grid, cells[0], (0, 0), engine=engine) == []
+    assert capsys.readouterr().out == ''
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_bitset_matches_bfs(seed):
+    grid = _looped_maze(21, seed)
+    bits = BitGrid(grid)
+    for start, goal in _query_pairs(grid, 20):
+        _check_path(grid, start, goal, find_shortest_path(grid, start, goal, engine='bitset'))
+        reference = _bfs_distances(grid, start)
+        distances = bits.distances([start])
+        assert all(distances[r][c] == reference.get((r, c), -1)
+                   for r in range(len(grid)) for c in range(len(grid[0])))
+
+
+@pytest.mark.parametrize('queue', ['heap', 'bucket', 'radix'])
+def test_jps_matches_bfs(queue):
+    for seed in SEEDS:
+        grid = _looped_maze(21, seed)
+        for start, goal in _query_pairs(grid, 20):
+            _check_path(grid, start, goal, find_shortest_path(grid, start, goal, queue=queue, engine='jps'))
+
+
+def _check_junction_graph(grid, graph):
+    for start, goal in _query_pairs(grid, 10):
+        _check_path(grid, start, goal, find_shortest_path(grid, start, goal, engine='junction', graph=graph))
+        field = graph.distance_field(goal)
+        reference = _bfs_distances(grid, goal) if grid[goal[0]][goal[1]] != '#' else {}
+        assert all(field[r * len(grid[0]) + c] == reference.get((r, c), -1)
+                   for r in range(len(grid)) for c in range(len(grid[0])))
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_junction_graph_matches_bfs(seed):
+    grid = _looped_maze(21, seed)
+    _check_junction_graph(grid, JunctionGraph(grid))
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_junction_graph_stays_exact_after_tile_changes(seed):
+    maze = Maze.from_grid(_looped_maze(21, seed))
+    graph = maze.junction_graph
+    for _ in range(10):
+        x, y = random.randrange(1, 20), random.randrange(1, 20)
+        tile = maze.get_tile_type(x, y)
+        # 物品与通路互换 (原地拆分/合并通道)，通路与墙互换 (整图重建)
+        maze.set_tile_type(x, y, {' ': random.choice('G#'), 'G': ' ', 'T': ' ', '#': ' '}.get(tile, tile))
+        _check_junction_graph(maze.grid, graph)
+
+
+@pytest.mark.parametrize('cluster_size', [4, 7, 32])
+def test_hpa_matches_bfs(cluster_size):
+    for seed in SEEDS:
+        grid = _looped_maze(31, seed)
+        hierarchy = HierarchicalPathfinder(grid, cluster_size=cluster_size)
+        for start, goal in _query_pairs(grid, 15):
+            _check_path(grid, start, goal, find_shortest_path(grid, start, goal, engine='hpa', graph=hierarchy))
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_hpa_stays_exact_after_wall_changes(seed):
+    maze = Maze.from_grid(_looped_maze(31, seed))
+    # 31x31 只够一个默认大小的簇，这里用小簇并像 Maze.hierarchy 一样接收格子变化
+    hierarchy = HierarchicalPathfinder(maze.grid, cluster_size=5)
+    maze.add_tile_listener(lambda x, y, old_type, new_type: hierarchy.on_tile_changed(y, x, old_type, new_type))
+    hierarchy.precompute()
+    border = [4, 5, 9, 10, 14, 15, 19, 20, 24, 25]
+    for _ in range(16):
+        # 只改动簇边界上的格子，覆盖相邻簇一起过期的情况
+        x, y = random.choice(border), random.randrange(1, 30)
+        if random.random() < 0.5:
+            x, y = y, x
+        maze.set_tile_type(x, y, ' ' if maze.is_wall(x, y) else '#')
+        for start, goal in _query_pairs(maze.grid, 5):
+            _check_path(maze.grid, start, goal, hierarchy.shortest_path(start, goal))
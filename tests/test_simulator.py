@@ -0,0 +1,27 @@
+"""
+无界面仿真回归测试
+
+用法: python -m pytest tests
+"""
+
+import os
+import sys
+
+# 确保能从根目录导入
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game_logic.simulator import run_episodes, summarize
+
+
+def test_episodes_record_why_they_ended():
+    results = run_episodes(range(20), vision_radii=(1, 3), workers=0)
+    for result in results:
+        assert result['end_reason'] in ('exit', 'max_steps', 'stalled', 'no_route')
+        assert result['reached_exit'] == (result['end_reason'] == 'exit')
+    summary = summarize(results)
+    for radius, stats in summary.items():
+        exits = round(stats['exit_rate'] * stats['episodes'])
+        assert exits + stats['timeouts'] + stats['stalls'] + stats['no_route'] == stats['episodes']
+    # 视野为 3 时贪心 AI 会在同分目标之间来回走，这些回合应判定为停滞而不是一直走到步数上限
+    assert summary[3]['stalls'] > 0
+    assert all(r['steps'] < 15 * 15 * 4 for r in results)